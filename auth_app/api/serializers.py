@@ -1,13 +1,17 @@
 from django.contrib.auth import authenticate
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
+from auth_app import email_lookup
 
 """ 
 This serializer handles the user registration process. 
 
 - Expects: full name, email, password, repeated password.
-- Validates that passwords match.
+- Validates that passwords match and that the email (compared case-insensitively) is not taken;
+  the unique index on LOWER(email) also catches concurrent registrations.
 - Splits full name into first and last name.
 - Creates a new user with hashed password.
 """
@@ -24,7 +28,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
         if data['password'] != data['repeated_password']:
             raise serializers.ValidationError({'password': 'Passwords do not match'})
 
-        if User.objects.filter(email=data['email']).exists():
+        if User.objects.annotate(email_lower=Lower('email')).filter(email_lower=email_lookup.normalize(data['email'])).exists():
             raise serializers.ValidationError({'email': 'A user with this email already exists.'})
 
         return data
@@ -44,7 +48,11 @@ class RegistrationSerializer(serializers.ModelSerializer):
             last_name=last_name
         )
         user.set_password(validated_data['password'])
-        user.save()
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            raise serializers.ValidationError({'email': 'A user with this email already exists.'})
         return user
 
 """ 
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import RegistrationView, LoginView
+from .views import RegistrationView, LoginView, UserImportView
 
 """
 URL patterns for user authentication.
@@ -15,8 +15,14 @@ Endpoints:
   Logs in a user.  
   Accepts: email and password.  
   Returns: user data on success or authentication error.
+
+- POST /users/import/  
+  Imports many users from an uploaded CSV or NDJSON file (staff only).  
+  Accepts: file, optional format.  
+  Returns: number of created users, skipped and invalid rows.
 """
 urlpatterns = [
     path('registration/', RegistrationView.as_view(), name='registration'),
-    path('login/', LoginView.as_view(), name='login')
+    path('login/', LoginView.as_view(), name='login'),
+    path('users/import/', UserImportView.as_view(), name='users-import'),
 ]
\ No newline at end of file
@@ -1,8 +1,13 @@
+import csv
+import io
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from rest_framework.permissions import AllowAny
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from auth_app import provisioning
+from auth_app.throttling import EmailRateThrottle, IPRateThrottle
 from .serializers import RegistrationSerializer, LoginSerializer
 
 """ 
@@ -11,9 +16,13 @@ This handles the user registration.
 Method: POST
 Accepts: full name, email, password, repeated password.
 Returns: user data on success or validation errors.
+Throttled per client address and per email before the password is hashed
+(scope 'registration', see auth_app.throttling): 429 when a limit is exceeded.
 """
 class RegistrationView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = 'registration'
 
     def post(self, request):
         serializer = RegistrationSerializer(data=request.data)
@@ -37,9 +46,13 @@ This handles the user login.
 Method: POST
 Accepts: email and password.
 Returns: user data on success or authentication error.
+Throttled per client address and per email before the password is checked
+(scope 'login', see auth_app.throttling): 429 when a limit is exceeded.
 """
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
@@ -56,4 +69,49 @@ class LoginView(APIView):
             }
             return Response(data, status=status.HTTP_200_OK)
 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+"""
+This handles importing many user accounts at once (admin only).
+
+Method: POST (multipart/form-data)
+Accepts:  
+- file: CSV with a header line, or NDJSON; columns email, fullname (or first_name
+  and last_name) and password (optional), see auth_app.provisioning.  
+- format (optional): 'csv' or 'ndjson'; by default taken from the file name.
+
+Returns:  
+- 200 OK with {'created': <count>, 'existing': [emails skipped because they are taken],
+  'invalid': [{'line', 'email', 'error'}]}.  
+- 400 Bad Request if the file is missing, unreadable, has more than
+  AUTH_PROVISIONING['MAX_UPLOAD_ROWS'] rows or more than
+  AUTH_PROVISIONING['MAX_UPLOAD_PASSWORDS'] rows with a password (use the
+  import_users command for those).  
+- 403 Forbidden for users who are not staff.
+
+Passwords are hashed in the request worker, without a process pool, which is
+why only a few rows may carry one; users and tokens are inserted in batches.
+"""
+class UserImportView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': "A 'file' upload is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        format = request.data.get('format') or provisioning.format_of(upload.name, 'csv')
+        try:
+            rows = list(provisioning.read_rows(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''), format))
+        except (provisioning.ProvisioningError, UnicodeDecodeError, csv.Error) as exc:
+            return Response({'detail': f"The file could not be read: {exc}"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > provisioning.MAX_UPLOAD_ROWS:
+            return Response({'detail': f"At most {provisioning.MAX_UPLOAD_ROWS} rows per upload; use the import_users command for larger files."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if provisioning.count_passwords(rows) > provisioning.MAX_UPLOAD_PASSWORDS:
+            return Response({'detail': f"At most {provisioning.MAX_UPLOAD_PASSWORDS} rows with a password per upload; use the import_users command for more."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        result = provisioning.import_users(rows, workers=1)
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AuthAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'auth_app'
+
+    def ready(self):
+        from auth_app import signals  # noqa: F401
@@ -0,0 +1,142 @@
+import hashlib
+import threading
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+"""
+Token authentication with a shared cache of token -> user resolutions.
+
+Drop-in replacement for rest_framework.authentication.TokenAuthentication.
+A cache hit skips the Token + User query that DRF runs on every request.
+
+Entries hold plain column values (the user without the password hash, and the
+token), never model instances: every request gets freshly built User and Token
+objects, so a change made to request.user in one request cannot leak into
+another. Only active users are cached.
+
+The cache is configured with the AUTH_TOKEN_CACHE setting:
+- ALIAS (string): Django cache alias to use. Use a cache shared by all workers
+  (e.g. Redis or Memcached) so that invalidations reach every worker; with the
+  local-memory backend other workers notice a change only after TTL.
+- TTL (int): Seconds a resolution may be served; 0 disables the cache.
+
+Entries are deleted when a token is saved or deleted (logout, rotation) and
+whenever its user is saved or deleted, e.g. deactivated (see auth_app.signals).
+Hit and miss counters of this worker are available through CachedTokenAuthentication.stats().
+
+aauthenticate() is the coroutine counterpart used by the async views
+(kanban_app.api.async_views): a miss uses the async ORM.
+"""
+
+_config = getattr(settings, 'AUTH_TOKEN_CACHE', {})
+TTL = _config.get('TTL', 60)
+KEY_PREFIX = 'auth:token'
+USER_FIELDS = tuple(field.attname for field in User._meta.concrete_fields if field.attname != 'password')
+
+_lock = threading.Lock()
+_counters = {'hits': 0, 'misses': 0}
+
+
+def _cache():
+    return caches[_config.get('ALIAS', 'default')]
+
+
+def _key(token_key):
+    # Hashed, so the shared cache never holds usable credentials.
+    return f"{KEY_PREFIX}:{hashlib.sha256(token_key.encode()).hexdigest()}"
+
+
+def _count(entry):
+    with _lock:
+        _counters['hits' if entry is not None else 'misses'] += 1
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate(self, request):
+        key = self.token_key(request)
+        return None if key is None else self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        key = self.token_key(request)
+        return None if key is None else await self.aauthenticate_credentials(key)
+
+    def token_key(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            raise AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed(_('Invalid token header. Token string should not contain invalid characters.'))
+
+    def authenticate_credentials(self, key):
+        entry = _cache().get(_key(key)) if TTL else None
+        _count(entry)
+        if entry is not None:
+            return self.restore(entry)
+
+        user, token = super().authenticate_credentials(key)
+        if TTL:
+            _cache().set(_key(key), self.entry(token), TTL)
+        return user, token
+
+    async def aauthenticate_credentials(self, key):
+        entry = await _cache().aget(_key(key)) if TTL else None
+        _count(entry)
+        if entry is not None:
+            return self.restore(entry)
+
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related('user').aget(key=key)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        if TTL:
+            await _cache().aset(_key(key), self.entry(token), TTL)
+        return token.user, token
+
+    def token_fields(self):
+        return [field.attname for field in self.get_model()._meta.concrete_fields]
+
+    def entry(self, token):
+        return (
+            tuple(getattr(token.user, name) for name in USER_FIELDS),
+            tuple(getattr(token, name) for name in self.token_fields()),
+        )
+
+    def restore(self, entry):
+        user_values, token_values = entry
+        user = User.from_db(DEFAULT_DB_ALIAS, USER_FIELDS, user_values)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        token = self.get_model().from_db(DEFAULT_DB_ALIAS, self.token_fields(), token_values)
+        token.user = user
+        return user, token
+
+    @classmethod
+    def invalidate_token(cls, key):
+        _cache().delete(_key(key))
+
+    @classmethod
+    def invalidate_user(cls, user_id):
+        keys = cls().get_model().objects.filter(user_id=user_id).values_list('key', flat=True)
+        _cache().delete_many([_key(key) for key in keys])
+
+    @classmethod
+    def stats(cls):
+        with _lock:
+            hits, misses = _counters['hits'], _counters['misses']
+        lookups = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_ratio': hits / lookups if lookups else 0.0}
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models.functions import Lower
+from core.lru import LRUCache
+
+"""
+Resolves email addresses to users, many at once, for the member pickers.
+
+Addresses are normalized (surrounding whitespace removed, lower-cased) and all
+addresses of a call that are not cached are resolved with a single
+WHERE LOWER(email) IN (...) query, which is answered from the expression index
+auth_user_email_lower_idx (auth_app migration 0001) instead of a table scan.
+If several accounts share an address, the oldest one is returned.
+
+Both answers are cached per worker: the user's public data for a known address
+and False for an unknown one, so a pasted list that is checked again while the
+user edits it costs no query at all.
+
+The cache is configured with the AUTH_EMAIL_LOOKUP setting:
+- MAX_SIZE (int): Number of cached addresses per worker; 0 disables the cache.
+- TTL (int): Seconds an answer may be served; bounds how long another worker
+  may miss a new registration or an address change.
+
+Entries are dropped in-process when a user is saved or deleted (see auth_app.signals).
+
+Functions:
+- normalize(): Returns the normalized form of an address.
+- lookup(): Returns {normalized address: {'id', 'email', 'fullname'} or None}.
+- invalidate(): Drops the cached answers of a user.
+"""
+
+_config = getattr(settings, 'AUTH_EMAIL_LOOKUP', {})
+cache = LRUCache(maxsize=_config.get('MAX_SIZE', 10000), ttl=_config.get('TTL', 30))
+
+
+def normalize(email):
+    return email.strip().lower()
+
+
+def lookup(emails):
+    found, missing = {}, set()
+    for email in {normalize(email) for email in emails}:
+        cached = cache.get(email)
+        if cached is None:
+            missing.add(email)
+        else:
+            found[email] = cached or None
+
+    if missing:
+        users = (
+            User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=missing)
+            .order_by('pk').values('id', 'email', 'first_name', 'last_name')
+        )
+        resolved = {}
+        for user in users:
+            resolved.setdefault(normalize(user['email']), {
+                'id': user['id'],
+                'email': user['email'],
+                'fullname': f"{user['first_name']} {user['last_name']}".strip(),
+            })
+        for email in missing:
+            found[email] = resolved.get(email)
+            cache.set(email, found[email] or False)
+    return found
+
+
+def invalidate(user):
+    """Drops the answer cached for the user's current address and any answer naming the user."""
+    if user.email:
+        cache.delete(normalize(user.email))
+    cache.delete_where(lambda email, value: bool(value) and value['id'] == user.pk)
@@ -0,0 +1,48 @@
+import csv
+import time
+from django.core.management.base import BaseCommand, CommandError
+from auth_app import provisioning
+
+"""
+Imports user accounts from a CSV or NDJSON file (see auth_app.provisioning).
+
+Passwords are hashed in --workers processes (default: AUTH_PROVISIONING['WORKERS'],
+every CPU core), users and their auth tokens are inserted in batches of
+--batch-size. Addresses that are already taken or repeated in the file are
+skipped; invalid rows are listed with their line number.
+
+Usage:
+    python manage.py import_users users.csv [--format csv|ndjson] [--workers 8] [--batch-size 1000]
+"""
+class Command(BaseCommand):
+    help = 'Imports users from a CSV or NDJSON file with parallel password hashing and bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header line, or NDJSON file.')
+        parser.add_argument('--format', choices=provisioning.FORMATS, help='File format; by default taken from the file extension.')
+        parser.add_argument('--workers', type=int, default=provisioning.WORKERS, help='Password hashing processes.')
+        parser.add_argument('--batch-size', type=int, default=provisioning.BATCH_SIZE, help='Users hashed and inserted per batch.')
+
+    def handle(self, *args, **options):
+        format = options['format'] or provisioning.format_of(options['path'])
+        if format is None:
+            raise CommandError('Unknown file extension, pass --format csv or --format ndjson.')
+
+        started = time.perf_counter()
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                rows = list(provisioning.read_rows(stream, format))
+        except (OSError, UnicodeDecodeError, csv.Error, provisioning.ProvisioningError) as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}")
+
+        def progress(created, total):
+            self.stdout.write(f"  {created}/{total} users created ({time.perf_counter() - started:.0f}s)")
+
+        result = provisioning.import_users(rows, workers=options['workers'], batch_size=options['batch_size'], progress=progress)
+
+        for row in result.invalid:
+            self.stdout.write(self.style.WARNING(f"  line {row['line']}: {row['error']} ({row['email']})"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(result.created)} users in {time.perf_counter() - started:.1f}s, "
+            f"{len(result.existing)} already existed, {len(result.invalid)} rows skipped."
+        ))
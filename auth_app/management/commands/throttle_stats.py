@@ -0,0 +1,31 @@
+import json
+from django.core.management.base import BaseCommand
+from auth_app import throttling
+
+"""
+Prints the number of requests rejected by the login and registration rate limits.
+
+The counters live in the cache named by AUTH_THROTTLE['ALIAS'], so every worker
+of the host adds to the same numbers (a per-process cache such as LocMemCache
+only shows the command's own, empty, counters). --reset sets them back to zero.
+
+Usage:
+    python manage.py throttle_stats [--json] [--reset]
+"""
+class Command(BaseCommand):
+    help = 'Prints the requests rejected per throttle scope and kind (ip, email).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print the counters as JSON.')
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        counters = throttling.stats()
+        if options['json']:
+            self.stdout.write(json.dumps(counters, indent=2))
+        else:
+            for scope, kinds in counters.items():
+                rejected = ', '.join(f"{kind} {count}" for kind, count in kinds.items())
+                self.stdout.write(f"{scope:<14} rejected: {rejected}")
+        if options['reset']:
+            throttling.reset_stats()
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX auth_user_email_lower_idx ON auth_user (LOWER(email));',
+            reverse_sql='DROP INDEX auth_user_email_lower_idx;',
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+"""
+Makes email addresses unique, compared case-insensitively, at the database level.
+
+Until now only RegistrationSerializer checked for an existing address, with a
+separate query that two concurrent registrations could both pass. The partial
+unique index auth_user_email_lower_uniq covers every non-empty address (accounts
+created without one, e.g. by createsuperuser, are not affected). The existing
+index auth_user_email_lower_idx stays: lookups by LOWER(email) cannot use the
+partial index without repeating its WHERE clause.
+
+The migration refuses to run while duplicate addresses exist and lists them;
+merge or rename those accounts first.
+"""
+
+def check_duplicates(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.using(schema_editor.connection.alias).exclude(email='')
+        .annotate(email_lower=Lower('email')).order_by().values('email_lower')
+        .annotate(total=Count('pk')).filter(total__gt=1).values_list('email_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(f"Resolve duplicate user email addresses before migrating: {', '.join(duplicates)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_user_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_lower_uniq ON auth_user (LOWER(email)) WHERE email <> '';",
+            reverse_sql='DROP INDEX auth_user_email_lower_uniq;',
+        ),
+    ]
@@ -0,0 +1,238 @@
+import csv
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from rest_framework.authtoken.models import Token
+from auth_app import email_lookup
+
+"""
+Bulk import of user accounts, e.g. a whole department at once.
+
+Rows are read from CSV (header line with the column names) or NDJSON (one JSON
+object per line) with these fields:
+- email (required): Also used as the username, as in the registration.
+- fullname, or first_name and last_name (optional): A full name is split into
+  first and last name like in RegistrationSerializer.
+- password (optional): Without one the account gets an unusable password.
+
+An import runs in four steps:
+1. Every row is validated; invalid rows and repeated addresses (compared
+   case-insensitively) are reported with their line number and skipped.
+2. Addresses that already belong to an account are found with indexed queries
+   (one on PostgreSQL, one per ~500 addresses on SQLite with its parameter limit)
+   and skipped.
+3. Passwords are hashed in a process pool of WORKERS processes. PBKDF2 is by far
+   the most expensive step (hundreds of milliseconds per password), so the import
+   scales with the number of CPU cores. The pool uses the 'spawn' start method, so
+   it is safe to start from a multi-threaded web worker.
+4. Users and their auth tokens are inserted with bulk_create, BATCH_SIZE rows and
+   one transaction per batch. If a concurrent registration takes one of the
+   addresses in the meantime, the batch is checked again and retried once.
+
+bulk_create sends no post_save signals; the email lookup cache of this worker
+is cleared for the imported addresses explicitly.
+
+The import is configured with the AUTH_PROVISIONING setting:
+- WORKERS (int): Hashing processes; None uses every CPU core, 1 hashes in-process.
+- BATCH_SIZE (int): Users hashed and inserted per batch.
+- MAX_UPLOAD_ROWS (int): Rows accepted by the admin endpoint; larger files are
+  imported with the import_users command.
+- MAX_UPLOAD_PASSWORDS (int): Rows with a password accepted by the admin
+  endpoint. It hashes in the request worker itself (no process pool per
+  request), at roughly half a second per password, so this must stay well
+  within the request timeout; files with more passwords go to import_users.
+
+Functions:
+- read_rows(): Yields (line, row) pairs from a text stream in the given format.
+- count_passwords(): Returns the number of rows that carry a password.
+- import_users(): Imports the rows and returns a summary (see ImportResult).
+"""
+
+_config = getattr(settings, 'AUTH_PROVISIONING', {})
+WORKERS = _config.get('WORKERS') or os.cpu_count() or 1
+BATCH_SIZE = _config.get('BATCH_SIZE', 1000)
+MAX_UPLOAD_ROWS = _config.get('MAX_UPLOAD_ROWS', 5000)
+MAX_UPLOAD_PASSWORDS = _config.get('MAX_UPLOAD_PASSWORDS', 20)
+
+FORMATS = ('csv', 'ndjson')
+EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+class ProvisioningError(Exception):
+    pass
+
+
+class ImportResult:
+
+    def __init__(self):
+        self.created = []
+        self.existing = []
+        self.invalid = []
+
+    def as_dict(self):
+        return {'created': len(self.created), 'existing': self.existing, 'invalid': self.invalid}
+
+
+def format_of(name, default=None):
+    return EXTENSIONS.get(os.path.splitext(name or '')[1].lower(), default)
+
+
+def count_passwords(rows):
+    return sum(1 for _, row in rows if isinstance(row, dict) and row.get('password'))
+
+
+def read_rows(stream, format):
+    if format == 'csv':
+        reader = csv.DictReader(stream)
+        if not reader.fieldnames or 'email' not in [name.strip().lower() for name in reader.fieldnames]:
+            raise ProvisioningError("The CSV header must contain an 'email' column.")
+        for row in reader:
+            yield reader.line_num, {(key or '').strip().lower(): value for key, value in row.items()}
+    elif format == 'ndjson':
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError:
+                row = None
+            yield line, row if isinstance(row, dict) else None
+    else:
+        raise ProvisioningError(f"Unknown format '{format}', expected one of: {', '.join(FORMATS)}.")
+
+
+def import_users(rows, workers=WORKERS, batch_size=BATCH_SIZE, progress=None):
+    result = ImportResult()
+    accounts = {}
+    for line, row in rows:
+        account, error = _parse(row)
+        if error is None and account['key'] in accounts:
+            error = f"Duplicate of line {accounts[account['key']]['line']}."
+        if error is not None:
+            result.invalid.append({'line': line, 'email': (row or {}).get('email'), 'error': error})
+            continue
+        account['line'] = line
+        accounts[account['key']] = account
+
+    existing = _existing(list(accounts.values()))
+    result.existing = [account['email'] for account in accounts.values() if account['key'] in existing]
+    pending = [account for account in accounts.values() if account['key'] not in existing]
+
+    batch_size = max(batch_size, 1)
+    with _hasher(workers) as hash_passwords:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            hashes = iter(hash_passwords([account['password'] for account in batch if account['password']]))
+            for account in batch:
+                account['hash'] = next(hashes) if account['password'] else make_password(None)
+            result.created += _insert(batch, result)
+            if progress is not None:
+                progress(len(result.created), len(pending))
+    return result
+
+
+def _parse(row):
+    if row is None:
+        return None, 'Not a JSON object.'
+    email = row.get('email')
+    email = email.strip() if isinstance(email, str) else ''
+    try:
+        validate_email(email)
+    except ValidationError:
+        return None, 'Invalid email address.'
+    if len(email) > User._meta.get_field('username').max_length:
+        return None, 'Email address is too long.'
+
+    fullname = row.get('fullname')
+    if isinstance(fullname, str) and fullname.strip():
+        name_parts = fullname.strip().split(' ', 1)
+        first_name, last_name = name_parts[0], name_parts[1] if len(name_parts) > 1 else ''
+    else:
+        first_name, last_name = row.get('first_name') or '', row.get('last_name') or ''
+    password = row.get('password') or None
+    if not all(isinstance(value, str) for value in (first_name, last_name, password or '')):
+        return None, 'Names and password must be strings.'
+    if max(len(first_name), len(last_name)) > User._meta.get_field('first_name').max_length:
+        return None, 'Name is too long.'
+
+    return {
+        'key': email_lookup.normalize(email), 'email': email, 'password': password,
+        'first_name': first_name.strip(), 'last_name': last_name.strip(),
+    }, None
+
+
+def _existing(accounts):
+    """Returns the normalized addresses of the accounts that are taken, by address or by username."""
+    taken = set()
+    chunk_size = max((connection.features.max_query_params or 2 * len(accounts) or 2) // 2, 1)
+    for start in range(0, len(accounts), chunk_size):
+        chunk = accounts[start:start + chunk_size]
+        by_username = {account['email']: account['key'] for account in chunk}
+        matches = User.objects.annotate(email_lower=Lower('email')).filter(
+            Q(email_lower__in=[account['key'] for account in chunk]) | Q(username__in=list(by_username))
+        ).values_list('email', 'username')
+        for email, username in matches:
+            taken.add(email_lookup.normalize(email))
+            if username in by_username:
+                taken.add(by_username[username])
+    return taken
+
+
+def _insert(batch, result, retry=True):
+    try:
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    username=account['email'], email=account['email'], password=account['hash'],
+                    first_name=account['first_name'], last_name=account['last_name'],
+                )
+                for account in batch
+            ])
+            Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in users])
+    except IntegrityError:
+        if not retry:
+            raise
+        taken = _existing(batch)
+        result.existing += [account['email'] for account in batch if account['key'] in taken]
+        return _insert([account for account in batch if account['key'] not in taken], result, retry=False)
+
+    for account in batch:
+        email_lookup.cache.delete(account['key'])
+    return users
+
+
+class _hasher:
+    """Context manager returning a function that hashes a list of passwords, in a process pool if useful."""
+
+    def __init__(self, workers):
+        self.workers = max(workers or 1, 1)
+        self.pool = None
+
+    def __enter__(self):
+        return self.hash
+
+    def __exit__(self, *exc_info):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def hash(self, passwords):
+        if self.workers == 1 or len(passwords) < 2:
+            return [make_password(password) for password in passwords]
+        if self.pool is None:
+            # Spawned processes inherit DJANGO_SETTINGS_MODULE; the initializer must not
+            # live in a module that imports models before django.setup() has run.
+            self.pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup,
+            )
+        chunksize = max(len(passwords) // (self.workers * 4), 1)
+        return list(self.pool.map(make_password, passwords, chunksize=chunksize))
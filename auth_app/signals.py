@@ -0,0 +1,33 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from auth_app import email_lookup
+from auth_app.authentication import CachedTokenAuthentication
+
+"""
+Signal handlers invalidating the token authentication and email lookup caches.
+
+- Saving or deleting a token drops its cached resolution.
+- Saving or deleting a user (e.g. deactivating the account) drops every cached
+  token of that user, so the next request is authenticated against the database.
+  Saves that only update last_login (every login) keep them.
+- Saving or deleting a user drops the cached email lookups of the user, so a new
+  registration or a changed address or name is visible at once in this worker.
+"""
+
+@receiver([post_save, post_delete], sender=Token, dispatch_uid='auth_token_cache_token')
+def invalidate_token_cache(sender, instance, **kwargs):
+    CachedTokenAuthentication.invalidate_token(instance.key)
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid='auth_token_cache_user')
+def invalidate_user_token_cache(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    CachedTokenAuthentication.invalidate_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid='auth_email_lookup_user')
+def invalidate_email_lookup(sender, instance, **kwargs):
+    email_lookup.invalidate(instance)
@@ -0,0 +1,157 @@
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from auth_app import authentication, provisioning, throttling
+from auth_app.authentication import CachedTokenAuthentication
+
+
+class TokenCacheTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw', first_name='Ada')
+        self.token = Token.objects.create(user=self.user)
+        self.key = self.token.key
+        self.auth = CachedTokenAuthentication()
+
+    def cached(self):
+        return caches['default'].get(authentication._key(self.key))
+
+    def test_hit_builds_fresh_instances_without_queries(self):
+        first, _ = self.auth.authenticate_credentials(self.token.key)
+        self.assertIsNotNone(self.cached())
+        with self.assertNumQueries(0):
+            second, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertIsNot(first, second)
+        self.assertEqual((second.pk, second.first_name, token.key), (self.user.pk, 'Ada', self.token.key))
+
+        second.first_name = 'Changed'
+        third, _ = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(third.first_name, 'Ada')
+
+    def test_entry_holds_no_password_or_raw_token(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.assertNotIn(self.token.key, authentication._key(self.token.key))
+        self.assertNotIn(self.user.password, repr(self.cached()))
+
+    def test_deleted_token_is_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+        self.assertIsNone(self.cached())
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.key)
+
+    def test_deactivated_user_is_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.cached())
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_last_login_update_keeps_the_entry(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.save(update_fields=['last_login'])
+        self.assertIsNotNone(self.cached())
+
+    def test_async_path_shares_the_cache(self):
+        user, _ = async_to_sync(self.auth.aauthenticate_credentials)(self.key)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertIsNotNone(self.cached())
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(self.key)
+
+
+@override_settings(CACHES={**settings.CACHES, 'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttle-tests'}})
+class ThrottleTests(TestCase):
+
+    def setUp(self):
+        throttling.cache().clear()
+        User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.client = APIClient()
+
+    def login(self, email='user@example.com', address='10.0.0.1'):
+        return self.client.post('/api/login/', {'email': email, 'password': 'wrong'}, format='json', REMOTE_ADDR=address)
+
+    def test_rejects_with_retry_after_before_any_hasher_call(self):
+        with mock.patch.dict(throttling.RATES, {'login': {'ip': '2/m', 'email': None}}):
+            self.assertEqual([self.login().status_code for _ in range(2)], [400, 400])
+            with mock.patch.object(PBKDF2PasswordHasher, 'encode') as encode, \
+                    mock.patch.object(PBKDF2PasswordHasher, 'verify') as verify:
+                response = self.login()
+            self.assertEqual(self.login(address='10.0.0.2').status_code, 400)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertIn('detail', response.json())
+        encode.assert_not_called()
+        verify.assert_not_called()
+        self.assertEqual(throttling.stats()['login']['ip'], 1)
+
+    def test_email_limit_holds_across_addresses_and_spellings(self):
+        with mock.patch.dict(throttling.RATES, {'login': {'ip': None, 'email': '1/m'}}):
+            self.assertEqual(self.login(address='10.0.0.1').status_code, 400)
+            self.assertEqual(self.login(' USER@example.com', address='10.0.0.2').status_code, 429)
+            self.assertEqual(self.login('other@example.com', address='10.0.0.2').status_code, 400)
+
+    def test_registration_is_throttled_per_email(self):
+        data = {'fullname': 'Ada Lovelace', 'email': 'ada@example.com', 'password': 'pw', 'repeated_password': 'other'}
+        with mock.patch.dict(throttling.RATES, {'registration': {'ip': None, 'email': '1/h'}}):
+            self.assertEqual(self.client.post('/api/registration/', data, format='json').status_code, 400)
+            self.assertEqual(self.client.post('/api/registration/', data, format='json').status_code, 429)
+
+
+class UserImportTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin@example.com', 'admin@example.com', 'pw', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, text):
+        return self.client.post('/api/users/import/', {'file': SimpleUploadedFile('users.csv', text.encode())}, format='multipart')
+
+    def test_skips_taken_repeated_and_invalid_addresses(self):
+        rows = [
+            (2, {'email': 'ada@example.com', 'fullname': 'Ada Lovelace', 'password': 'secret'}),
+            (3, {'email': 'ADMIN@example.com'}),
+            (4, {'email': ' Ada@Example.com '}),
+            (5, {'email': 'not-an-address'}),
+            (6, {'email': 'grace@example.com', 'first_name': 'Grace', 'last_name': 'Hopper'}),
+        ]
+        result = provisioning.import_users(rows, workers=1).as_dict()
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['existing'], ['ADMIN@example.com'])
+        self.assertEqual([(error['line'], error['error']) for error in result['invalid']], [
+            (4, 'Duplicate of line 2.'), (5, 'Invalid email address.'),
+        ])
+
+        ada, grace = User.objects.get(email='ada@example.com'), User.objects.get(email='grace@example.com')
+        self.assertEqual((ada.first_name, ada.last_name, grace.last_name), ('Ada', 'Lovelace', 'Hopper'))
+        self.assertTrue(ada.check_password('secret'))
+        self.assertFalse(grace.has_usable_password())
+        self.assertEqual(Token.objects.filter(user__in=[ada, grace]).count(), 2)
+
+    def test_upload_hashes_in_process(self):
+        with mock.patch.object(provisioning, 'ProcessPoolExecutor') as pool:
+            response = self.upload('email,password\nada@example.com,one\ngrace@example.com,two\n')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 2)
+        pool.assert_not_called()
+
+    def test_upload_caps_rows_with_a_password(self):
+        with mock.patch.object(provisioning, 'MAX_UPLOAD_PASSWORDS', 1):
+            response = self.upload('email,password\nada@example.com,one\ngrace@example.com,two\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(User.objects.filter(email='ada@example.com').exists())
+
+    def test_upload_requires_staff(self):
+        self.client.force_authenticate(User.objects.create_user('user@example.com', 'user@example.com', 'pw'))
+        self.assertEqual(self.upload('email\nada@example.com\n').status_code, 403)
@@ -0,0 +1,139 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+from auth_app import email_lookup
+
+"""
+Sliding-window rate limits for CPU-heavy endpoints such as login and registration.
+
+Both endpoints hash a password with PBKDF2, by far the most expensive thing a
+worker does, so a burst of credential stuffing could occupy every worker. DRF
+runs throttles in APIView.initial(), before the handler, so a rejected request
+costs a few cache lookups and never reaches the password hasher. It is answered
+with 429 Too Many Requests, {"detail": ...} and a Retry-After header.
+
+Each view names its limits with throttle_scope; the rates of a scope are looked
+up in the AUTH_THROTTLE setting:
+- ALIAS (str): Cache the counters are kept in. It must be shared by all worker
+  processes (e.g. file-based, Memcached or Redis) for the limits to hold per host
+  instead of per worker.
+- RATES (dict): {scope: {'ip': '<n>/<s|m|h|d>', 'email': ...}}; a missing scope
+  or kind, or a rate of None, disables that limit.
+
+Throttle classes (add them to throttle_classes of any APIView with a throttle_scope):
+- IPRateThrottle: Counts requests per client address (BaseThrottle.get_ident(),
+  set REST_FRAMEWORK['NUM_PROXIES'] behind a proxy so it cannot be spoofed).
+- EmailRateThrottle: Counts requests per normalized 'email' of the request body,
+  so one account cannot be guessed at from many addresses.
+
+The window is a sliding-window counter: one counter per fixed window, and the
+previous window's count weighted by the share of it that still lies inside the
+sliding window. It needs two keys per client instead of a list of timestamps
+and is updated with cache.incr(), atomic on Memcached and Redis (on the
+file-based cache, concurrent requests may occasionally lose an increment).
+Rejected requests are counted too, so a client that keeps retrying stays throttled.
+
+Rejections are counted per scope and kind in the same cache; stats() returns
+them, e.g. {'login': {'ip': 12, 'email': 3}}, reset_stats() clears them (see the
+throttle_stats command).
+"""
+
+_config = getattr(settings, 'AUTH_THROTTLE', {})
+RATES = _config.get('RATES', {})
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def cache():
+    return caches[_config.get('ALIAS', 'default')]
+
+
+def parse_rate(rate):
+    """Returns (requests, seconds) for a rate like '5/min', or None for no limit."""
+    if not rate:
+        return None
+    requests, period = rate.split('/')
+    return int(requests), PERIODS[period[0]]
+
+
+def stats():
+    keys = {_rejected_key(scope, kind): (scope, kind) for scope, rates in RATES.items() for kind in rates}
+    counts = cache().get_many(list(keys))
+    result = {}
+    for key, (scope, kind) in keys.items():
+        result.setdefault(scope, {})[kind] = counts.get(key, 0)
+    return result
+
+
+def reset_stats():
+    cache().delete_many([_rejected_key(scope, kind) for scope, rates in RATES.items() for kind in rates])
+
+
+def _rejected_key(scope, kind):
+    return f'throttle:rejected:{scope}:{kind}'
+
+
+def _increment(store, key, timeout):
+    try:
+        return store.incr(key)
+    except ValueError:
+        if store.add(key, 1, timeout):
+            return 1
+        return store.incr(key)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    kind = None
+
+    def get_value(self, request):
+        raise NotImplementedError('.get_value() must be overridden')
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        limit = parse_rate(RATES.get(scope, {}).get(self.kind))
+        if limit is None:
+            return True
+        value = self.get_value(request)
+        if not value:
+            return True
+
+        requests, duration = limit
+        now = time.time()
+        window, elapsed = divmod(now, duration)
+        ident = hashlib.sha256(value.encode()).hexdigest()[:32]
+        key = f'throttle:{scope}:{self.kind}:{ident}:{int(window)}'
+
+        store = cache()
+        current = _increment(store, key, duration * 2)
+        previous = store.get(f'throttle:{scope}:{self.kind}:{ident}:{int(window) - 1}', 0)
+        weight = 1 - elapsed / duration
+        if previous * weight + current <= requests:
+            return True
+
+        # Seconds until the previous window has decayed enough for one more request;
+        # if the current window alone fills the limit, until it has decayed in turn.
+        if current < requests:
+            self._wait = max(duration * (1 - (requests - current - 1) / previous) - elapsed, 1)
+        else:
+            self._wait = duration - elapsed + duration * (1 - (requests - 1) / current)
+        _increment(store, _rejected_key(scope, self.kind), None)
+        return False
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    kind = 'ip'
+
+    def get_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(SlidingWindowThrottle):
+    kind = 'email'
+
+    def get_value(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email_lookup.normalize(email) if isinstance(email, str) else None
@@ -0,0 +1,80 @@
+import threading
+import time
+from collections import OrderedDict
+
+"""
+A small thread-safe LRU cache with an optional time-to-live.
+
+The cache lives in process memory, so every worker keeps its own copy. It is
+meant for hot lookups that are cheap to recompute and invalidated through
+signals within the process; the TTL bounds how long another worker can serve a
+stale entry.
+
+Methods:
+- get(key, default): Returns the cached value or default; counts a hit or a miss.
+- set(key, value): Stores a value, evicting the least recently used entry when full.
+- delete(key) / delete_where(predicate) / clear(): Invalidate entries.
+- stats(): Returns hits, misses, hit ratio, size and capacity.
+
+A maxsize of 0 disables the cache: nothing is stored and every get() is a miss.
+"""
+class LRUCache:
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [key for key, (value, _) in self._data.items() if predicate(key, value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
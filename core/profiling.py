@@ -0,0 +1,152 @@
+import cProfile
+import hmac
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+
+"""
+On-demand profiling of single live requests, for slow requests that only happen on production data.
+
+ProfilingMiddleware profiles a request when it carries the profiling token,
+either in an X-Profile header (preferred; query strings end up in access logs)
+or as ?profile=<token>. Every other request passes through untouched. The
+profile is written to DIRECTORY as '<view>-<time>-<pid>-<n>.<ext>', and its
+file name is returned in the X-Profile-Dump response header:
+- cprofile: A cProfile dump (.prof) with exact call counts and times; readable
+  with pstats, snakeviz or the profile_report command. Slows the request down
+  considerably, mostly in code making many small calls.
+- sampling: A thread samples the request's stack every INTERVAL_MS and writes
+  the counts as collapsed stacks (.folded, one 'frame;frame;frame count' line
+  per stack), the input of flame graph tools and profile_report. Far lower
+  overhead, but only statistical, and it misses work shorter than the interval.
+
+Only the newest MAX_DUMPS files are kept; older ones are deleted after every dump.
+
+The profiler is configured with the REQUEST_PROFILING setting:
+- ENABLED (bool): Off by default. When off, the middleware removes itself at
+  startup (MiddlewareNotUsed) and costs nothing.
+- TOKEN (str): Secret a request must present; required when enabled. Anyone
+  holding it can trigger profiling and learn internal function names.
+- MODE (str): 'cprofile' or 'sampling'.
+- INTERVAL_MS (float): Sampling interval of the sampling mode.
+- DIRECTORY (str or Path): Where the dumps are written.
+- MAX_DUMPS (int): Number of dumps kept.
+
+Notes:
+- Streamed bodies (streaming, Server-Sent Events) are produced after the
+  response has left the middleware and are not part of the profile.
+- The middleware is synchronous; under ASGI, Django runs it and the async views
+  in a worker thread while it is enabled.
+
+Functions:
+- dumps(): Returns {view: [dump paths]} for the dumps in a directory (default DIRECTORY).
+"""
+
+_config = getattr(settings, 'REQUEST_PROFILING', {})
+ENABLED = _config.get('ENABLED', False)
+TOKEN = _config.get('TOKEN')
+MODE = _config.get('MODE', 'cprofile')
+INTERVAL_MS = _config.get('INTERVAL_MS', 5)
+DIRECTORY = Path(_config.get('DIRECTORY') or Path(tempfile.gettempdir()) / 'kanmind-profiles')
+MAX_DUMPS = _config.get('MAX_DUMPS', 200)
+
+EXTENSIONS = {'cprofile': '.prof', 'sampling': '.folded'}
+_sequence = itertools.count(1)
+
+
+def dumps(directory=None):
+    result = {}
+    for path in sorted(Path(directory or DIRECTORY).glob('*-*')):
+        if path.suffix in EXTENSIONS.values():
+            result.setdefault(path.name.split('-', 1)[0], []).append(path)
+    return result
+
+
+def _modified(path):
+    # Another worker may be rotating the same directory.
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0
+
+
+class SamplingProfiler:
+    """Samples the stack of the thread that created it; used as a context manager around the request."""
+
+    def __init__(self, interval_ms=INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def __enter__(self):
+        self.sampler = threading.Thread(target=self.sample, name='request-profiler', daemon=True)
+        self.sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.sampler.join()
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump_stats(self, path):
+        with open(path, 'w') as stream:
+            for stack, count in self.stacks.most_common():
+                stream.write(f'{stack} {count}\n')
+
+
+class ProfilingMiddleware:
+
+    def __init__(self, get_response):
+        if not ENABLED:
+            raise MiddlewareNotUsed
+        if not TOKEN:
+            raise ImproperlyConfigured("REQUEST_PROFILING['TOKEN'] must be set to enable request profiling.")
+        if MODE not in EXTENSIONS:
+            raise ImproperlyConfigured(f"REQUEST_PROFILING['MODE'] must be one of: {', '.join(EXTENSIONS)}.")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        supplied = request.headers.get('X-Profile') or request.GET.get('profile')
+        if not supplied or not hmac.compare_digest(supplied.encode(), TOKEN.encode()):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile() if MODE == 'cprofile' else SamplingProfiler()
+        with profiler:
+            response = self.get_response(request)
+        response['X-Profile-Dump'] = self.save(request, profiler)
+        return response
+
+    def save(self, request, profiler):
+        match = request.resolver_match
+        view = getattr(match.func, 'view_class', match.func).__name__ if match else 'unresolved'
+        name = f"{view}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}{EXTENSIONS[MODE]}"
+        DIRECTORY.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(DIRECTORY / name)
+        self.rotate()
+        return name
+
+    def rotate(self):
+        paths = [path for paths in dumps().values() for path in paths]
+        if len(paths) <= MAX_DUMPS:
+            return
+        paths.sort(key=_modified)
+        for path in paths[:len(paths) - MAX_DUMPS]:
+            path.unlink(missing_ok=True)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import tempfile
 from pathlib import Path
 from corsheaders.defaults import default_headers
 from corsheaders.defaults import default_methods
@@ -46,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.timing.TimingMiddleware',
+    'core.profiling.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -136,6 +139,150 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.CachedTokenAuthentication',
     ]
-}
\ No newline at end of file
+}
+
+# Token authentication cache (auth_app.authentication.CachedTokenAuthentication)
+# Token -> user resolutions in the ALIAS cache for TTL seconds; TTL 0 disables
+# it. Point ALIAS at a cache shared by all workers so that logouts and
+# deactivations take effect everywhere at once.
+
+AUTH_TOKEN_CACHE = {
+    'ALIAS': 'default',
+    'TTL': 60,
+}
+
+# Email lookups of the member pickers (auth_app.email_lookup)
+# Per-worker LRU of normalized email -> user (or "no such user"). MAX_SIZE 0
+# disables it; TTL bounds how long another worker may miss a new registration.
+
+AUTH_EMAIL_LOOKUP = {
+    'MAX_SIZE': 10000,
+    'TTL': 30,
+}
+
+# Board membership cache (kanban_app.membership)
+# Per-worker LRU of (board, user) membership answers. MAX_SIZE 0 disables it;
+# TTL bounds how long another worker may serve an answer after members change.
+
+KANBAN_MEMBERSHIP_CACHE = {
+    'MAX_SIZE': 4096,
+    'TTL': 10,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'kanmind-throttle',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+# Login and registration rate limits (auth_app.throttling)
+# Sliding-window limits per client address and per email, checked before any
+# password hashing. ALIAS must be a cache shared by all workers of a host; a
+# rate of None disables a limit. Behind a proxy, set REST_FRAMEWORK['NUM_PROXIES'].
+
+AUTH_THROTTLE = {
+    'ALIAS': 'throttle',
+    'RATES': {
+        'login': {'ip': '30/min', 'email': '10/min'},
+        'registration': {'ip': '20/hour', 'email': '5/hour'},
+    },
+}
+
+# Bulk user import (auth_app.provisioning, import_users, POST /api/users/import/)
+# Passwords are hashed in WORKERS processes (None: one per CPU core), users and
+# tokens inserted BATCH_SIZE at a time. The endpoint takes MAX_UPLOAD_ROWS rows,
+# at most MAX_UPLOAD_PASSWORDS of them with a password: it hashes in the request
+# worker (about 0.5 s per password), so keep that within the request timeout.
+
+AUTH_PROVISIONING = {
+    'WORKERS': None,
+    'BATCH_SIZE': 1000,
+    'MAX_UPLOAD_ROWS': 5000,
+    'MAX_UPLOAD_PASSWORDS': 20,
+}
+
+# Board detail response cache (kanban_app.api.response_cache)
+# Rendered board JSON keyed by (board, version); TIMEOUT 0 disables it.
+# Point ALIAS at a file-based cache to share entries between workers.
+
+KANBAN_BOARD_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
+# Live board events (kanban_app.events, GET /api/boards/{pk}/events/)
+# Server-Sent Events need an ASGI server, e.g. uvicorn core.asgi:application.
+# LocalBackend only reaches streams of the same worker; point BACKEND at a
+# broker-backed implementation when running several workers.
+
+KANBAN_EVENTS = {
+    'BACKEND': 'kanban_app.events.LocalBackend',
+    'MAX_SUBSCRIBERS': 1000,
+    'QUEUE_SIZE': 100,
+    'HEARTBEAT': 15,
+    'RETRY': 3000,
+}
+
+# Native async read views (kanban_app.api.async_views)
+# Serve the read-only list endpoints on the event loop instead of a worker
+# thread. Only pays off under ASGI; see the benchmark_read_views command.
+
+KANBAN_ASYNC_VIEWS = False
+
+# Streaming JSON responses (kanban_app.api.streaming)
+# Large boards and task lists are rendered CHUNK_SIZE rows at a time instead of
+# in one piece. Boards with BOARD_THRESHOLD or more tasks are always streamed
+# (0 disables that); GZIP compresses streams for clients that accept it.
+
+KANBAN_STREAMING = {
+    'CHUNK_SIZE': 2000,
+    'BOARD_THRESHOLD': 5000,
+    'GZIP': True,
+}
+
+# Full-text search (kanban_app.search, GET /api/search/)
+# Only the newest MAX_CANDIDATES matches of a query are ranked, which bounds the
+# cost of very common words; SNIPPET_WORDS is the length of the result snippets.
+
+KANBAN_SEARCH = {
+    'MAX_CANDIDATES': 1000,
+    'SNIPPET_WORDS': 12,
+}
+
+# Request timing instrumentation (core.timing.TimingMiddleware)
+# Server-Timing header with SQL, serializer and render time, and a log record in
+# the 'core.timing' logger for requests slower than SLOW_MS or repeating one
+# statement DUPLICATE_THRESHOLD times (N+1). Disabled, the middleware unloads itself.
+
+REQUEST_TIMING = {
+    'ENABLED': False,
+    'HEADER': True,
+    'SLOW_MS': 500,
+    'TOP_QUERIES': 5,
+    'DUPLICATE_THRESHOLD': 5,
+}
+
+# On-demand request profiling (core.profiling.ProfilingMiddleware, profile_report)
+# Requests sending TOKEN in an X-Profile header are profiled with cProfile or the
+# sampling profiler (MODE) and dumped to DIRECTORY, keeping the newest MAX_DUMPS.
+# Disabled, the middleware unloads itself; TOKEN is required when enabled.
+
+REQUEST_PROFILING = {
+    'ENABLED': False,
+    'TOKEN': None,
+    'MODE': 'cprofile',
+    'INTERVAL_MS': 5,
+    'DIRECTORY': Path(tempfile.gettempdir()) / 'kanmind-profiles',
+    'MAX_DUMPS': 200,
+}
@@ -0,0 +1,200 @@
+import contextvars
+import functools
+import json
+import logging
+import re
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+"""
+Per-request SQL and timing instrumentation, for finding out why an endpoint is slow.
+
+TimingMiddleware records for every request:
+- db: Number of SQL queries and the time spent executing them, on all databases.
+- serialize: Time spent in DRF serializers (serializer.data) and the serializer-free
+  projections (kanban_app.api.projections). Queries run by lazy querysets while
+  serializing count here and under db.
+- render: Time spent rendering the response (JSON renderer), after the view returned.
+- total: Time from the first to the last middleware.
+
+The values are sent in a Server-Timing header, shown by the browser developer tools:
+    Server-Timing: db;dur=12.4;desc="7 queries", serialize;dur=3.1, render;dur=0.8, total;dur=21.9
+
+Requests slower than SLOW_MS, and requests running the same statement at least
+DUPLICATE_THRESHOLD times (the N+1 pattern: one query per row of a list), are
+logged to the 'core.timing' logger as one JSON object: method, path, route,
+status, the timings, the TOP_QUERIES slowest statements and the repeated
+statements. Statements are compared normalized: numbers and string literals
+replaced by ?, and IN lists of any length collapsed to IN (...).
+
+The instrumentation is configured with the REQUEST_TIMING setting:
+- ENABLED (bool): Off by default. When off, the middleware removes itself at
+  startup (MiddlewareNotUsed) and the serializers are left untouched; the only
+  remaining cost is one context variable lookup per timed projection call.
+- HEADER (bool): Send the Server-Timing header. It reveals internals; keep it
+  off where clients should not see them and use the log alone.
+- SLOW_MS (float): Threshold of the slow-request log.
+- TOP_QUERIES (int): Slowest statements included in a log record.
+- DUPLICATE_THRESHOLD (int): Executions of one normalized statement that mark
+  an N+1 pattern; 0 disables the check.
+
+Notes:
+- The middleware is synchronous; under ASGI, Django runs it and the async views
+  in a worker thread while it is enabled.
+- Streamed bodies (streaming, Server-Sent Events) are produced after the
+  response has left the middleware; their queries and time are not included.
+
+Functions:
+- timed(): Decorator adding the run time of a function to a segment of the
+  current request (nested calls are counted once).
+- normalize(): Returns the normalized form of a SQL statement.
+"""
+
+_config = getattr(settings, 'REQUEST_TIMING', {})
+ENABLED = _config.get('ENABLED', False)
+HEADER = _config.get('HEADER', True)
+SLOW_MS = _config.get('SLOW_MS', 500)
+TOP_QUERIES = _config.get('TOP_QUERIES', 5)
+DUPLICATE_THRESHOLD = _config.get('DUPLICATE_THRESHOLD', 5)
+
+logger = logging.getLogger(__name__)
+_current = contextvars.ContextVar('request_timing', default=None)
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def normalize(sql):
+    return _NUMBER.sub('?', _STRING.sub('?', _IN_LIST.sub('IN (...)', sql)))
+
+
+def timed(segment):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            timing = _current.get()
+            if timing is None or timing.active:
+                return function(*args, **kwargs)
+            timing.active = segment
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timing.active = None
+                timing.segments[segment] += (time.perf_counter() - started) * 1000
+        return wrapper
+    return decorator
+
+
+class RequestTiming:
+    """Collects the timings of one request; also the execute wrapper that times every statement."""
+
+    def __init__(self):
+        self.queries = []
+        self.segments = {'serialize': 0.0, 'render': 0.0}
+        self.active = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(((time.perf_counter() - started) * 1000, sql))
+
+    def start_render(self, response):
+        started = time.perf_counter()
+
+        def finish(rendered):
+            self.segments['render'] += (time.perf_counter() - started) * 1000
+
+        response.add_post_render_callback(finish)
+
+    @property
+    def sql_ms(self):
+        return sum(duration for duration, _ in self.queries)
+
+    def slowest(self, count):
+        return [
+            {'sql': sql, 'ms': round(duration, 2)}
+            for duration, sql in sorted(self.queries, key=lambda query: query[0], reverse=True)[:count]
+        ]
+
+    def duplicates(self, threshold):
+        statements = {}
+        for duration, sql in self.queries:
+            entry = statements.setdefault(normalize(sql), [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+        return [
+            {'sql': sql, 'count': count, 'ms': round(duration, 2)}
+            for sql, (count, duration) in sorted(statements.items(), key=lambda item: item[1][0], reverse=True)
+            if threshold and count >= threshold
+        ]
+
+    def header(self, total_ms):
+        return ', '.join([
+            f'db;dur={self.sql_ms:.1f};desc="{len(self.queries)} {"query" if len(self.queries) == 1 else "queries"}"',
+            *(f'{segment};dur={duration:.1f}' for segment, duration in self.segments.items()),
+            f'total;dur={total_ms:.1f}',
+        ])
+
+
+class TimingMiddleware:
+    serializers_patched = False
+
+    def __init__(self, get_response):
+        if not ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if not TimingMiddleware.serializers_patched:
+            from rest_framework.serializers import BaseSerializer
+            BaseSerializer.data = property(timed('serialize')(BaseSerializer.data.fget))
+            TimingMiddleware.serializers_patched = True
+
+    def __call__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timing))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        if HEADER:
+            response['Server-Timing'] = timing.header(total_ms)
+        duplicates = timing.duplicates(DUPLICATE_THRESHOLD)
+        if total_ms >= SLOW_MS or duplicates:
+            self.log(request, response, timing, total_ms, duplicates)
+        return response
+
+    def process_template_response(self, request, response):
+        # Listed first in MIDDLEWARE, this runs last, right before the response is rendered.
+        timing = _current.get()
+        if timing is not None:
+            timing.start_render(response)
+        return response
+
+    def log(self, request, response, timing, total_ms, duplicates):
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'route': match.route if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(timing.sql_ms, 2),
+            'queries': len(timing.queries),
+            **{f'{segment}_ms': round(duration, 2) for segment, duration in timing.segments.items()},
+            'slowest': timing.slowest(TOP_QUERIES),
+            'duplicates': duplicates,
+        }
+        reason = 'Slow request' if total_ms >= SLOW_MS else 'Repeated queries'
+        logger.warning('%s: %s', reason, json.dumps(record), extra={'timing': record})
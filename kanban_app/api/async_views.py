@@ -0,0 +1,139 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import Http404, HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from auth_app.authentication import CachedTokenAuthentication
+from kanban_app.membership import ahas_board_access
+from kanban_app.models import Boards, Tasks
+from . import streaming
+from .conditional import board_validators, is_not_modified, set_validators
+from .pagination import KeysetPagination
+from .projections import BOARD_LIST_FIELDS, TaskProjection, requested_fields
+from .serializers import BoardSerializer, CommentSerializer
+from .views import AssignedToMeView, BoardsView, ReviewingTasksView, TaskCommentsView, comment_feed
+
+"""
+Native async variants of the read-only list endpoints for ASGI deployments.
+
+Under ASGI every DRF APIView runs in a worker thread (sync_to_async), so the
+number of concurrent requests a worker can serve is bounded by its thread pool.
+These views answer GET and HEAD on the event loop instead: authentication
+(CachedTokenAuthentication.aauthenticate), the board access check
+(ahas_board_access) and every query use the async ORM, and the result is
+rendered with the same serializers (or projections) and JSON renderer as the
+sync views, so responses are byte-identical. Streamed task lists (?stream=1)
+read their rows with aiterator() and never leave the event loop.
+
+Any other method (POST on /boards/, POST on /tasks/{task_id}/comments/, OPTIONS)
+is handed to the sync view in a thread, unchanged.
+
+The views are mounted instead of the sync ones when KANBAN_ASYNC_VIEWS is
+enabled (see kanban_app.api.urls); under WSGI they still work, but gain nothing.
+"""
+class AsyncReadView(View):
+    sync_view = None
+    authentication = CachedTokenAuthentication()
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await sync_to_async(self.sync_view.as_view())(request, *args, **kwargs)
+
+        request = Request(request, authenticators=())
+        try:
+            credentials = await self.authentication.aauthenticate(request)
+            if credentials is None:
+                raise exceptions.NotAuthenticated()
+            request.user, request.auth = credentials
+            return await self.get(request, *args, **kwargs)
+        except Http404 as exc:
+            return self.error(exceptions.NotFound(*exc.args))
+        except exceptions.APIException as exc:
+            return self.error(exc)
+
+    def error(self, exc):
+        data = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+        response = self.render(data, exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response['WWW-Authenticate'] = self.authentication.authenticate_header(None)
+        return response
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(JSONRenderer().render(data), status=status_code, content_type='application/json')
+
+    async def get_list(self, request, queryset, serialize, item=None):
+        paginator = KeysetPagination()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        if page is not None:
+            return self.render(paginator.get_paginated_data(serialize(page)))
+        if item is not None and streaming.is_requested(request):
+            items = (item(row) async for row in streaming.arows(queryset))
+            return streaming.aresponse(request, streaming.ajson_list(items))
+        return self.render(serialize([obj async for obj in queryset]))
+
+"""
+GET /boards/: async variant of BoardsView (same response, same pagination).
+"""
+class AsyncBoardsView(AsyncReadView):
+    sync_view = BoardsView
+
+    async def get(self, request):
+        fields = requested_fields(request, BOARD_LIST_FIELDS)
+        memberships = Boards.members.through.objects.filter(user=request.user).values('boards_id')
+        boards = Boards.objects.filter(Q(owner=request.user) | Q(pk__in=memberships)).only('id', *fields)
+        return await self.get_list(
+            request, boards, lambda page: BoardSerializer(page, many=True, fields=fields, context={'request': request}).data
+        )
+
+"""
+GET /tasks/assigned-to-me/: async variant of AssignedToMeView.
+"""
+class AsyncAssignedToMeView(AsyncReadView):
+    sync_view = AssignedToMeView
+
+    async def get(self, request):
+        projection = TaskProjection.from_request(request)
+        tasks = projection.values(Tasks.objects.filter(assignee=request.user))
+        return await self.get_list(request, tasks, projection.items, projection.item)
+
+"""
+GET /tasks/reviewing/: async variant of ReviewingTasksView.
+"""
+class AsyncReviewingTasksView(AsyncReadView):
+    sync_view = ReviewingTasksView
+
+    async def get(self, request):
+        projection = TaskProjection.from_request(request)
+        tasks = projection.values(Tasks.objects.filter(reviewer=request.user))
+        return await self.get_list(request, tasks, projection.items, projection.item)
+
+"""
+GET /tasks/{task_id}/comments/: async variant of TaskCommentsView.
+
+Returns 404 if the task does not exist, 403 if the user is neither owner nor
+member of its board, and 304 if the ETag or Last-Modified date still matches.
+"""
+class AsyncTaskCommentsView(AsyncReadView):
+    sync_view = TaskCommentsView
+
+    async def get(self, request, task_id):
+        task = await Tasks.objects.select_related('board').filter(id=task_id).afirst()
+        if task is None:
+            raise Http404(f"No {Tasks._meta.object_name} matches the given query.")
+        if not await ahas_board_access(request.user, task.board, request):
+            raise exceptions.PermissionDenied()
+
+        etag, last_modified = board_validators('comments', task.pk, task.board)
+        if is_not_modified(request, etag, last_modified):
+            return set_validators(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+        comments = [comment async for comment in comment_feed(task, request)]
+        return set_validators(self.render(CommentSerializer(comments, many=True).data), etag, last_modified)
@@ -0,0 +1,59 @@
+import hashlib
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+"""
+Helpers for conditional GET requests based on the board version.
+
+Every write to a board, its members, tasks or comments increments Boards.version,
+so (scope, object ID, board version) identifies one exact representation and
+can be used as a strong ETag. updated_at of the board serves as Last-Modified.
+Responses narrowed with ?fields= get an ETag of their own: a hash of the
+field selection is appended, so a cached sparse body never answers a request
+for another selection. Gzip-compressed bodies get the weak form W/"..." of the
+ETag, as with Django's GZipMiddleware; If-None-Match is compared weakly, so
+either form matches the same board version.
+
+Functions:
+- board_validators(): Returns the ETag and Last-Modified value for a resource of a board,
+  optionally for a field selection (see projections.field_selection()).
+- is_not_modified(): Evaluates If-None-Match (preferred) or If-Modified-Since.
+- not_modified_response(): Returns an empty 304 response carrying the validators.
+- set_validators(): Adds ETag and Last-Modified headers to a response, weakening the
+  ETag of gzip-encoded responses.
+"""
+
+def board_validators(scope, object_id, board, selection=''):
+    tag = f"{scope}-{object_id}-v{board.version}"
+    if selection:
+        tag += f"-f{hashlib.blake2s(selection.encode(), digest_size=8).hexdigest()}"
+    etag = quote_etag(tag)
+    last_modified = int(board.updated_at.timestamp())
+    return etag, last_modified
+
+
+def is_not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or _weak(etag) in {_weak(tag) for tag in etags}
+
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def _weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def set_validators(response, etag, last_modified):
+    if response.get('Content-Encoding') == 'gzip' and etag.startswith('"'):
+        etag = f'W/{etag}'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def not_modified_response(etag, last_modified):
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
@@ -0,0 +1,68 @@
+import asyncio
+import json
+from kanban_app import events
+
+"""
+Server-Sent Events framing for the live board stream (BoardEventsView).
+
+An EventStream wraps one hub subscription (kanban_app.events) and yields the
+text/event-stream body:
+- retry: Suggested reconnect delay, sent once.
+- event 'ready': Sent once; its ID is the board cursor at the time the stream opened.
+- event 'task', 'member', 'comment' or 'board': One per change; the ID is the
+  board cursor that includes it, data is {board, version, kind, id, deleted}.
+- event 'resync': The client missed events (stale Last-Event-ID or a full queue);
+  it should call GET /boards/{pk}/changes/?since=<data.since>. After a full queue
+  the stream ends.
+- ': keepalive' comments after HEARTBEAT seconds without events, so proxies and
+  clients keep the idle connection open.
+
+The stream ends after the board was deleted. close() releases the subscription
+and is called by Django when the response is closed, also if the client
+disconnects before the first event.
+"""
+
+def format_event(event, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+class EventStream:
+    def __init__(self, subscriber, cursor, last_event_id=None):
+        self.subscriber = subscriber
+        self.cursor = cursor
+        self.last_event_id = last_event_id
+        self.closed = False
+
+    async def __aiter__(self):
+        board_id = self.subscriber.board_id
+        opened_at = complete = self.cursor
+        yield f"retry: {events.RETRY}\n\n".encode()
+        yield format_event('ready', {'board': board_id, 'cursor': str(self.cursor)}, self.cursor)
+        if self.last_event_id is not None and self.last_event_id < self.cursor:
+            yield format_event('resync', {'board': board_id, 'since': str(self.last_event_id)})
+
+        while True:
+            try:
+                message = await asyncio.wait_for(self.subscriber.queue.get(), events.HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield b': keepalive\n\n'
+                continue
+
+            if message is events.OVERFLOW:
+                yield format_event('resync', {'board': board_id, 'since': str(complete)})
+                return
+            if message['version'] is not None and message['version'] <= opened_at:
+                continue
+
+            if message['version'] is not None and message['version'] > self.cursor:
+                complete, self.cursor = self.cursor, message['version']
+            yield format_event(message['kind'], message, message['version'])
+            if message['kind'] == 'board' and message['deleted']:
+                return
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            events.unsubscribe(self.subscriber)
@@ -0,0 +1,167 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+"""
+Opt-in keyset (cursor) pagination for list endpoints.
+
+Pagination is only applied when the request carries a 'limit' or 'cursor'
+query parameter, so clients that expect a plain list keep getting one.
+
+Query parameters:
+- limit (int, optional): Page size, capped at max_limit (default: default_limit).
+- cursor (string, optional): Opaque cursor taken from a previous 'next' or 'previous' link.
+
+Returns:
+- next (URL or null): Link to the following page.
+- previous (URL or null): Link to the preceding page.
+- results (list): The serialized page.
+
+Notes:
+- Pages are selected with a WHERE clause on the ordering key instead of OFFSET,
+  so fetching a deep page costs the same as fetching the first one.
+- The ordering fields must be non-nullable and end with a unique field (e.g. 'id').
+- apaginate_queryset() fetches the page with the async ORM (async views).
+- Querysets of model instances and .values() querysets (see projections) are both supported.
+"""
+class KeysetPagination(BasePagination):
+    ordering = ('id',)
+    default_limit = 50
+    max_limit = 200
+    limit_query_param = 'limit'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.limit_query_param in params or self.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        queryset, position, reverse = self.page_queryset(queryset, request)
+        return self.set_page(list(queryset), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        queryset, position, reverse = self.page_queryset(queryset, request)
+        return self.set_page([obj async for obj in queryset], position, reverse)
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        self.limit = self.get_limit(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = [f'-{field}' if reverse else field for field in self.ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.position_filter(position, reverse))
+        return queryset[:self.limit + 1], position, reverse
+
+    def set_page(self, results, position, reverse):
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        has_next = has_more if not reverse else position is not None
+        has_previous = has_more if reverse else position is not None
+        self.next_position = self.get_position(results[-1]) if has_next and results else None
+        self.previous_position = self.get_position(results[0]) if has_previous and results else None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_link(self.next_position, reverse=False),
+            'previous': self.get_link(self.previous_position, reverse=True),
+            'results': data,
+        }
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def position_filter(self, position, reverse):
+        lookup = 'lt' if reverse else 'gt'
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            step = Q(**{f'{field}__{lookup}': position[index]})
+            for previous_field, value in zip(self.ordering[:index], position):
+                step &= Q(**{previous_field: value})
+            condition |= step
+        return condition
+
+    def get_position(self, obj):
+        if isinstance(obj, dict):
+            return [obj[field] for field in self.ordering]
+        return [getattr(obj, field) for field in self.ordering]
+
+    def get_link(self, position, reverse):
+        if position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, reverse))
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': [str(value) for value in position], 'r': int(reverse)}
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return self.to_position(values, model), bool(payload.get('r'))
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_position(self, values, model):
+        return [model._meta.get_field(field).to_python(value) for field, value in zip(self.ordering, values)]
+
+"""
+Keyset pagination over ranked search hits (see kanban_app.search).
+
+Hits are dicts ordered by (rank, key); the cursor carries the position of the
+last hit of a page. Only forward links are produced: a ranked result list is
+read from the top, so 'previous' is always null.
+"""
+class SearchPagination(KeysetPagination):
+    ordering = ('rank', 'key')
+    default_limit = 20
+    max_limit = 100
+
+    def paginate_hits(self, search, request):
+        self.request = request
+        self.limit = self.get_limit(request)
+        position, reverse = self.decode_cursor(request, None)
+        if reverse:
+            raise NotFound(self.invalid_cursor_message)
+        hits = self.set_page(search(position, self.limit + 1), position, reverse)
+        self.previous_position = None
+        return hits
+
+    def to_position(self, values, model):
+        return [float(values[0]), int(values[1])]
@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from kanban_app.membership import has_board_access
 
 """
 Custom permission: Allows access to board members or the board owner.
@@ -18,8 +19,8 @@ class IsBoardMemberOrOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         if request.method in SAFE_METHODS:
-            return request.user == obj.owner or request.user in obj.members.all()
-        return request.user == obj.owner
+            return has_board_access(request.user, obj, request)
+        return obj.owner_id == request.user.id
     
 """
 Custom permission: Allows access only to members or the owner of the task's board.
@@ -31,6 +32,7 @@ Rules:
 
 Used for securing task-related or comment-related views,
 ensuring only those involved in the board can access or modify the task or its comments.
+The check is a single EXISTS query (see kanban_app.membership); the board is never loaded.
 
 Example usage:
     permission_classes = [IsAuthenticated, IsMemberOfTasksBoard]
@@ -38,11 +40,7 @@ Example usage:
 class IsMemberOfTasksBoard(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        board = obj.board
-        return (
-            request.user == board.owner or
-            request.user in board.members.all()
-        )
+        return has_board_access(request.user, obj.board_id, request)
     
 """
 Custom permission: Allows access only to the author of a comment.
@@ -57,4 +55,4 @@ Example usage:
 """ 
 class IsCommentAuthor(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
\ No newline at end of file
+        return obj.author_id == request.user.id
\ No newline at end of file
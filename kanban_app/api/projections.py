@@ -0,0 +1,182 @@
+from operator import itemgetter
+from rest_framework.exceptions import ValidationError
+from core.timing import timed
+
+"""
+Serializer-free read path for task lists and the board detail.
+
+The read-only list endpoints render thousands of tasks per request. Instead of
+loading model instances and running the DRF field machinery for every field of
+every row (plus a nested UserInfoSerializer per assignee and reviewer), the
+querysets are projected onto exactly the rendered columns with .values(), the
+assignee and reviewer joined in the same query, and the output dicts are
+assembled directly.
+
+With all fields selected, the dicts have the same keys in the same order and
+the same value types as the serializers they replace, so the rendered JSON is
+byte-for-byte identical:
+- TaskProjection(TASK_LIST_FIELDS): TaskReviewingAndAssignedToMeSerializer.
+- TaskProjection(BOARD_TASK_FIELDS): TaskBoardSerializer.
+- UserProjection(): UserInfoSerializer.
+- BoardDetailProjection(): BoardSingleSerializer.
+
+Sparse fieldsets:
+- fields=id,title,status narrows the top-level objects (also of the board list,
+  rendered by BoardSerializer from a queryset narrowed with only()).
+- fields[assignee]=, fields[reviewer]=, fields[members]= and fields[tasks]=
+  narrow the nested objects.
+Fields keep their usual order; unknown fields are answered with 400. Only the
+columns behind the selected fields are read: an unselected description is
+never loaded, an unselected assignee or reviewer is not joined, and the board
+detail skips the member or task query entirely when they are not selected.
+
+The serializers remain the reference implementation; the kanban_app tests check
+both paths for parity, and the benchmark_task_serialization command compares
+their cost per 10k tasks.
+Querysets passed to values() may be filtered, ordered and paginated as usual,
+or read with iterator() for streamed responses (see streaming).
+"""
+
+USER_INFO_FIELDS = ('id', 'email', 'fullname')
+BOARD_TASK_FIELDS = ('id', 'title', 'description', 'status', 'priority', 'assignee', 'reviewer', 'due_date', 'comments_count')
+TASK_LIST_FIELDS = ('id', 'board', *BOARD_TASK_FIELDS[1:])
+BOARD_DETAIL_FIELDS = ('id', 'title', 'owner_id', 'members', 'tasks')
+BOARD_LIST_FIELDS = ('id', 'title', 'member_count', 'ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count', 'owner_id')
+
+TASK_COLUMNS = {'board': 'board_id'}
+TASK_USERS = ('assignee', 'reviewer')
+
+
+def requested_fields(request, allowed, name=None):
+    """Returns the fields selected by fields= (or fields[name]=) in their usual order, or all of them."""
+    key = 'fields' if name is None else f'fields[{name}]'
+    raw = request.query_params.get(key) if request is not None else None
+    if raw is None:
+        return allowed
+
+    requested = {field.strip() for field in raw.split(',') if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValidationError({key: [f"Unknown field(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}."]})
+    return tuple(field for field in allowed if field in requested)
+
+
+def _is_fields_key(key):
+    return key == 'fields' or key.startswith('fields[')
+
+
+def has_sparse_fields(request):
+    return any(_is_fields_key(key) for key in request.query_params)
+
+
+def field_selection(request):
+    """Returns the fields= parameters in a canonical form ('' without any), e.g. for the ETag of a sparse response."""
+    return '&'.join(
+        f"{key}={','.join(sorted({field.strip() for field in request.query_params[key].split(',') if field.strip()}))}"
+        for key in sorted(request.query_params) if _is_fields_key(key)
+    )
+
+
+def _format_date(value):
+    return value.isoformat() if value else None
+
+
+class UserProjection:
+    def __init__(self, fields=USER_INFO_FIELDS, prefix=''):
+        self.id_column = f'{prefix}id'
+        self.columns = [self.id_column]
+        self.getters = []
+        for field in fields:
+            if field == 'fullname':
+                first_name, last_name = f'{prefix}first_name', f'{prefix}last_name'
+                self.columns += [first_name, last_name]
+                self.getters.append((field, lambda row: f"{row[first_name]} {row[last_name]}".strip()))
+            else:
+                if field != 'id':
+                    self.columns.append(f'{prefix}{field}')
+                self.getters.append((field, itemgetter(f'{prefix}{field}')))
+
+    @classmethod
+    def from_request(cls, request, name=None, prefix=''):
+        return cls(requested_fields(request, USER_INFO_FIELDS, name), prefix)
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def item(self, row):
+        if row[self.id_column] is None:
+            return None
+        return {field: get(row) for field, get in self.getters}
+
+
+class TaskProjection:
+    def __init__(self, output=TASK_LIST_FIELDS, fields=None, assignee=USER_INFO_FIELDS, reviewer=USER_INFO_FIELDS):
+        users = {'assignee': UserProjection(assignee, 'assignee__'), 'reviewer': UserProjection(reviewer, 'reviewer__')}
+        self.columns = ['id']
+        self.getters = []
+        for field in output if fields is None else fields:
+            if field in TASK_USERS:
+                self.columns += users[field].columns
+                self.getters.append((field, users[field].item))
+                continue
+            column = TASK_COLUMNS.get(field, field)
+            if column != 'id':
+                self.columns.append(column)
+            get = itemgetter(column)
+            self.getters.append((field, (lambda row: _format_date(row['due_date'])) if column == 'due_date' else get))
+
+    @classmethod
+    def from_request(cls, request, output=TASK_LIST_FIELDS, name=None):
+        return cls(
+            output,
+            requested_fields(request, output, name),
+            requested_fields(request, USER_INFO_FIELDS, 'assignee'),
+            requested_fields(request, USER_INFO_FIELDS, 'reviewer'),
+        )
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def item(self, row):
+        return {field: get(row) for field, get in self.getters}
+
+    @timed('serialize')
+    def items(self, rows):
+        return [self.item(row) for row in rows]
+
+
+class BoardDetailProjection:
+    def __init__(self, fields=BOARD_DETAIL_FIELDS, members=None, tasks=None):
+        self.fields = fields
+        self.members = members or UserProjection()
+        self.tasks = tasks or TaskProjection(BOARD_TASK_FIELDS)
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(
+            requested_fields(request, BOARD_DETAIL_FIELDS),
+            UserProjection.from_request(request, 'members'),
+            TaskProjection.from_request(request, BOARD_TASK_FIELDS, 'tasks'),
+        )
+
+    @timed('serialize')
+    def data(self, board, members=None, tasks=None, chunk_size=None):
+        """
+        Builds the board detail; members and tasks rows are queried unless given.
+        With chunk_size, the tasks are read with iterator(chunk_size) and left as a
+        lazy iterator of dicts for the streaming renderer (see streaming).
+        """
+        data = {}
+        for field in self.fields:
+            if field == 'members':
+                rows = members if members is not None else self.members.values(board.members.all())
+                data[field] = [self.members.item(row) for row in rows]
+            elif field == 'tasks':
+                rows = tasks if tasks is not None else self.tasks.values(board.tasks.order_by('id'))
+                if chunk_size:
+                    data[field] = map(self.tasks.item, rows.iterator(chunk_size=chunk_size) if tasks is None else rows)
+                else:
+                    data[field] = self.tasks.items(rows)
+            else:
+                data[field] = getattr(board, 'pk' if field == 'id' else field)
+        return data
@@ -0,0 +1,60 @@
+import threading
+from django.conf import settings
+from django.core.cache import caches
+
+"""
+Server-side cache of rendered board detail responses.
+
+Entries are keyed by (board ID, board version) and hold the rendered JSON
+bytes, shared by every member allowed to see the board. Because every write to
+a board, its members, tasks or comments increments the version, a write never
+has to delete anything: the next request simply misses under the new key and
+the old entry expires with its timeout.
+
+The cache is configured with the KANBAN_BOARD_CACHE setting:
+- ALIAS (string): Django cache alias to use; works with the local-memory and
+  file-based backends as well as shared ones (default: 'default').
+- TIMEOUT (int): Seconds an entry is kept; 0 disables the cache (default: 300).
+
+Functions:
+- get(): Returns the cached bytes for a board version or None.
+- set(): Stores the rendered bytes for a board version.
+- stats(): Returns the hits, misses and hit ratio counted by this worker.
+"""
+
+_config = getattr(settings, 'KANBAN_BOARD_CACHE', {})
+TIMEOUT = _config.get('TIMEOUT', 300)
+KEY_PREFIX = 'kanban:board-detail'
+
+_lock = threading.Lock()
+_counters = {'hits': 0, 'misses': 0}
+
+
+def enabled():
+    return TIMEOUT > 0
+
+
+def _cache():
+    return caches[_config.get('ALIAS', 'default')]
+
+
+def _key(board_id, version):
+    return f"{KEY_PREFIX}:{board_id}:v{version}"
+
+
+def get(board_id, version):
+    body = _cache().get(_key(board_id, version))
+    with _lock:
+        _counters['hits' if body is not None else 'misses'] += 1
+    return body
+
+
+def set(board_id, version, body):
+    _cache().set(_key(board_id, version), body, TIMEOUT)
+
+
+def stats():
+    with _lock:
+        hits, misses = _counters['hits'], _counters['misses']
+    lookups = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_ratio': hits / lookups if lookups else 0.0}
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
 from kanban_app.models import Boards, Tasks, Comments
 
 """
@@ -19,6 +20,19 @@ class UserInfoSerializer(serializers.ModelSerializer):
     def get_fullname(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip()
     
+"""
+Mixin narrowing a serializer's output to the fields passed as 'fields'.
+
+Used for sparse fieldsets (?fields=..., see projections.requested_fields); the
+view is expected to narrow the queryset with only() accordingly.
+"""
+class SparseFieldsMixin:
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields).difference(fields):
+                self.fields.pop(name)
+
 """
 This serializer handles board creation.
 
@@ -41,7 +55,7 @@ Note:
 - All returned fields except 'title' are read-only.
 - The requesting user is automatically set as the owner and added as a member.
 """
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     members = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False
     )
@@ -57,8 +71,6 @@ class BoardSerializer(serializers.ModelSerializer):
 
         board = Boards.objects.create(owner=user, **validated_data)
         board.members.set(User.objects.filter(id__in=members + [user.id]))
-        board.member_count = board.members.count()
-        board.save()
 
         return board
 
@@ -202,6 +214,94 @@ class TaskSerializer(serializers.ModelSerializer):
         validated_data['createdBy'] = self.context['request'].user
         return super().create(validated_data)
 
+"""
+This serializer validates one task of a bulk creation request.
+
+Accepts:  
+- title (string)  
+- description (string, optional)  
+- status (string, optional)  
+- priority (string, optional)  
+- assignee_id (user ID)  
+- reviewer_id (user ID)  
+- due_date (date, optional)
+
+Notes:  
+- 'assignee_id' and 'reviewer_id' are plain integers here; the view resolves all
+  referenced users of a request with a single query instead of one per field and item.  
+- The board is given once for the whole request, not per task.
+"""
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    assignee_id = serializers.IntegerField()
+    reviewer_id = serializers.IntegerField()
+
+    class Meta:
+        model = Tasks
+        fields = ['title', 'description', 'status', 'priority', 'assignee_id', 'reviewer_id', 'due_date']
+
+"""
+This serializer validates the envelope of a bulk task creation request.
+
+Accepts:  
+- board (ID of the board all tasks belong to)  
+- tasks (list of task objects, see TaskBulkItemSerializer)  
+- partial (bool, optional): If true, valid tasks are created even when others are invalid.
+"""
+class TaskBulkCreateSerializer(serializers.Serializer):
+    max_tasks = 500
+
+    board = serializers.IntegerField()
+    tasks = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=max_tasks)
+    partial = serializers.BooleanField(default=False)
+
+"""
+This serializer validates a bulk task update request.
+
+Accepts:  
+- board (ID of the board the tasks belong to)  
+- ids (list of task IDs, at most 1000) or filter (non-empty object with any of
+  status, priority, assignee_id, reviewer_id); exactly one of both  
+- patch (object with any of status, priority, assignee_id, reviewer_id, due_date)
+
+Notes:  
+- Tasks of other boards are never touched, even if their IDs are listed.  
+- A filter may match at most 1000 tasks as well; the view checks that.  
+- 'assignee_id' and 'reviewer_id' in patch are checked by the view with one query.
+"""
+class TaskBulkFilterSerializer(serializers.Serializer):
+    status = serializers.CharField(max_length=10, required=False)
+    priority = serializers.CharField(max_length=10, required=False)
+    assignee_id = serializers.IntegerField(required=False)
+    reviewer_id = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError("At least one field to filter by is required.")
+        return data
+
+
+class TaskBulkPatchSerializer(TaskBulkFilterSerializer):
+    due_date = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError("At least one field to update is required.")
+        return data
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    max_tasks = 1000
+
+    board = serializers.IntegerField()
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=max_tasks, required=False)
+    filter = TaskBulkFilterSerializer(required=False)
+    patch = TaskBulkPatchSerializer()
+
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError("Provide either 'ids' or 'filter'.")
+        return data
+
 """
 This serializer returns task data for display within a board.
 
@@ -285,10 +385,30 @@ class CommentSerializer(serializers.ModelSerializer):
         return name or obj.author.username
     
     def create(self, validated_data):
-        comment = Comments.objects.create(**validated_data)
+        with transaction.atomic():
+            comment = Comments.objects.create(**validated_data)
+            Tasks.adjust_comments_count(comment.task_id, 1)
+
+        return comment
+
+"""
+This serializer returns a comment together with the ID of its task.
+
+Used by the board change feed, where comments of different tasks are listed together.
+"""
+class CommentChangeSerializer(CommentSerializer):
+    task = serializers.IntegerField(source='task_id', read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = ['id', 'task', 'created_at', 'author', 'content']
+
+"""
+This serializer validates a batch email check request.
 
-        task = comment.task
-        task.comments_count = task.comments.count()
-        task.save(update_fields=['comments_count'])
+Accepts:  
+- emails (list of addresses, at most 100)
+"""
+class EmailBatchSerializer(serializers.Serializer):
+    max_emails = 100
 
-        return comment
\ No newline at end of file
+    emails = serializers.ListField(child=serializers.CharField(max_length=254), allow_empty=False, max_length=max_emails)
@@ -0,0 +1,149 @@
+import re
+import zlib
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+"""
+Streaming JSON responses for very large boards and task lists.
+
+A regular response holds the whole queryset, the whole list of serialized dicts
+and the whole rendered body in memory at once. In streaming mode the rows are
+read with QuerySet.iterator(chunk_size=CHUNK_SIZE) (or aiterator() in async
+views), each chunk is rendered on its own and sent right away, so the memory a
+request needs stays roughly constant no matter how many tasks it returns.
+
+The bytes are the same as those of the regular response: every item is
+rendered with the project's JSONRenderer and the surrounding brackets, keys
+and commas are written exactly as the renderer would. With gzip enabled and
+accepted by the client, the stream is compressed on the fly.
+
+Streaming is used when:
+- the request asks for it with ?stream=1 (board detail, assigned-to-me and
+  reviewing lists; paginated requests are never streamed), or
+- the board detail is requested for a board with at least BOARD_THRESHOLD tasks.
+
+The behaviour is configured with the KANBAN_STREAMING setting:
+- CHUNK_SIZE (int): Rows fetched from the database and rendered per chunk.
+- BOARD_THRESHOLD (int): Task count from which a board detail is always streamed; 0 disables.
+- GZIP (bool): Compress the stream when the client sends Accept-Encoding: gzip.
+
+Streamed responses have no Content-Length and bypass the board response cache.
+"""
+
+_config = getattr(settings, 'KANBAN_STREAMING', {})
+CHUNK_SIZE = _config.get('CHUNK_SIZE', 2000)
+BOARD_THRESHOLD = _config.get('BOARD_THRESHOLD', 5000)
+GZIP = _config.get('GZIP', True)
+
+_accepts_gzip = re.compile(r'\bgzip\b')
+_renderer = JSONRenderer()
+
+
+def accepts_stream(request):
+    """Only JSON is streamed; other renderers (e.g. the browsable API) get a regular response."""
+    return isinstance(getattr(request, 'accepted_renderer', _renderer), JSONRenderer)
+
+
+def is_requested(request):
+    return accepts_stream(request) and request.query_params.get('stream', '').lower() in ('1', 'true')
+
+
+def rows(queryset):
+    return queryset.iterator(chunk_size=CHUNK_SIZE)
+
+
+def arows(queryset):
+    return queryset.aiterator(chunk_size=CHUNK_SIZE)
+
+
+def render(value):
+    return _renderer.render(value)
+
+
+def json_list(items):
+    """Yields a JSON array of the given dicts, one chunk per CHUNK_SIZE items."""
+    yield b'['
+    batch, first = [], True
+    for item in items:
+        batch.append(render(item))
+        if len(batch) >= CHUNK_SIZE:
+            yield (b'' if first else b',') + b','.join(batch)
+            batch, first = [], False
+    if batch:
+        yield (b'' if first else b',') + b','.join(batch)
+    yield b']'
+
+
+async def ajson_list(items):
+    """Async variant of json_list() for async iterables of dicts."""
+    yield b'['
+    batch, first = [], True
+    async for item in items:
+        batch.append(render(item))
+        if len(batch) >= CHUNK_SIZE:
+            yield (b'' if first else b',') + b','.join(batch)
+            batch, first = [], False
+    if batch:
+        yield (b'' if first else b',') + b','.join(batch)
+    yield b']'
+
+
+def json_object(data):
+    """Yields a JSON object; values that are iterators are streamed as arrays with json_list()."""
+    yield b'{'
+    for index, (key, value) in enumerate(data.items()):
+        yield (b',' if index else b'') + render(key) + b':'
+        if hasattr(value, '__next__'):
+            yield from json_list(value)
+        else:
+            yield render(value)
+    yield b'}'
+
+
+def response(request, chunks):
+    """Wraps a sync chunk iterator in a streaming response, async-iterable under ASGI."""
+    gzip = GZIP and bool(_accepts_gzip.search(request.headers.get('Accept-Encoding', '')))
+    if gzip:
+        chunks = _gzip(chunks)
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        chunks = _in_thread(chunks)
+    return _streaming_response(chunks, gzip)
+
+
+def aresponse(request, chunks):
+    """Wraps an async chunk iterator in a streaming response."""
+    gzip = GZIP and bool(_accepts_gzip.search(request.headers.get('Accept-Encoding', '')))
+    return _streaming_response(_agzip(chunks) if gzip else chunks, gzip)
+
+
+def _streaming_response(chunks, gzip):
+    streamed = StreamingHttpResponse(chunks, content_type='application/json')
+    if gzip:
+        streamed['Content-Encoding'] = 'gzip'
+    streamed['Vary'] = 'Accept-Encoding'
+    return streamed
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+async def _agzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+async def _in_thread(chunks):
+    # Django would otherwise collect a sync iterator into a list under ASGI.
+    # Each chunk is produced in the request's thread, where the cursor lives.
+    done = object()
+    while (chunk := await sync_to_async(next)(chunks, done)) is not done:
+        yield chunk
@@ -1,5 +1,6 @@
+from django.conf import settings
 from django.urls import path
-from .views import BoardsView, BoardsSingleView, EmailCheckView, AssignedToMeView, ReviewingTasksView, TasksView, TaskSingleView, TaskCommentsView, TasksCommentsSingleView
+from .views import BoardsView, BoardsSingleView, BoardChangesView, BoardEventsView, EmailCheckView, EmailBatchCheckView, AssignedToMeView, ReviewingTasksView, SearchView, TasksView, TasksBulkView, TaskSingleView, TaskCommentsView, TasksCommentsSingleView
 
 """
 URL patterns for the project API endpoints.
@@ -12,9 +13,21 @@ Endpoints:
 - GET, PATCH, DELETE /boards/{pk}/  
   Retrieve, update, or delete a specific board (BoardsSingleView).
 
+- GET /boards/{pk}/changes/?since={cursor}  
+  List tasks, comments and members changed on a board since a cursor (BoardChangesView).
+
+- GET /boards/{pk}/events/  
+  Stream live board changes as Server-Sent Events, ASGI only (BoardEventsView).
+
 - GET /email-check/?email={email}  
   Check if a user with the given email exists (EmailCheckView).
 
+- POST /email-check/batch/  
+  Resolve up to 100 emails to users in one request (EmailBatchCheckView).
+
+- GET /search/?q={words}  
+  Full-text search over tasks and comments of the user's boards (SearchView).
+
 - GET /tasks/assigned-to-me/  
   List tasks assigned to the authenticated user (AssignedToMeView).
 
@@ -24,6 +37,9 @@ Endpoints:
 - POST /tasks/  
   Create a new task in a board (TasksView).
 
+- POST, PATCH /tasks/bulk/  
+  Create or update many tasks of one board in a single request (TasksBulkView).
+
 - GET, PATCH, DELETE /tasks/{task_id}/  
   Retrieve, update, or delete a specific task (TaskSingleView).
 
@@ -32,14 +48,31 @@ Endpoints:
 
 - DELETE /tasks/{task_id}/comments/{comment_id}  
   Delete a specific comment on a task (TasksCommentsSingleView).
+
+With KANBAN_ASYNC_VIEWS enabled, GET on /boards/, /tasks/assigned-to-me/,
+/tasks/reviewing/ and /tasks/{task_id}/comments/ is served by the native async
+views in async_views.py (other methods still reach the sync views).
 """
+if getattr(settings, 'KANBAN_ASYNC_VIEWS', False):
+    from .async_views import (
+        AsyncBoardsView as BoardsView,
+        AsyncAssignedToMeView as AssignedToMeView,
+        AsyncReviewingTasksView as ReviewingTasksView,
+        AsyncTaskCommentsView as TaskCommentsView,
+    )
+
 urlpatterns = [
     path('boards/', BoardsView.as_view()),
     path('boards/<int:pk>/', BoardsSingleView.as_view(), name='boards-detail'),
+    path('boards/<int:pk>/changes/', BoardChangesView.as_view(), name='boards-changes'),
+    path('boards/<int:pk>/events/', BoardEventsView.as_view(), name='boards-events'),
     path('email-check/', EmailCheckView.as_view()),
+    path('email-check/batch/', EmailBatchCheckView.as_view()),
+    path('search/', SearchView.as_view()),
     path('tasks/assigned-to-me/', AssignedToMeView.as_view()),
     path('tasks/reviewing/', ReviewingTasksView.as_view()),
     path('tasks/', TasksView.as_view()),
+    path('tasks/bulk/', TasksBulkView.as_view()),
     path('tasks/<int:task_id>/', TaskSingleView.as_view(), name='tasks-detail'),
     path('tasks/<int:task_id>/comments/', TaskCommentsView.as_view()),
     path('tasks/<int:task_id>/comments/<int:comment_id>/', TasksCommentsSingleView.as_view(), name='tasks-comments-detail')
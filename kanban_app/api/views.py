@@ -1,15 +1,31 @@
 from django.db.models import Q
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from kanban_app.models import Boards, Tasks, Comments
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views import View
+from auth_app import email_lookup
+from auth_app.authentication import CachedTokenAuthentication
+from kanban_app import changes, events, search
+from kanban_app.membership import ahas_board_access, has_board_access, is_board_member
+from kanban_app.models import Boards, BoardChanges, Tasks, Comments
+from . import response_cache, streaming
+from .event_stream import EventStream
+from .conditional import board_validators, is_not_modified, not_modified_response, set_validators
+from .pagination import KeysetPagination, SearchPagination
+from .projections import BOARD_LIST_FIELDS, BoardDetailProjection, TaskProjection, field_selection, has_sparse_fields, requested_fields
 from .permissions import IsBoardMemberOrOwner, IsMemberOfTasksBoard, IsCommentAuthor
 from rest_framework import status
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ParseError, PermissionDenied
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from ..models import Tasks
-from .serializers import BoardSerializer, BoardPatchSerializer, BoardSingleSerializer, TaskSerializer, TaskReviewingAndAssignedToMeSerializer, CommentSerializer
+from .serializers import BoardSerializer, BoardPatchSerializer, TaskSerializer, CommentSerializer, TaskBulkCreateSerializer, TaskBulkItemSerializer, TaskBulkUpdateSerializer, TaskBoardSerializer, UserInfoSerializer, CommentChangeSerializer, EmailBatchSerializer
 
 """
 This handles retrieving all boards the user is involved in and creating new boards.
@@ -38,6 +54,12 @@ Returns on success (201):
 Returns on error (400):  
 - validation errors
 
+Pagination:  
+- Opt-in keyset pagination ordered by ID via 'limit' and 'cursor' (see KeysetPagination).
+
+Sparse fieldsets:  
+- ?fields=id,title returns (and loads) only the listed fields (see projections).
+
 Permissions:  
 - User must be authenticated.
 """
@@ -45,8 +67,16 @@ class BoardsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        boards = Boards.objects.filter(Q(owner=request.user) | Q(members=request.user)).distinct()
-        serializer = BoardSerializer(boards, many=True, context={'request': request})
+        fields = requested_fields(request, BOARD_LIST_FIELDS)
+        memberships = Boards.members.through.objects.filter(user=request.user).values('boards_id')
+        boards = Boards.objects.filter(Q(owner=request.user) | Q(pk__in=memberships)).only('id', *fields)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(boards, request, view=self)
+        if page is not None:
+            serializer = BoardSerializer(page, many=True, fields=fields, context={'request': request})
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = BoardSerializer(boards, many=True, fields=fields, context={'request': request})
         return Response(serializer.data)
 
     def post(self, request):
@@ -56,6 +86,18 @@ class BoardsView(APIView):
             return Response(BoardSerializer(board, context={'request': request}).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+"""
+Returns the board detail, by default exactly as BoardSingleSerializer renders it.
+
+Built by the serializer-free read path (see projections): one query for the
+members and one for the tasks joined with their assignee and reviewer, so a
+board detail costs a fixed number of queries no matter how many tasks the
+board holds, and no model instance is created per task. A projection built
+from ?fields= skips the unselected columns, joins and queries.
+"""
+def board_detail_data(board, projection=None):
+    return (projection or BoardDetailProjection()).data(board)
+
 """
 This handles retrieving, updating, and deleting a single board.
 
@@ -68,6 +110,17 @@ Methods:
 
 GET /boards/{pk}/  
 - Returns detailed information about the specified board.  
+- Sends ETag and Last-Modified derived from the board version; answers a matching  
+  If-None-Match / If-Modified-Since with 304 before loading members and tasks.  
+- Serves the rendered JSON from the versioned response cache (see response_cache)  
+  when the client accepts JSON; all members share the same cached bytes.  
+- Accepts sparse fieldsets: ?fields=id,title,tasks&fields[tasks]=id,title,status,priority  
+  (also fields[members], fields[assignee], fields[reviewer]; see projections).  
+  Sparse responses skip the unselected columns and queries and are not cached.  
+- Streams the JSON in chunks with ?stream=1, and always for boards with at least  
+  KANBAN_STREAMING['BOARD_THRESHOLD'] tasks (see streaming); streamed responses  
+  keep ETag and X-Board-Cursor but bypass the response cache.  
+- Sends the board version as X-Board-Cursor, the starting point for GET /boards/{pk}/changes/.  
 - Returns 401 if not authenticated.  
 - Returns 404 if board does not exist or access is denied.
 
@@ -94,11 +147,32 @@ class BoardsSingleView(APIView):
         except Boards.DoesNotExist:
             return Response({"detail": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if board.owner != request.user and request.user not in board.members.all():
+        if not has_board_access(request.user, board, request):
             return Response({"detail": "Access denied."}, status=status.HTTP_403_FORBIDDEN)
 
-        serializer = BoardSingleSerializer(board, context={'request': request})
-        return Response(serializer.data)
+        projection = BoardDetailProjection.from_request(request)
+        selection = field_selection(request)
+        etag, last_modified = board_validators('board', board.pk, board, selection)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        sparse = has_sparse_fields(request)
+        if streaming.is_requested(request) or (
+            streaming.accepts_stream(request) and 0 < streaming.BOARD_THRESHOLD <= board.ticket_count
+        ):
+            data = projection.data(board, chunk_size=streaming.CHUNK_SIZE)
+            response = streaming.response(request, streaming.json_object(data))
+        elif sparse or not response_cache.enabled() or not isinstance(request.accepted_renderer, JSONRenderer):
+            response = Response(board_detail_data(board, projection))
+        else:
+            body = response_cache.get(board.pk, board.version)
+            if body is None:
+                body = JSONRenderer().render(board_detail_data(board))
+                response_cache.set(board.pk, board.version, body)
+            response = HttpResponse(body, content_type='application/json')
+
+        response['X-Board-Cursor'] = str(board.version)
+        return set_validators(response, etag, last_modified)
 
     def patch(self, request, pk):
         try:
@@ -106,7 +180,7 @@ class BoardsSingleView(APIView):
         except Boards.DoesNotExist:
             return Response({"detail": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if board.owner != request.user and request.user not in board.members.all():
+        if not has_board_access(request.user, board, request):
             return Response({"detail": "Access denied."}, status=status.HTTP_403_FORBIDDEN)
 
         serializer = BoardPatchSerializer(board, data=request.data, partial=True, context={'request': request})
@@ -129,13 +203,152 @@ class BoardsSingleView(APIView):
         except Boards.DoesNotExist:
             return Response({"detail": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if request.user != board.owner:
+        if board.owner_id != request.user.id:
             return Response({"detail": "Only the owner can delete this board."}, status=status.HTTP_403_FORBIDDEN)
 
         board.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+"""
+This returns what changed on a board since a client-supplied cursor.
+
+Method: GET  
+Query Parameters:  
+- since (int, required): Cursor from a previous response, or the X-Board-Cursor
+  header of GET /boards/{pk}/.
+
+Returns:  
+- cursor (string): Cursor to send as 'since' next time.  
+- board (object or null): ID, title and owner ID if the board itself changed.  
+- tasks (list): Created or updated tasks, as in the board detail.  
+- comments (list): Created comments, including the ID of their task.  
+- members (list): Added members or members whose name changed (user info).  
+- deleted (object): IDs of deleted tasks and comments and of removed members.
+
+Returns 400 if the cursor is missing or invalid, 403 if the user is neither owner
+nor member, and 404 if the board does not exist.
+
+Notes:  
+- Comments of deleted tasks are not listed separately; drop them with the task.  
+- An object may be reported again in a later response; applying changes is idempotent.
+"""
+class BoardChangesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            board = Boards.objects.get(pk=pk)
+        except Boards.DoesNotExist:
+            return Response({"detail": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        if not has_board_access(request.user, board, request):
+            return Response({"detail": "Access denied."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            since = int(request.query_params['since'])
+        except (KeyError, ValueError):
+            return Response({"detail": "Query parameter 'since' must be a cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= since <= board.version:
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        changed = BoardChanges.objects.filter(board=board, seq__gt=since, seq__lte=board.version)
+        upserted, deleted = {}, {}
+        for kind, object_id, is_deleted in changed.values_list('kind', 'object_id', 'deleted'):
+            (deleted if is_deleted else upserted).setdefault(kind, set()).add(object_id)
+
+        tasks = Tasks.objects.filter(board=board, pk__in=upserted.get(BoardChanges.KIND_TASK, ()))
+        tasks = list(tasks.select_related('assignee', 'reviewer').order_by('id'))
+        comments = Comments.objects.filter(task__board=board, pk__in=upserted.get(BoardChanges.KIND_COMMENT, ()))
+        comments = list(comments.select_related('author').order_by('created_at', 'id'))
+        members = list(board.members.filter(pk__in=upserted.get(BoardChanges.KIND_MEMBER, ())).order_by('id'))
+
+        def gone(kind, found):
+            missing = upserted.get(kind, set()) - {obj.pk for obj in found}
+            return sorted(deleted.get(kind, set()) | missing)
+
+        board_data = None
+        if board.pk in upserted.get(BoardChanges.KIND_BOARD, ()):
+            board_data = {'id': board.pk, 'title': board.title, 'owner_id': board.owner_id}
+
+        return Response({
+            'cursor': str(board.version),
+            'board': board_data,
+            'tasks': TaskBoardSerializer(tasks, many=True).data,
+            'comments': CommentChangeSerializer(comments, many=True).data,
+            'members': UserInfoSerializer(members, many=True).data,
+            'deleted': {
+                'tasks': gone(BoardChanges.KIND_TASK, tasks),
+                'comments': gone(BoardChanges.KIND_COMMENT, comments),
+                'members': gone(BoardChanges.KIND_MEMBER, members),
+            },
+        }, status=status.HTTP_200_OK)
+
+"""
+This streams live changes of a board as Server-Sent Events.
+
+Method: GET  
+Headers:  
+- Authorization (required): 'Token <key>', as for every other endpoint.  
+- Last-Event-ID (optional): ID of the last event received before reconnecting.
+
+Returns:  
+- A text/event-stream with one event per created, updated or deleted task,
+  comment, member or board (see kanban_app.api.event_stream for the format).
+
+Returns 401 without valid credentials, 403 if the user is neither owner nor
+member, 404 if the board does not exist, 501 when not served under ASGI, and
+503 with Retry-After when the worker already serves the maximum number of streams.
+
+Notes:  
+- Needs an ASGI server (core.asgi:application); each open stream is an idle
+  coroutine instead of a worker thread.  
+- Events only carry IDs; fetch the data with GET /boards/{pk}/changes/.
+"""
+class BoardEventsView(View):
+    async def get(self, request, pk):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({"detail": "Event streams require an ASGI server."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        try:
+            credentials = await CachedTokenAuthentication().aauthenticate(request)
+        except AuthenticationFailed as exc:
+            return JsonResponse({"detail": str(exc.detail)}, status=status.HTTP_401_UNAUTHORIZED)
+        if credentials is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        board = await Boards.objects.filter(pk=pk).only('id', 'owner_id').afirst()
+        if board is None:
+            return JsonResponse({"detail": "Board not found."}, status=status.HTTP_404_NOT_FOUND)
+        if not await ahas_board_access(credentials[0], board):
+            return JsonResponse({"detail": "Access denied."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            last_event_id = int(request.headers['Last-Event-ID'])
+        except (KeyError, ValueError):
+            last_event_id = None
+
+        try:
+            subscriber = events.subscribe(board.pk)
+        except events.SubscriberLimitReached:
+            response = JsonResponse({"detail": "Too many open event streams, try again later."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = str(max(events.RETRY // 1000, 1))
+            return response
+
+        # The cursor is read after subscribing, so no change falls between the two.
+        # Until the response owns the stream (and closes it), a failure or a
+        # cancelled request (client gone) must release the subscription here.
+        try:
+            cursor = await Boards.objects.filter(pk=board.pk).values_list('version', flat=True).afirst()
+            response = StreamingHttpResponse(EventStream(subscriber, cursor or 0, last_event_id), content_type='text/event-stream')
+        except BaseException:
+            events.unsubscribe(subscriber)
+            raise
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
 class EmailCheckView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -144,15 +357,10 @@ class EmailCheckView(APIView):
             if not email:
                 return Response({'detail': 'Email query parameter is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            try:
-                user = User.objects.get(email__iexact=email)
-                return Response({
-                    'id': user.id,
-                    'email': user.email,
-                    'fullname': f"{user.first_name} {user.last_name}".strip(),
-                }, status=status.HTTP_200_OK)
-            except User.DoesNotExist:
+            user = email_lookup.lookup([email]).get(email_lookup.normalize(email))
+            if user is None:
                 return Response({'detail': 'User with this email does not exist.'}, status=status.HTTP_404_NOT_FOUND)
+            return Response(user, status=status.HTTP_200_OK)
 
 """
 This handles checking if a user with a given email exists.
@@ -166,6 +374,42 @@ Returns:
 - 400 Bad Request if the 'email' query parameter is missing.  
 - 404 Not Found if no user with the specified email exists.
 
+Notes:  
+- The email is compared case-insensitively, answers are cached briefly (see auth_app.email_lookup).
+
+Permissions:  
+- User must be authenticated.
+"""
+class EmailBatchCheckView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = EmailBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        emails = serializer.validated_data['emails']
+        users = email_lookup.lookup(emails)
+        return Response([
+            {'email': email, 'user': users[email_lookup.normalize(email)]} for email in emails
+        ], status=status.HTTP_200_OK)
+
+"""
+This handles checking many email addresses at once, e.g. a pasted team list.
+
+Method: POST  
+Accepts:  
+- emails (list of strings, required): Up to 100 addresses.
+
+Returns:  
+- 200 OK with one entry per given address, in the given order:
+  {'email': <address as given>, 'user': {'id', 'email', 'fullname'} or null}.  
+- 400 Bad Request if 'emails' is missing, empty, too long or contains a blank address.
+
+Notes:  
+- Addresses are compared case-insensitively; all addresses that are not cached
+  are resolved with one indexed query (see auth_app.email_lookup).
+
 Permissions:  
 - User must be authenticated.
 """
@@ -173,9 +417,16 @@ class AssignedToMeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        assignedTasks = Tasks.objects.filter(assignee=request.user)
-        serializer = TaskReviewingAndAssignedToMeSerializer(assignedTasks, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        projection = TaskProjection.from_request(request)
+        assignedTasks = projection.values(Tasks.objects.filter(assignee=request.user))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(assignedTasks, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(projection.items(page))
+        if streaming.is_requested(request):
+            return streaming.response(request, streaming.json_list(map(projection.item, streaming.rows(assignedTasks))))
+
+        return Response(projection.items(assignedTasks), status=status.HTTP_200_OK)
     
 """
 This returns all tasks where the authenticated user is the reviewer.
@@ -194,6 +445,18 @@ Returns:
   - due_date  
   - comments_count
 
+Pagination:  
+- Opt-in keyset pagination ordered by ID via 'limit' and 'cursor' (see KeysetPagination).  
+  The same applies to the tasks assigned to the user.
+
+Notes:  
+- Both task lists are rendered by the serializer-free read path (see projections):  
+  one query with the assignee and reviewer joined, no model instance per task.  
+- Both accept sparse fieldsets, e.g. ?fields=id,title,status,priority or  
+  ?fields[assignee]=id,fullname; unselected columns and joins are skipped.  
+- Without pagination, ?stream=1 streams the list in chunks (see streaming),  
+  gzip-compressed for clients that accept it.
+
 Permissions:  
 - User must be authenticated.
 """
@@ -201,9 +464,56 @@ class ReviewingTasksView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        reviewingTasks = Tasks.objects.filter(reviewer=request.user)
-        serializer = TaskReviewingAndAssignedToMeSerializer(reviewingTasks, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        projection = TaskProjection.from_request(request)
+        reviewingTasks = projection.values(Tasks.objects.filter(reviewer=request.user))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(reviewingTasks, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(projection.items(page))
+        if streaming.is_requested(request):
+            return streaming.response(request, streaming.json_list(map(projection.item, streaming.rows(reviewingTasks))))
+
+        return Response(projection.items(reviewingTasks), status=status.HTTP_200_OK)
+
+"""
+This searches task titles, descriptions and comments across the user's boards.
+
+Method: GET  
+Query Parameters:  
+- q (string, required): The words to search for (all must match); 'rev*' matches as a prefix.  
+- limit (int, optional), cursor (string, optional): Keyset pagination (see SearchPagination).
+
+Returns:  
+- 200 OK with { "next", "previous", "results" }, best match first. Each result has  
+  type ('task' or 'comment'), id, task, board, title (of the task), rank and a snippet  
+  with the matched words in square brackets.  
+- 400 Bad Request if 'q' is missing or contains no words.  
+- 501 Not Implemented on database backends without a search index.
+
+Notes:  
+- Backed by a full-text index (SQLite FTS5, PostgreSQL tsvector/GIN; see kanban_app.search)  
+  instead of scanning every task and comment; only the newest KANBAN_SEARCH['MAX_CANDIDATES']  
+  matches are ranked.  
+- Only boards the user owns or is a member of are searched.
+
+Permissions:  
+- User must be authenticated.
+"""
+class SearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        words = search.terms(request.query_params.get('q'))
+        if not words:
+            return Response({"detail": "Query parameter 'q' with at least one word is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if not search.is_supported():
+            return Response({"detail": "Search is not available on this database backend."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        paginator = SearchPagination()
+        hits = paginator.paginate_hits(lambda after, limit: search.search(request.user, words, limit, after), request)
+        for hit in hits:
+            del hit['key']
+        return paginator.get_paginated_response(hits)
 
 """
 This handles creating a new task within a board.
@@ -242,7 +552,7 @@ class TasksView(APIView):
         except Boards.DoesNotExist:
             return Response({"error": "Board does not exist."}, status=status.HTTP_404_NOT_FOUND)
 
-        if request.user != board.owner and request.user not in board.members.all():
+        if not has_board_access(request.user, board, request):
             return Response({"error": "Access denied. You are not a member of this board."},
                             status=status.HTTP_403_FORBIDDEN)
 
@@ -254,6 +564,173 @@ class TasksView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+"""
+This handles creating and updating many tasks of one board in a single request.
+
+Method: POST  
+Accepts:  
+- board (ID of the board all tasks belong to) [required]  
+- tasks (list of task objects with title, description, status, priority,  
+  assignee_id, reviewer_id and due_date; at most 500)  
+- partial (bool, optional): If true, valid tasks are created and invalid ones reported.
+
+Returns:  
+- 201 Created with 'created' (task data as returned by POST /tasks/) and 'errors'  
+  (list of {index, errors} for rejected tasks, empty unless partial)  
+- 400 Bad Request if the request is malformed, or any task is invalid and partial is not set  
+- 403 Forbidden if the user is not a member or owner of the board  
+- 404 Not Found if the board does not exist
+
+Notes:  
+- Board access is checked once and all referenced users are validated with one query.  
+- Tasks are inserted with a single bulk insert in one transaction and the board
+  counters are adjusted once for the whole batch.
+
+Method: PATCH  
+Accepts:  
+- board (ID of the board the tasks belong to) [required]  
+- ids (list of task IDs) or filter (status, priority, assignee_id, reviewer_id)  
+- patch (status, priority, assignee_id, reviewer_id, due_date)
+
+Returns:  
+- 200 OK with 'updated' (number of tasks), 'ids' (updated task IDs) and  
+  'not_found' (requested IDs that are not tasks of this board)  
+- 400 Bad Request on validation errors, unknown users in patch, or a filter
+  matching more than 1000 tasks  
+- 403 Forbidden if the user is not a member of the board  
+- 404 Not Found if the board does not exist
+
+Notes:  
+- Membership is checked once; the tasks are locked and changed with a single
+  UPDATE of the same queryset in one transaction, and the board counters are
+  adjusted by the aggregate delta of the whole batch.
+
+Permissions:  
+- User must be authenticated.  
+- User must be the board owner or a member to create tasks, and a member to update them.
+"""
+class TasksBulkView(APIView):
+    permission_classes = [IsAuthenticated]
+    user_fields = ('assignee_id', 'reviewer_id')
+
+    def post(self, request):
+        envelope = TaskBulkCreateSerializer(data=request.data)
+        if not envelope.is_valid():
+            return Response(envelope.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            board = Boards.objects.get(id=envelope.validated_data['board'])
+        except Boards.DoesNotExist:
+            return Response({"error": "Board does not exist."}, status=status.HTTP_404_NOT_FOUND)
+
+        if not has_board_access(request.user, board, request):
+            return Response({"error": "Access denied. You are not a member of this board."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        tasks, errors = self.build_tasks(request, board, envelope.validated_data['tasks'])
+        if (errors and not envelope.validated_data['partial']) or not tasks:
+            return Response({'created': [], 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            created = Tasks.objects.bulk_create(tasks)
+            deltas = {}
+            for task in created:
+                for field, value in Tasks.counter_values(task.status, task.priority).items():
+                    deltas[field] = deltas.get(field, 0) + value
+            changes.record(board.pk, [(BoardChanges.KIND_TASK, task.pk, False) for task in created], **deltas)
+
+        return Response({
+            'created': TaskSerializer(created, many=True, context={'request': request}).data,
+            'errors': errors,
+        }, status=status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        serializer = TaskBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        try:
+            board = Boards.objects.get(id=data['board'])
+        except Boards.DoesNotExist:
+            return Response({"error": "Board does not exist."}, status=status.HTTP_404_NOT_FOUND)
+
+        if not is_board_member(request.user, board, request):
+            raise PermissionDenied("You are not a member of this board and are not allowed to work on this task.")
+
+        patch = data['patch']
+        user_ids = {patch[field] for field in self.user_fields if field in patch}
+        existing = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+        missing = {
+            field: [f'Invalid pk "{patch[field]}" - object does not exist.']
+            for field in self.user_fields if field in patch and patch[field] not in existing
+        }
+        if missing:
+            return Response({'patch': missing}, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks = Tasks.objects.filter(board=board)
+        if 'ids' in data:
+            tasks = tasks.filter(pk__in=data['ids'])
+        else:
+            tasks = tasks.filter(**data['filter'])
+
+        max_tasks = TaskBulkUpdateSerializer.max_tasks
+        with transaction.atomic():
+            rows = list(tasks.select_for_update().order_by('pk').values_list('pk', 'status', 'priority')[:max_tasks + 1])
+            if len(rows) > max_tasks:
+                return Response({'filter': [f"Matches more than {max_tasks} tasks; narrow the filter or pass ids."]},
+                                status=status.HTTP_400_BAD_REQUEST)
+            ids = [pk for pk, _, _ in rows]
+            if ids:
+                tasks.update(**patch)
+                task_changes = [(BoardChanges.KIND_TASK, pk, False) for pk in ids]
+                changes.record(board.pk, task_changes, **self.counter_deltas(rows, patch))
+
+        not_found = sorted(set(data.get('ids', [])) - set(ids))
+        return Response({'updated': len(ids), 'ids': ids, 'not_found': not_found}, status=status.HTTP_200_OK)
+
+    def counter_deltas(self, rows, patch):
+        deltas = {}
+        for _, old_status, old_priority in rows:
+            before = Tasks.counter_values(old_status, old_priority)
+            after = Tasks.counter_values(patch.get('status', old_status), patch.get('priority', old_priority))
+            for field in before:
+                deltas[field] = deltas.get(field, 0) + after[field] - before[field]
+        return deltas
+
+    def build_tasks(self, request, board, items):
+        validated, errors = [], []
+        for index, item in enumerate(items):
+            serializer = TaskBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                validated.append((index, serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        user_ids = {data[field] for _, data in validated for field in self.user_fields}
+        users = User.objects.in_bulk(user_ids)
+
+        tasks = []
+        for index, data in validated:
+            missing = {
+                field: [f'Invalid pk "{data[field]}" - object does not exist.']
+                for field in self.user_fields if data[field] not in users
+            }
+            if missing:
+                errors.append({'index': index, 'errors': missing})
+                continue
+            fields = {key: value for key, value in data.items() if key not in self.user_fields}
+            tasks.append(Tasks(
+                board=board,
+                createdBy=request.user,
+                assignee=users[data['assignee_id']],
+                reviewer=users[data['reviewer_id']],
+                **fields,
+            ))
+
+        errors.sort(key=lambda error: error['index'])
+        return tasks, errors
+
 """
 This handles retrieving, updating, and deleting a single task.
 
@@ -266,53 +743,107 @@ class TaskSingleView(APIView):
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, task_id):
-        try:
-            task = Tasks.objects.get(pk=task_id)
-        except Tasks.DoesNotExist:
-            raise NotFound("Task not found.")
+        # Task deletes send no signals (so that cascades stay fast deletes); the
+        # counters and the tombstone are recorded here, under the row lock.
+        with transaction.atomic():
+            try:
+                task = Tasks.objects.select_for_update(of=('self',)).select_related('board').get(pk=task_id)
+            except Tasks.DoesNotExist:
+                raise NotFound("Task not found.")
 
-        isTaskCreator = task.createdBy == request.user
-        isBoardOwner = task.board.owner == request.user
+            isTaskCreator = task.createdBy_id == request.user.id
+            isBoardOwner = task.board.owner_id == request.user.id
 
-        if not (isTaskCreator or isBoardOwner):
-            raise PermissionDenied("You are not allowed to delete this task.")
-        
-        task.delete()
+            if not (isTaskCreator or isBoardOwner):
+                raise PermissionDenied("You are not allowed to delete this task.")
+
+            deltas = {field: -value for field, value in Tasks.counter_values(task.status, task.priority).items()}
+            task.delete()
+            changes.record(task.board_id, [(BoardChanges.KIND_TASK, task_id, True)], **deltas)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     def patch(self, request, task_id):
-        try:
-            task = Tasks.objects.get(pk=task_id)
-        except Tasks.DoesNotExist:
-            raise NotFound("Task not found.")
+        # The row stays locked until the save, so the counter snapshot taken when
+        # loading it is still current when the signal applies the deltas.
+        with transaction.atomic():
+            try:
+                task = Tasks.objects.select_for_update().get(pk=task_id)
+            except Tasks.DoesNotExist:
+                raise NotFound("Task not found.")
+
+            if not is_board_member(request.user, task.board_id, request):
+                raise PermissionDenied("You are not a member of this board and are not allowed to work on this task.")
+
+            serializer = TaskSerializer(task, data=request.data, partial=True)
+            if serializer.is_valid():
+                serializer.save()
+                return Response(serializer.data)
+            else:
+                return Response(serializer.errors, status=400)
+            
+"""
+Returns the comment feed of a task, newest first.
 
-        if request.user not in task.board.members.all():
-            raise PermissionDenied("You are not a member of this board and are not allowed to work on this task.")
+One query: the author is joined (select_related) and only the columns the
+CommentSerializer renders are loaded, however many people wrote in the thread.
+
+Query Parameters:  
+- after (string, optional): '<created_at>,<id>' of the last comment already loaded;  
+  only comments after it in feed order (older ones) are returned.  
+- limit (int, optional): Returns at most this many comments (capped like pagination).
+
+Raises ParseError (400) if 'after' is malformed.
+"""
+def comment_feed(task, request):
+    comments = (
+        task.comments.select_related('author')
+        .only('id', 'task', 'created_at', 'content', 'author__username', 'author__first_name', 'author__last_name')
+        .order_by('-created_at', '-id')
+    )
+    after = request.query_params.get('after')
+    if after is not None:
+        created_at, _, comment_id = after.rpartition(',')
+        try:
+            created_at, comment_id = parse_datetime(created_at.strip()), int(comment_id)
+        except ValueError:
+            created_at = None
+        if created_at is None:
+            raise ParseError("Query parameter 'after' must be '<created_at>,<id>' of a comment.")
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at)
+        comments = comments.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=comment_id))
+    if KeysetPagination.limit_query_param in request.query_params:
+        comments = comments[:KeysetPagination().get_limit(request)]
+    return comments
 
-        serializer = TaskSerializer(task, data=request.data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        else:
-            return Response(serializer.errors, status=400)
-            
 """
 This handles retrieving and creating comments on a specific task.
 
 Permissions:  
 - User must be authenticated.  
 - User must be a member of the task's board (checked via IsMemberOfTasksBoard permission).
+
+GET sends ETag and Last-Modified derived from the board version and answers a
+matching If-None-Match / If-Modified-Since with 304 before loading the comments.
+Long threads are loaded incrementally with ?after=<created_at>,<id>&limit=<n>
+(see comment_feed).
+
+POST increments the task's comments_count in the same transaction as the insert;
+deleting a comment decrements it the same way (see Tasks.adjust_comments_count).
 """
 class TaskCommentsView(APIView):
     permission_classes = [IsMemberOfTasksBoard] 
 
     def get(self, request, task_id):
-        task = get_object_or_404(Tasks, id=task_id)
+        task = get_object_or_404(Tasks.objects.select_related('board'), id=task_id)
         self.check_object_permissions(request, task)
 
-        comments = task.comments.all().order_by('-created_at')
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        etag, last_modified = board_validators('comments', task.pk, task.board)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        serializer = CommentSerializer(comment_feed(task, request), many=True)
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), etag, last_modified)
 
     def post(self, request, task_id):
         task = get_object_or_404(Tasks, id=task_id)
@@ -343,8 +874,9 @@ class TasksCommentsSingleView(APIView):
     def delete(self, request, task_id, comment_id):
         task, comment = self.get_object(task_id, comment_id)
 
-        comment.delete()
-        task.comments_count = task.comments.count()
-        task.save(update_fields=['comments_count'])
+        with transaction.atomic():
+            comment.delete()
+            Tasks.adjust_comments_count(task.pk, -1)
+            changes.record(task.board_id, [(BoardChanges.KIND_COMMENT, comment_id, True), (BoardChanges.KIND_TASK, task.pk, False)])
 
         return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
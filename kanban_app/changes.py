@@ -0,0 +1,54 @@
+from django.db import transaction
+from kanban_app import events
+from kanban_app.models import Boards, BoardChanges
+
+"""
+Change tracking for boards.
+
+Every write shown on a board increments the board version (Boards.touch) and
+records which objects changed under that version in BoardChanges. The version
+doubles as a per-board, monotonically increasing change sequence: a client that
+has seen version N asks for all changes with seq > N. Once the transaction
+commits, the changes are also published to live event streams (see
+kanban_app.events).
+
+Functions:
+- record(): Touches one board (optionally applying counter deltas) and records changes.
+- record_many(): Touches several boards and records the same change on each of them.
+
+Each change is a (kind, object_id, deleted) tuple, e.g. (BoardChanges.KIND_TASK, 12, False).
+"""
+
+def record(board_id, changes, **counter_deltas):
+    with transaction.atomic():
+        Boards.touch(board_id, **counter_deltas)
+        seq = Boards.objects.filter(pk=board_id).values_list('version', flat=True).first()
+        if seq is not None:
+            _store({board_id: seq}, changes)
+
+
+def record_many(board_ids, changes):
+    board_ids = list(board_ids)
+    if not board_ids:
+        return
+    with transaction.atomic():
+        Boards.objects.filter(pk__in=board_ids).update(**Boards.version_updates())
+        versions = dict(Boards.objects.filter(pk__in=board_ids).values_list('pk', 'version'))
+        _store(versions, changes)
+
+
+def _store(versions, changes):
+    for board_id, seq in versions.items():
+        events.publish(board_id, seq, changes)
+    rows = [
+        BoardChanges(board_id=board_id, kind=kind, object_id=object_id, deleted=deleted, seq=seq)
+        for board_id, seq in versions.items()
+        for kind, object_id, deleted in changes
+    ]
+    if rows:
+        BoardChanges.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['board', 'kind', 'object_id'],
+            update_fields=['deleted', 'seq'],
+        )
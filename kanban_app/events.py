@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+"""
+In-process publish/subscribe hub for live board events.
+
+kanban_app.changes publishes every recorded change once its transaction
+commits; the Server-Sent Events endpoint (BoardEventsView) subscribes to the
+board it streams. Each subscriber owns a bounded asyncio queue on the event
+loop that serves its connection, so publishing from a sync view, a signal or a
+management command never blocks on slow clients.
+
+The hub is configured with the KANBAN_EVENTS setting:
+- BACKEND (str): Dotted path of the message transport; defaults to LocalBackend.
+- MAX_SUBSCRIBERS (int): Open streams per worker; further clients get a 503.
+- QUEUE_SIZE (int): Undelivered events per stream before it is cut off.
+- HEARTBEAT (int): Seconds of silence after which a keep-alive comment is sent.
+- RETRY (int): Reconnect delay in milliseconds suggested to EventSource clients.
+
+Backpressure: when a client falls QUEUE_SIZE events behind, its queue is dropped
+and the stream ends with a 'resync' event (see kanban_app.api.event_stream), so
+the client catches up through GET /boards/{pk}/changes/ and reconnects.
+
+A backend implements subscribe(board_id, subscriber), unsubscribe(board_id,
+subscriber) and publish(board_id, message), and calls subscriber.deliver(message)
+for every message of the board. LocalBackend does so directly and therefore only
+reaches subscribers of the same process; a broker backend (e.g. Redis pub/sub)
+forwards messages between workers and hands them to deliver() the same way.
+"""
+
+_config = getattr(settings, 'KANBAN_EVENTS', {})
+MAX_SUBSCRIBERS = _config.get('MAX_SUBSCRIBERS', 1000)
+QUEUE_SIZE = _config.get('QUEUE_SIZE', 100)
+HEARTBEAT = _config.get('HEARTBEAT', 15)
+RETRY = _config.get('RETRY', 3000)
+
+OVERFLOW = object()
+
+
+class SubscriberLimitReached(Exception):
+    pass
+
+
+class Subscriber:
+    def __init__(self, board_id, queue_size=QUEUE_SIZE):
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def deliver(self, message):
+        """Hands a message to the subscriber's event loop; safe to call from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass
+
+    def _put(self, message):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class LocalBackend:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, board_id, subscriber):
+        with self._lock:
+            self._subscribers.setdefault(board_id, set()).add(subscriber)
+
+    def unsubscribe(self, board_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(board_id, set())
+            subscribers.discard(subscriber)
+            if not subscribers:
+                self._subscribers.pop(board_id, None)
+
+    def publish(self, board_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(board_id, ()))
+        for subscriber in subscribers:
+            subscriber.deliver(message)
+
+
+backend = import_string(_config.get('BACKEND', 'kanban_app.events.LocalBackend'))()
+_lock = threading.Lock()
+_open = 0
+
+
+def subscribe(board_id):
+    """Registers a stream for a board; must be called on the event loop that will read it."""
+    global _open
+    with _lock:
+        if _open >= MAX_SUBSCRIBERS:
+            raise SubscriberLimitReached()
+        _open += 1
+    subscriber = Subscriber(board_id)
+    backend.subscribe(board_id, subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber):
+    global _open
+    backend.unsubscribe(subscriber.board_id, subscriber)
+    with _lock:
+        _open -= 1
+
+
+def publish(board_id, version, changes):
+    """Publishes (kind, object_id, deleted) changes of a board after the current transaction commits."""
+    messages = [
+        {'board': board_id, 'version': version, 'kind': kind, 'id': object_id, 'deleted': deleted}
+        for kind, object_id, deleted in changes
+    ]
+
+    def send():
+        for message in messages:
+            backend.publish(board_id, message)
+
+    transaction.on_commit(send)
+
+
+def stats():
+    return {'subscribers': _open, 'max_subscribers': MAX_SUBSCRIBERS}
@@ -0,0 +1,126 @@
+import re
+import uuid
+from urllib.parse import quote
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from rest_framework.authtoken.models import Token
+from auth_app.api import urls as auth_urls
+from kanban_app.api import urls as kanban_urls
+from kanban_app.models import Boards, Tasks, Comments
+
+"""
+Audits the query plans of every GET endpoint for full table scans.
+
+The command creates a small throwaway dataset inside a transaction, calls every
+GET endpoint of auth_app and kanban_app through the Django test client (plain,
+and paginated with an incremental 'after' position), captures each SELECT
+statement with its parameters and runs it through EXPLAIN QUERY PLAN (SQLite) or
+EXPLAIN (PostgreSQL). Statements that walk a whole table or index (SQLite 'SCAN',
+PostgreSQL 'Seq Scan') instead of seeking into it are reported; full-text index
+lookups (SQLite 'SCAN ... VIRTUAL TABLE') and reads of a subquery's own result
+are not. The transaction is rolled back afterwards, so the database is left untouched.
+
+On PostgreSQL sequential scans are disabled for the audit, so a reported
+'Seq Scan' means that no usable index exists, not that the table is small.
+
+Usage:
+    python manage.py audit_query_plans [--fail-on-scan]
+"""
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN on every query issued by the GET endpoints and flags full table scans.'
+
+    scan_patterns = {
+        'sqlite': re.compile(r'^SCAN (?:TABLE )?(\w+)\b(?! VIRTUAL TABLE)'),
+        'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    }
+    subquery_pattern = re.compile(r'^(?:CO-ROUTINE|MATERIALIZE) (\w+)')
+    route_parameter = re.compile(r'<(?:\w+:)?(\w+)>')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail-on-scan', action='store_true', help='Exit with an error if any full table scan is found.')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in self.scan_patterns:
+            raise CommandError(f"Query plan audit is not supported for the '{connection.vendor}' database backend.")
+
+        with transaction.atomic():
+            fixtures = self.create_fixtures()
+            statements = self.capture_statements(fixtures)
+            findings = self.explain_statements(statements, options['verbosity'])
+            transaction.set_rollback(True)
+
+        if not findings:
+            self.stdout.write(self.style.SUCCESS(f"Audited {len(statements)} statements, no full table scans found."))
+            return
+
+        for url, sql, tables in findings:
+            self.stdout.write(self.style.WARNING(f"Full scan of {', '.join(tables)} in GET {url}"))
+            self.stdout.write(f"    {sql}")
+
+        message = f"Audited {len(statements)} statements, {len(findings)} with full table scans."
+        if options['fail_on_scan']:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(message))
+
+    def create_fixtures(self):
+        suffix = uuid.uuid4().hex[:12]
+        owner = User.objects.create_user(username=f'audit-owner-{suffix}', email=f'audit-owner-{suffix}@example.com')
+        member = User.objects.create_user(username=f'audit-member-{suffix}', email=f'audit-member-{suffix}@example.com')
+        board = Boards.objects.create(title='Audit board', owner=owner)
+        board.members.set([owner, member])
+        task = Tasks.objects.create(board=board, title='Audit task', assignee=owner, reviewer=member, createdBy=owner)
+        comment = Comments.objects.create(task=task, author=owner, content='Audit comment')
+        token = Token.objects.create(user=owner)
+        return {
+            'token': token.key,
+            'email': member.email,
+            'after': quote(f"{comment.created_at.isoformat()},{comment.pk}"),
+            'kwargs': {'pk': board.pk, 'task_id': task.pk, 'comment_id': comment.pk},
+        }
+
+    def get_urls(self, fixtures):
+        for module in (auth_urls, kanban_urls):
+            for pattern in module.urlpatterns:
+                view_class = getattr(pattern.callback, 'view_class', None)
+                if view_class is not None and not hasattr(view_class, 'get'):
+                    continue
+                route = self.route_parameter.sub(lambda match: str(fixtures['kwargs'][match.group(1)]), str(pattern.pattern))
+                yield f"/api/{route}?email={fixtures['email']}&since=0&q=audit"
+                yield f"/api/{route}?email={fixtures['email']}&since=0&q=audit&limit=10&after={fixtures['after']}"
+
+    def capture_statements(self, fixtures):
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Token {fixtures['token']}")
+        statements = {}
+
+        for url in self.get_urls(fixtures):
+            def capture(execute, sql, params, many, context):
+                if sql.lstrip().upper().startswith('SELECT'):
+                    statements.setdefault(sql, (url, params))
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(capture):
+                client.get(url)
+
+        return statements
+
+    def explain_statements(self, statements, verbosity):
+        pattern = self.scan_patterns[connection.vendor]
+        prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        findings = []
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            for sql, (url, params) in statements.items():
+                cursor.execute(prefix + sql, params)
+                plan = [row[-1] for row in cursor.fetchall()]
+                if verbosity > 1:
+                    self.stdout.write(f"GET {url}\n    {sql}\n" + '\n'.join(f"      {line}" for line in plan))
+                subqueries = {match.group(1) for line in plan for match in [self.subquery_pattern.search(line)] if match}
+                tables = sorted({match.group(1) for line in plan for match in [pattern.search(line)] if match} - subqueries)
+                if tables:
+                    findings.append((url, sql, tables))
+
+        return findings
@@ -0,0 +1,299 @@
+import datetime
+import io
+import json
+import statistics
+import time
+import uuid
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from rest_framework.authtoken.models import Token
+from auth_app import throttling
+from auth_app.api import urls as auth_urls
+from kanban_app.api import urls as kanban_urls
+from kanban_app.models import Boards, Tasks, Comments
+
+"""
+Benchmarks every endpoint of auth_app and kanban_app and guards against regressions.
+
+The command seeds a dataset inside a transaction that is rolled back afterwards:
+--boards boards owned by the benchmark user, each with --members members,
+--tasks tasks and --comments comments per task. It then sends every request of
+the scenario list below through the Django test client, --warmup times unmeasured
+and --repeat times measured, each in a savepoint that is rolled back, so writes
+(creating, patching, deleting) see the same data every time. Per endpoint it
+records the SQL query count (the highest of the measured runs), the median and
+p95 latency in milliseconds and the response size in bytes.
+
+Every URL pattern and method of both URL modules must have a scenario; missing
+ones are reported, so new endpoints do not silently go unmeasured. GET
+/boards/{pk}/events/ is an endless Server-Sent Events stream and is skipped.
+Login and registration throttles are disabled for the run. PBKDF2 makes login,
+registration and user import slow by design; they run at most 5 times.
+
+Results are printed as a table and written as JSON with --output. With
+--compare the run is checked against a stored result of the same dataset size
+and the command fails if any endpoint now answers with a different status,
+needs more than --query-margin additional queries, or exceeds the baseline
+median, p95 or response size by more than --margin (relative, plus --slack-ms
+for timer noise on very fast endpoints).
+
+Usage:
+    python manage.py benchmark_endpoints [--boards 10 --members 5 --tasks 100 --comments 5] [--repeat 20] --output baseline.json
+    python manage.py benchmark_endpoints --compare baseline.json [--margin 0.25] [--slack-ms 1] [--query-margin 0]
+"""
+class Command(BaseCommand):
+    help = 'Benchmarks every API endpoint (SQL queries, median/p95 latency, response bytes) and compares against a baseline.'
+
+    skipped = {'GET /api/boards/<int:pk>/events/': 'endless Server-Sent Events stream'}
+    slow_repeat = 5
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=10, help='Boards owned by the benchmark user.')
+        parser.add_argument('--members', type=int, default=5, help='Members per board, besides the owner.')
+        parser.add_argument('--tasks', type=int, default=100, help='Tasks per board.')
+        parser.add_argument('--comments', type=int, default=5, help='Comments per task.')
+        parser.add_argument('--repeat', type=int, default=20, help='Measured requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests per endpoint before the measured ones.')
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help="Only run endpoints whose key (e.g. 'GET /api/boards/') contains this text (repeatable).")
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+        parser.add_argument('--compare', help='Baseline JSON (from --output) to compare against; fails on regressions.')
+        parser.add_argument('--margin', type=float, default=0.25, help='Allowed relative increase of latency and response size.')
+        parser.add_argument('--slack-ms', type=float, default=1.0, help='Latency increase always tolerated, in milliseconds.')
+        parser.add_argument('--query-margin', type=int, default=0, help='Allowed increase of the query count.')
+
+    def handle(self, *args, **options):
+        dataset = {name: max(options[name], 1) for name in ('boards', 'members', 'tasks', 'comments')}
+        baseline = self.load_baseline(options['compare'], dataset) if options['compare'] else None
+
+        with transaction.atomic(), mock.patch.dict(throttling.RATES, clear=True):
+            started = time.perf_counter()
+            fixtures = self.create_fixtures(dataset)
+            self.stdout.write(f"Seeded {dataset} in {time.perf_counter() - started:.1f}s.")
+            scenarios = self.scenarios(fixtures)
+            self.check_coverage(scenarios)
+            results = self.run(scenarios, fixtures, options)
+            transaction.set_rollback(True)
+
+        self.report(results)
+        output = {
+            'recorded_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'dataset': dataset,
+            'repeat': options['repeat'],
+            'endpoints': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as stream:
+                json.dump(output, stream, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+        if baseline is not None:
+            self.compare(baseline, results, options)
+
+    def create_fixtures(self, dataset):
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(
+            username=f'bench-{suffix}@example.com', email=f'bench-{suffix}@example.com', password='benchmark-password',
+            first_name='Bench', last_name='Mark', is_staff=True,
+        )
+        members = User.objects.bulk_create([
+            User(username=f'bench-{suffix}-{index}@example.com', email=f'bench-{suffix}-{index}@example.com', first_name=f'Member {index}')
+            for index in range(dataset['members'])
+        ])
+        people = [user, *members]
+
+        boards = Boards.objects.bulk_create([Boards(title=f'Benchmark board {index}', owner=user) for index in range(dataset['boards'])])
+        Boards.members.through.objects.bulk_create([
+            Boards.members.through(boards_id=board.pk, user_id=member.pk) for board in boards for member in people
+        ])
+
+        words = ('review', 'deploy', 'design', 'budget', 'release')
+        tasks = Tasks.objects.bulk_create([
+            Tasks(
+                board=board, title=f'Benchmark task {index} {words[index % len(words)]}',
+                description=f'Description of task {index}, {words[(index + 2) % len(words)]} pending.',
+                status=('to-do', 'in-progress', 'review', 'done')[index % 4], priority=('low', 'medium', 'high')[index % 3],
+                assignee=people[index % len(people)], reviewer=people[(index + 1) % len(people)],
+                comments_count=dataset['comments'], createdBy=user,
+            )
+            for board in boards for index in range(dataset['tasks'])
+        ], batch_size=1000)
+        Comments.objects.bulk_create([
+            Comments(task=task, author=people[index % len(people)], content=f'Benchmark comment {index} on {task.title}')
+            for task in tasks for index in range(dataset['comments'])
+        ], batch_size=1000)
+        call_command('reconcile_board_counters', boards=[board.pk for board in boards], stdout=io.StringIO())
+
+        task = tasks[0]
+        return {
+            'suffix': suffix,
+            'token': Token.objects.create(user=user).key,
+            'user': user,
+            'members': members,
+            'board': boards[0],
+            'task': task,
+            'comment': Comments.objects.filter(task=task, author=user).order_by('pk').first(),
+            'task_ids': [task.pk for task in tasks[:dataset['tasks']]][:50],
+        }
+
+    def scenarios(self, fixtures):
+        """Returns {key: (method, path, body, expected status, slow)}; a callable body gets the request number."""
+        user, members, board, task, comment = (fixtures[name] for name in ('user', 'members', 'board', 'task', 'comment'))
+        suffix = fixtures['suffix']
+        people = [user.pk, *(member.pk for member in members)]
+        task_body = {
+            'board': board.pk, 'title': 'Benchmark task', 'description': 'Created by the benchmark.', 'status': 'to-do',
+            'priority': 'high', 'assignee_id': people[-1], 'reviewer_id': user.pk, 'due_date': '2030-01-01',
+        }
+        return {
+            'POST /api/registration/': ('post', '/api/registration/', lambda number: {
+                'fullname': 'New Member', 'email': f'bench-{suffix}-new-{number}@example.com',
+                'password': 'benchmark-password', 'repeated_password': 'benchmark-password',
+            }, 201, True),
+            'POST /api/login/': ('post', '/api/login/', {'email': user.email, 'password': 'benchmark-password'}, 200, True),
+            'POST /api/users/import/': ('post', '/api/users/import/', lambda number: {'file': SimpleUploadedFile('users.csv', (
+                'email,fullname\n' + ''.join(f'bench-{suffix}-import-{number}-{index}@example.com,Imported {index}\n' for index in range(20))
+            ).encode())}, 200, True),
+            'GET /api/boards/': ('get', '/api/boards/', None, 200, False),
+            'POST /api/boards/': ('post', '/api/boards/', {'title': 'New board', 'members': people}, 201, False),
+            'GET /api/boards/<int:pk>/': ('get', f'/api/boards/{board.pk}/', None, 200, False),
+            'PATCH /api/boards/<int:pk>/': ('patch', f'/api/boards/{board.pk}/', {'title': 'Renamed board'}, 200, False),
+            'DELETE /api/boards/<int:pk>/': ('delete', f'/api/boards/{board.pk}/', None, 204, False),
+            'GET /api/boards/<int:pk>/changes/': ('get', f'/api/boards/{board.pk}/changes/?since=0', None, 200, False),
+            'GET /api/email-check/': ('get', f'/api/email-check/?email={members[0].email}', None, 200, False),
+            'POST /api/email-check/batch/': ('post', '/api/email-check/batch/', {
+                'emails': [member.email for member in members][:50] + [f'unknown-{suffix}@example.com'],
+            }, 200, False),
+            'GET /api/search/': ('get', '/api/search/?q=review', None, 200, False),
+            'GET /api/tasks/assigned-to-me/': ('get', '/api/tasks/assigned-to-me/', None, 200, False),
+            'GET /api/tasks/reviewing/': ('get', '/api/tasks/reviewing/', None, 200, False),
+            'POST /api/tasks/': ('post', '/api/tasks/', task_body, 201, False),
+            'POST /api/tasks/bulk/': ('post', '/api/tasks/bulk/', {
+                'board': board.pk, 'tasks': [{key: value for key, value in task_body.items() if key != 'board'}] * 50,
+            }, 201, False),
+            'PATCH /api/tasks/bulk/': ('patch', '/api/tasks/bulk/', {
+                'board': board.pk, 'ids': fixtures['task_ids'], 'patch': {'status': 'review', 'priority': 'low'},
+            }, 200, False),
+            'PATCH /api/tasks/<int:task_id>/': ('patch', f'/api/tasks/{task.pk}/', {'title': 'Renamed task', 'status': 'done'}, 200, False),
+            'DELETE /api/tasks/<int:task_id>/': ('delete', f'/api/tasks/{task.pk}/', None, 204, False),
+            'GET /api/tasks/<int:task_id>/comments/': ('get', f'/api/tasks/{task.pk}/comments/', None, 200, False),
+            'POST /api/tasks/<int:task_id>/comments/': ('post', f'/api/tasks/{task.pk}/comments/', {'content': 'Benchmark comment'}, 201, False),
+            'DELETE /api/tasks/<int:task_id>/comments/<int:comment_id>/': (
+                'delete', f'/api/tasks/{task.pk}/comments/{comment.pk}/', None, 204, False,
+            ),
+        }
+
+    def check_coverage(self, scenarios):
+        for module in (auth_urls, kanban_urls):
+            for pattern in module.urlpatterns:
+                view_class = getattr(pattern.callback, 'view_class', None)
+                methods = [method for method in ('get', 'post', 'put', 'patch', 'delete') if hasattr(view_class, method)]
+                for method in methods:
+                    key = f"{method.upper()} /api/{pattern.pattern}"
+                    if key not in scenarios and key not in self.skipped:
+                        self.stdout.write(self.style.WARNING(f"No benchmark scenario for {key}."))
+
+    def run(self, scenarios, fixtures, options):
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Token {fixtures['token']}")
+        selected = [
+            (key, scenario) for key, scenario in scenarios.items()
+            if not options['endpoints'] or any(text in key for text in options['endpoints'])
+        ]
+        # Reads first: the writes are rolled back, but may leave cache entries behind.
+        selected.sort(key=lambda item: item[1][0] != 'get')
+
+        results = {}
+        for key, (method, path, body, expected, slow) in selected:
+            repeat = max(min(options['repeat'], self.slow_repeat) if slow else options['repeat'], 1)
+            samples = []
+            for number in range(max(options['warmup'], 0) + repeat):
+                samples.append(self.request(client, method, path, body(number) if callable(body) else body))
+            samples = samples[-repeat:]
+            latencies = [sample[0] for sample in samples]
+            results[key] = {
+                'status': samples[-1][3] if all(sample[3] == samples[-1][3] for sample in samples) else 'mixed',
+                'expected_status': expected,
+                'queries': max(sample[1] for sample in samples),
+                'median_ms': round(statistics.median(latencies), 3),
+                'p95_ms': round(self.percentile(latencies, 95), 3),
+                'bytes': max(sample[2] for sample in samples),
+            }
+        return results
+
+    def request(self, client, method, path, body):
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        if body is None:
+            arguments = {}
+        elif any(isinstance(value, SimpleUploadedFile) for value in body.values()):
+            arguments = {'data': body}
+        else:
+            arguments = {'data': json.dumps(body), 'content_type': 'application/json'}
+
+        with transaction.atomic():
+            with connection.execute_wrapper(count):
+                started = time.perf_counter()
+                response = getattr(client, method)(path, **arguments)
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+        return elapsed, queries[0], len(content), response.status_code
+
+    def report(self, results):
+        self.stdout.write(f"{'endpoint':<62} {'status':>6} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8} {'bytes':>9}")
+        for key, result in results.items():
+            line = (
+                f"{key:<62} {result['status']:>6} {result['queries']:>7} "
+                f"{result['median_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['bytes']:>9}"
+            )
+            self.stdout.write(line if result['status'] == result['expected_status'] else self.style.ERROR(line))
+        failed = [key for key, result in results.items() if result['status'] != result['expected_status']]
+        if failed:
+            self.stdout.write(self.style.ERROR(f"Unexpected status for: {', '.join(failed)}."))
+
+    def load_baseline(self, path, dataset):
+        try:
+            with open(path) as stream:
+                baseline = json.load(stream)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read the baseline {path}: {exc}")
+        if baseline.get('dataset') != dataset:
+            raise CommandError(f"The baseline was recorded with dataset {baseline.get('dataset')}, this run uses {dataset}.")
+        return baseline
+
+    def compare(self, baseline, results, options):
+        margin, slack = options['margin'], options['slack_ms']
+        regressions = []
+        for key, result in results.items():
+            previous = baseline['endpoints'].get(key)
+            if previous is None:
+                self.stdout.write(f"New endpoint without baseline: {key}")
+                continue
+            if result['status'] != previous['status']:
+                regressions.append(f"{key}: status {previous['status']} -> {result['status']}")
+            if result['queries'] > previous['queries'] + options['query_margin']:
+                regressions.append(f"{key}: {previous['queries']} -> {result['queries']} queries")
+            for field in ('median_ms', 'p95_ms'):
+                if result[field] > previous[field] * (1 + margin) + slack:
+                    regressions.append(f"{key}: {field} {previous[field]:.2f} -> {result[field]:.2f}")
+            if result['bytes'] > previous['bytes'] * (1 + margin):
+                regressions.append(f"{key}: {previous['bytes']} -> {result['bytes']} bytes")
+
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f"  {regression}"))
+            raise CommandError(f"{len(regressions)} regressions against {options['compare']}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']} (margin {margin:.0%}, slack {slack:g} ms)."))
+
+    def percentile(self, values, percent):
+        if len(values) < 2:
+            return values[0]
+        return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
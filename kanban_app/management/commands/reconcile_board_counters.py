@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from kanban_app.models import Boards, Tasks
+
+"""
+Recomputes the denormalized board counters from the actual rows.
+
+The counters are maintained incrementally on every task and membership write;
+this command repairs drift left by raw SQL, restores or historic data. Boards are
+processed in primary key batches and each batch costs one aggregate query over
+the tasks, one over the board memberships and one bulk UPDATE for the boards
+whose counters actually changed.
+
+Usage:
+    python manage.py reconcile_board_counters [--batch-size 500] [--board 1 --board 2]
+"""
+class Command(BaseCommand):
+    help = 'Recomputes member_count, ticket_count, tasks_to_do_count and tasks_high_prio_count for boards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of boards reconciled per batch.')
+        parser.add_argument('--board', type=int, action='append', dest='boards', help='Only reconcile the given board ID (repeatable).')
+
+    def handle(self, *args, **options):
+        board_ids = Boards.objects.order_by('pk').values_list('pk', flat=True)
+        if options['boards']:
+            board_ids = board_ids.filter(pk__in=options['boards'])
+        board_ids = list(board_ids)
+        batch_size = max(options['batch_size'], 1)
+
+        updated = 0
+        for start in range(0, len(board_ids), batch_size):
+            updated += self.reconcile_batch(board_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {len(board_ids)} boards, {updated} corrected."))
+
+    @transaction.atomic
+    def reconcile_batch(self, batch):
+        boards = list(Boards.objects.select_for_update().filter(pk__in=batch).only('pk', *Boards.COUNTER_FIELDS))
+
+        task_counts = {
+            row['board_id']: row
+            for row in Tasks.objects.filter(board_id__in=batch).order_by().values('board_id').annotate(
+                ticket_count=Count('pk'),
+                tasks_to_do_count=Count('pk', filter=Q(status=Tasks.STATUS_TO_DO)),
+                tasks_high_prio_count=Count('pk', filter=Q(priority=Tasks.PRIORITY_HIGH)),
+            )
+        }
+        member_counts = dict(
+            Boards.members.through.objects.filter(boards_id__in=batch).order_by().values('boards_id')
+            .annotate(member_count=Count('pk')).values_list('boards_id', 'member_count')
+        )
+
+        changed = []
+        for board in boards:
+            expected = task_counts.get(board.pk, {})
+            values = {field: expected.get(field, 0) for field in Boards.TASK_COUNTER_FIELDS}
+            values['member_count'] = member_counts.get(board.pk, 0)
+            if any(getattr(board, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(board, field, value)
+                changed.append(board)
+
+        if changed:
+            Boards.objects.bulk_update(changed, Boards.COUNTER_FIELDS)
+        return len(changed)
@@ -0,0 +1,248 @@
+import datetime
+import itertools
+import random
+import time
+from array import array
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from kanban_app.models import Boards, Tasks, Comments
+
+"""
+Generates a large, reproducible dataset for reproducing scaling problems locally.
+
+The defaults produce about 10M rows: --users users, --boards boards, --tasks tasks
+and --comments comments, plus the board memberships. Every value is drawn from a
+random.Random seeded with --seed, and dates are relative to --reference-date
+(default today), so the same arguments always produce the same dataset (only
+the password salt differs).
+
+Distributions:
+- Users: Username and email '<prefix>-<n>@example.com', all with the password
+  --password (hashed once), so any of them can log in.
+- Board members: Pareto-distributed team sizes (many small teams, a few very
+  large ones, up to --max-members); the owner is one of the members.
+- Tasks per board: Proportional to the team size.
+- Tasks: 25% to-do, 20% in progress, 10% in review, 45% done; 30% low, 50%
+  medium, 20% high priority; 90% assigned and 60% with a reviewer from the board's
+  members; 80% with a due date, in the past for done tasks and mostly ahead otherwise.
+- Comments: Zipf-distributed over the tasks (exponent --zipf), so a few tasks are
+  very busy and most have none, written by members of the board over the 180 days
+  before the reference date. Texts use a synthetic vocabulary with Zipf-distributed
+  word frequencies; comments pick from 50000 pre-generated texts.
+Per-board task counts and per-task comment counts are capped at 32767, the range
+of the counter columns on PostgreSQL; the surplus goes to the other boards and
+tasks as long as they have room.
+
+Rows are inserted with bulk_create, --batch-size rows and one transaction per
+batch; memberships are inserted into the M2M through table directly. Comments
+are written with a plain INSERT of their column values instead, because
+bulk_create would stamp created_at (auto_now_add) with the current time. The task
+comments_count is set from the generated comments, the board counters are
+computed with reconcile_board_counters at the end, and ANALYZE refreshes the
+query planner statistics. The search index triggers (kanban_app migration 0015)
+stay active and index every row as it is inserted; on SQLite that is about half
+of the insert time. bulk_create sends no signals, so no board changes or
+events are recorded for the generated data.
+
+The command refuses to run if users with the prefix already exist; use a fresh
+database or another --prefix.
+
+Usage:
+    python manage.py seed_kanban [--users 20000 --boards 5000 --tasks 1000000 --comments 9000000] [--seed 1] [--reference-date 2026-01-01]
+"""
+class Command(BaseCommand):
+    help = 'Generates a large, reproducible dataset of users, boards, tasks and comments.'
+
+    counter_limit = 32767
+    statuses = ('to-do', 'in-progress', 'review', 'done')
+    status_weights = list(itertools.accumulate((25, 20, 10, 45)))
+    priorities = ('low', 'medium', 'high')
+    priority_weights = list(itertools.accumulate((30, 50, 20)))
+    first_names = ('Anna', 'Ben', 'Clara', 'David', 'Elif', 'Finn', 'Greta', 'Hamid', 'Ines', 'Jonas', 'Kim', 'Lena', 'Mia', 'Noah', 'Omar', 'Paula')
+    last_names = ('Schmidt', 'Novak', 'Rossi', 'Yilmaz', 'Berg', 'Kowalski', 'Meyer', 'Santos', 'Weber', 'Lindqvist', 'Fischer', 'Dubois')
+    syllables = ('ka', 'ne', 'mi', 'to', 'ra', 'su', 'lo', 've', 'di', 'pa', 'en', 'or', 'ul', 'is', 'an', 'ex')
+    vocabulary_size = 5000
+    comment_texts = 50000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20000, help='Users to generate.')
+        parser.add_argument('--boards', type=int, default=5000, help='Boards to generate.')
+        parser.add_argument('--tasks', type=int, default=1000000, help='Tasks to generate.')
+        parser.add_argument('--comments', type=int, default=9000000, help='Comments to generate.')
+        parser.add_argument('--max-members', type=int, default=500, help='Largest team size.')
+        parser.add_argument('--zipf', type=float, default=1.0, help='Zipf exponent of the comments per task.')
+        parser.add_argument('--seed', type=int, default=1, help='Seed of the random generator.')
+        parser.add_argument('--reference-date', type=datetime.date.fromisoformat, help='Date the generated dates are relative to (default today).')
+        parser.add_argument('--prefix', default='seed', help='Prefix of the generated usernames.')
+        parser.add_argument('--password', default='seed-password', help='Password of every generated user.')
+        parser.add_argument('--batch-size', type=int, default=20000, help='Rows inserted per transaction.')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(f"Users with the prefix '{options['prefix']}' already exist; use a fresh database or another --prefix.")
+
+        self.generator = random.Random(options['seed'])
+        self.batch_size = max(options['batch_size'], 1)
+        self.reference = options['reference_date'] or timezone.localdate()
+        self.end = timezone.make_aware(datetime.datetime.combine(self.reference, datetime.time()))
+        vocabulary = self.vocabulary()
+        self.words = vocabulary, list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+        if connection.vendor == 'sqlite':
+            # 256 MB page cache for this connection: the indexes, above all the search
+            # index, outgrow the default 2 MB within the first batches.
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA cache_size = -262144')
+
+        started = phase = time.perf_counter()
+        users = self.create_users(max(options['users'], 1), options)
+        phase = self.progress('users', len(users), phase)
+        teams = self.create_boards(users, max(options['boards'], 1), max(options['max_members'], 1))
+        phase = self.progress('boards', len(teams), phase)
+        tasks, comment_counts = self.create_tasks(teams, max(options['tasks'], 0), max(options['comments'], 0), options['zipf'])
+        phase = self.progress('tasks', len(tasks[0]), phase)
+        self.progress('comments', self.create_comments(teams, tasks, comment_counts), phase)
+
+        call_command('reconcile_board_counters', boards=[board for board, _ in teams], stdout=self.stdout)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(self.style.SUCCESS(f"Seeded the database in {time.perf_counter() - started:.0f}s."))
+
+    def progress(self, name, rows, started):
+        now = time.perf_counter()
+        self.stdout.write(f"{rows} {name} in {now - started:.1f}s ({rows / max(now - started, 0.001):,.0f} rows/s).")
+        return now
+
+    def insert(self, model, objects):
+        created = []
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                created += model.objects.bulk_create(objects[start:start + self.batch_size])
+        return created
+
+    def insert_values(self, model, fields, rows):
+        """Inserts tuples of field values as they are, bypassing pre_save (auto_now_add); returns the row count."""
+        fields = [model._meta.get_field(name) for name in fields]
+        ops = connection.ops
+        prefix = 'INSERT INTO {} ({}) '.format(ops.quote_name(model._meta.db_table), ', '.join(ops.quote_name(field.column) for field in fields))
+        # Multi-row statements of the size bulk_create would use (the parameter limit).
+        per_statement = max(ops.bulk_batch_size(fields, rows), 1)
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            with transaction.atomic(), connection.cursor() as cursor:
+                for offset in range(0, len(batch), per_statement):
+                    chunk = batch[offset:offset + per_statement]
+                    cursor.execute(
+                        prefix + ops.bulk_insert_sql(fields, [['%s'] * len(fields)] * len(chunk)),
+                        [field.get_db_prep_save(value, connection) for row in chunk for field, value in zip(fields, row)],
+                    )
+        return len(rows)
+
+    def create_users(self, count, options):
+        password = make_password(options['password'])
+        users = self.insert(User, [
+            User(
+                username=f"{options['prefix']}-{index}@example.com", email=f"{options['prefix']}-{index}@example.com", password=password,
+                first_name=self.generator.choice(self.first_names), last_name=self.generator.choice(self.last_names),
+                date_joined=self.end - datetime.timedelta(days=self.generator.randint(181, 720)),
+            )
+            for index in range(count)
+        ])
+        return [user.pk for user in users]
+
+    def create_boards(self, users, count, max_members):
+        """Returns [(board ID, member IDs)], the owner first."""
+        sizes = [min(len(users), max_members, int(2 * self.generator.paretovariate(1.1))) for _ in range(count)]
+        members = [self.generator.sample(users, size) for size in sizes]
+        boards = self.insert(Boards, [Boards(title=self.text(2, 5).capitalize(), owner_id=team[0], updated_at=self.end) for team in members])
+        through = Boards.members.through
+        self.insert(through, [through(boards_id=board.pk, user_id=user) for board, team in zip(boards, members) for user in team])
+        return [(board.pk, team) for board, team in zip(boards, members)]
+
+    def create_tasks(self, teams, count, comments, zipf):
+        """Returns the task IDs, their board indexes, and the comments to generate per task."""
+        per_board = self.spread(count, [len(team) for _, team in teams])
+        ranks = list(range(1, sum(per_board) + 1))
+        self.generator.shuffle(ranks)
+        comment_counts = self.spread(comments, [rank ** -zipf for rank in ranks])
+
+        task_ids, board_indexes = array('q'), array('l')
+        pending = []
+        for index, ((board, team), tasks) in enumerate(zip(teams, per_board)):
+            for _ in range(tasks):
+                pending.append(self.task(board, team, comment_counts[len(board_indexes)]))
+                board_indexes.append(index)
+                if len(pending) == self.batch_size:
+                    task_ids.extend(task.pk for task in self.insert(Tasks, pending))
+                    pending = []
+        task_ids.extend(task.pk for task in self.insert(Tasks, pending))
+        return (task_ids, board_indexes), comment_counts
+
+    def task(self, board, team, comments_count):
+        generator = self.generator
+        status = generator.choices(self.statuses, cum_weights=self.status_weights)[0]
+        due_date = None
+        if generator.random() < 0.8:
+            days = generator.randint(-120, -1) if status == 'done' else generator.randint(-14, 60)
+            due_date = self.reference + datetime.timedelta(days=days)
+        return Tasks(
+            board_id=board, title=self.text(3, 8).capitalize(), description=self.text(0, 40) if generator.random() < 0.7 else '',
+            status=status, priority=generator.choices(self.priorities, cum_weights=self.priority_weights)[0],
+            assignee_id=generator.choice(team) if generator.random() < 0.9 else None,
+            reviewer_id=generator.choice(team) if generator.random() < 0.6 else None,
+            due_date=due_date, comments_count=comments_count, createdBy_id=generator.choice(team),
+        )
+
+    def create_comments(self, teams, tasks, comment_counts):
+        generator = self.generator
+        task_ids, board_indexes = tasks
+        window = 180 * 86400
+        # Drawing 9M texts word by word would take about two and a half minutes.
+        texts = [self.text(3, 40) for _ in range(self.comment_texts)]
+        fields = ('task', 'author', 'content', 'created_at')
+        created, pending = 0, []
+        for task, board_index, count in zip(task_ids, board_indexes, comment_counts):
+            team = teams[board_index][1]
+            for offset in sorted(generator.random() * window for _ in range(count)):
+                pending.append((
+                    task, generator.choice(team), generator.choice(texts),
+                    self.end - datetime.timedelta(seconds=window - offset),
+                ))
+            if len(pending) >= self.batch_size:
+                created += self.insert_values(Comments, fields, pending)
+                pending = []
+        created += self.insert_values(Comments, fields, pending)
+        return created
+
+    def spread(self, total, weights):
+        """Splits total proportionally to weights into integers of at most counter_limit; the sum is total on average."""
+        counts = [0] * len(weights)
+        remaining, uncapped = total, list(range(len(weights)))
+        while uncapped and remaining > 0:
+            scale = remaining / sum(weights[index] for index in uncapped)
+            capped = [index for index in uncapped if weights[index] * scale > self.counter_limit]
+            if not capped:
+                for index in uncapped:
+                    share = weights[index] * scale
+                    counts[index] = int(share) + (self.generator.random() < share - int(share))
+                break
+            for index in capped:
+                counts[index] = self.counter_limit
+            remaining -= self.counter_limit * len(capped)
+            uncapped = [index for index in uncapped if weights[index] * scale <= self.counter_limit]
+        return counts
+
+    def vocabulary(self):
+        words = set()
+        while len(words) < self.vocabulary_size:
+            words.add(''.join(self.generator.choices(self.syllables, k=self.generator.randint(2, 4))))
+        words = sorted(words)
+        self.generator.shuffle(words)
+        return words
+
+    def text(self, minimum, maximum):
+        vocabulary, weights = self.words
+        return ' '.join(self.generator.choices(vocabulary, cum_weights=weights, k=self.generator.randint(minimum, maximum)))
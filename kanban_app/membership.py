@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from core.lru import LRUCache
+from kanban_app.models import Boards
+
+"""
+Board membership checks shared by views, permissions and serializers.
+
+A check never loads the member list: it is answered from members already
+prefetched on the board, or from a single EXISTS query. Results are memoized
+on the request, so repeated checks within one request are free, and optionally
+in a process-wide LRU keyed by (board_id, user_id, kind). ahas_board_access()
+answers the same way from async views, running the EXISTS query through the
+async ORM.
+
+The LRU is configured with the KANBAN_MEMBERSHIP_CACHE setting:
+- MAX_SIZE (int): Number of cached answers per worker; 0 disables the cache.
+- TTL (int): Seconds an answer may be served; bounds staleness across workers.
+
+Entries are invalidated in-process whenever board members change (see
+kanban_app.signals), including members.set() in BoardSerializer.create and
+BoardPatchSerializer.update.
+"""
+
+ACCESS = 'access'
+MEMBER = 'member'
+
+_config = getattr(settings, 'KANBAN_MEMBERSHIP_CACHE', {})
+cache = LRUCache(maxsize=_config.get('MAX_SIZE', 0), ttl=_config.get('TTL', 30))
+
+
+def has_board_access(user, board, request=None):
+    """Returns True if the user owns the board or is one of its members."""
+    if isinstance(board, Boards) and board.owner_id == user.pk:
+        return True
+    return _check(user, board, ACCESS, request)
+
+
+async def ahas_board_access(user, board, request=None):
+    """Coroutine variant of has_board_access for async views; never blocks the event loop."""
+    if isinstance(board, Boards) and board.owner_id == user.pk:
+        return True
+    return await _acheck(user, board, ACCESS, request)
+
+
+def is_board_member(user, board, request=None):
+    """Returns True if the user is one of the board's members (ownership alone is not enough)."""
+    return _check(user, board, MEMBER, request)
+
+
+def invalidate(board_id=None, user_id=None):
+    """Drops cached answers for a board, a user, or one (board, user) pair."""
+    cache.delete_where(lambda key, value: (
+        (board_id is None or key[0] == board_id) and (user_id is None or key[1] == user_id)
+    ))
+
+
+def _check(user, board, kind, request):
+    key, memo, allowed = _lookup(user, board, kind, request)
+    if allowed is None:
+        allowed = _query(*key).exists()
+        cache.set(key, allowed)
+    return _remember(memo, key, allowed)
+
+
+async def _acheck(user, board, kind, request):
+    key, memo, allowed = _lookup(user, board, kind, request)
+    if allowed is None:
+        allowed = await _query(*key).aexists()
+        cache.set(key, allowed)
+    return _remember(memo, key, allowed)
+
+
+def _lookup(user, board, kind, request):
+    if not user or not user.is_authenticated:
+        return None, None, False
+
+    board_id = board.pk if isinstance(board, Boards) else int(board)
+    key = (board_id, user.pk, kind)
+
+    memo = None
+    if request is not None:
+        memo = getattr(request, '_board_membership', None)
+        if memo is None:
+            memo = {}
+            request._board_membership = memo
+        if key in memo:
+            return key, None, memo[key]
+
+    prefetched = getattr(board, '_prefetched_objects_cache', {}).get('members')
+    if prefetched is not None:
+        allowed = any(member.pk == user.pk for member in prefetched)
+        if kind == ACCESS:
+            allowed = allowed or board.owner_id == user.pk
+        return key, memo, allowed
+    return key, memo, cache.get(key)
+
+
+def _remember(memo, key, allowed):
+    if memo is not None:
+        memo[key] = allowed
+    return allowed
+
+
+def _query(board_id, user_id, kind):
+    membership = Boards.members.through.objects.filter(boards_id=OuterRef('pk'), user_id=user_id)
+    condition = Exists(membership)
+    if kind == ACCESS:
+        condition |= Q(owner_id=user_id)
+    return Boards.objects.filter(condition, pk=board_id)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0012_task_and_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boards',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
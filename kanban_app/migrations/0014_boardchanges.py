@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0013_boards_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardChanges',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('board', 'Board'), ('member', 'Member'), ('task', 'Task'), ('comment', 'Comment')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('seq', models.PositiveIntegerField()),
+                ('board', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='kanban_app.boards')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'seq'], name='board_changes_seq_idx')],
+                'constraints': [models.UniqueConstraint(fields=('board', 'kind', 'object_id'), name='board_changes_object_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,110 @@
+from django.db import migrations
+
+"""
+Full-text index over task titles, descriptions and comment content (see kanban_app.search).
+
+SQLite: an FTS5 table, kanban_search, with one row per task (rowid = 2 * task ID)
+and one per comment (rowid = 2 * comment ID + 1), kept in sync by triggers on
+kanban_app_tasks and kanban_app_comments and filled from the existing rows. Its
+prefix index on the first 3 and 4 characters keeps 'rev*' queries from scanning
+every term that starts with those letters.
+
+PostgreSQL: a stored generated tsvector column, search_vector, on both tables
+(task titles weighted A, descriptions B), each with a GIN index.
+
+Other database backends get no index; the search endpoint answers 501 there.
+"""
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE kanban_search USING fts5(
+        task_id UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER kanban_search_task_insert AFTER INSERT ON kanban_app_tasks BEGIN
+        INSERT INTO kanban_search (rowid, task_id, title, body) VALUES (new.id * 2, new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_search_task_update AFTER UPDATE OF title, description ON kanban_app_tasks BEGIN
+        UPDATE kanban_search SET title = new.title, body = new.description WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_search_task_delete AFTER DELETE ON kanban_app_tasks BEGIN
+        DELETE FROM kanban_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_search_comment_insert AFTER INSERT ON kanban_app_comments BEGIN
+        INSERT INTO kanban_search (rowid, task_id, title, body) VALUES (new.id * 2 + 1, new.task_id, '', new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_search_comment_update AFTER UPDATE OF task_id, content ON kanban_app_comments BEGIN
+        UPDATE kanban_search SET task_id = new.task_id, body = new.content WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER kanban_search_comment_delete AFTER DELETE ON kanban_app_comments BEGIN
+        DELETE FROM kanban_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    """
+    INSERT INTO kanban_search (rowid, task_id, title, body)
+    SELECT id * 2, id, title, description FROM kanban_app_tasks
+    """,
+    """
+    INSERT INTO kanban_search (rowid, task_id, title, body)
+    SELECT id * 2 + 1, task_id, '', content FROM kanban_app_comments
+    """,
+]
+
+SQLITE_BACKWARD = [
+    *(f"DROP TRIGGER IF EXISTS kanban_search_{table}_{event}"
+      for table in ('task', 'comment') for event in ('insert', 'update', 'delete')),
+    "DROP TABLE IF EXISTS kanban_search",
+]
+
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE kanban_app_tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX tasks_search_vector_idx ON kanban_app_tasks USING GIN (search_vector)",
+    """
+    ALTER TABLE kanban_app_comments ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX comments_search_vector_idx ON kanban_app_comments USING GIN (search_vector)",
+]
+
+POSTGRESQL_BACKWARD = [
+    "ALTER TABLE kanban_app_tasks DROP COLUMN IF EXISTS search_vector",
+    "ALTER TABLE kanban_app_comments DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0014_boardchanges'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 """
 Model representing a project board.
@@ -12,12 +15,23 @@ Fields:
 - tasks_to_do_count (PositiveSmallIntegerField): Cached count of tasks with "to do" status (default 0).
 - tasks_high_prio_count (PositiveSmallIntegerField): Cached count of high priority tasks (default 0).
 - owner (ForeignKey): The user who owns the board; deleting the owner deletes the board (nullable).
+- version (PositiveIntegerField): Incremented on every write to the board, its members, tasks or comments.
+- updated_at (DateTimeField): Time of the last version increment.
 
 Methods:
 - save(): On creating a new board, updates member_count to reflect current members.
+  Saving an existing board never writes the counters, version or updated_at, so a
+  stale instance cannot overwrite updates applied concurrently by other writes.
+- touch(): Increments the version and applies deltas to the task counters in one
+  atomic F-expression UPDATE.
+- version_updates(): Returns the update() keyword arguments that increment the version.
 - __str__(): Returns the board's title as its string representation.
 """
 class Boards(models.Model):
+    TASK_COUNTER_FIELDS = ('ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count')
+    COUNTER_FIELDS = ('member_count',) + TASK_COUNTER_FIELDS
+    MANAGED_FIELDS = COUNTER_FIELDS + ('version', 'updated_at')
+
     title = models.CharField(max_length=255)
     members = models.ManyToManyField(User, related_name='boards')
     member_count = models.PositiveSmallIntegerField(default=0)
@@ -25,14 +39,38 @@ class Boards(models.Model):
     tasks_to_do_count = models.PositiveSmallIntegerField(default=0)
     tasks_high_prio_count = models.PositiveSmallIntegerField(default=0)
     owner = models.ForeignKey(User, related_name='owned_boards', on_delete=models.CASCADE, null=True)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
 
     def save(self, *args, **kwargs):
         is_new = self.pk is None
+        if not is_new and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.MANAGED_FIELDS
+                and field.attname not in deferred
+            ]
         super().save(*args, **kwargs)
         if is_new:
             self.member_count = self.members.count()
             super().save(update_fields=['member_count'])
 
+    @classmethod
+    def version_updates(cls):
+        return {'version': F('version') + 1, 'updated_at': timezone.now()}
+
+    @classmethod
+    def touch(cls, board_id, **counter_deltas):
+        updates = cls.version_updates()
+        for field, delta in counter_deltas.items():
+            if delta > 0:
+                updates[field] = F(field) + delta
+            elif delta < 0:
+                updates[field] = Greatest(F(field) + delta, 0)
+        cls.objects.filter(pk=board_id).update(**updates)
+
     def __str__(self):
         return self.title
 
@@ -51,21 +89,68 @@ Fields:
 - comments_count (PositiveSmallIntegerField): Cached count of comments on the task (default 0).
 - createdBy (ForeignKey): User who created the task; deleting the user deletes the task.
 
+Indexes:
+- (board, id), (assignee, id) and (reviewer, id) back the board detail and the
+  assigned/reviewing lists, filtered by the first column and ordered by ID.
+
 Methods:
+- counter_values(): Returns what the task contributes to its board's task counters.
+- adjust_comments_count(): Adds a delta to comments_count with a single F-expression
+  UPDATE (never below 0), so concurrent comment writes never lose an update.
+- save(): Saves the task in a transaction, so the board counter update made by the
+  post_save signal commits or rolls back together with the task row.
 - __str__(): Returns the task's title as its string representation.
 """
 class Tasks(models.Model):
-    board = models.ForeignKey(Boards, on_delete=models.CASCADE, related_name='tasks')
+    STATUS_TO_DO = 'to-do'
+    PRIORITY_HIGH = 'high'
+
+    board = models.ForeignKey(Boards, on_delete=models.CASCADE, related_name='tasks', db_index=False)
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     status = models.CharField(max_length=10,default='to-do')
     priority = models.CharField(max_length=10,default='medium')
-    assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='assigned_tasks')
-    reviewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='reviewed_tasks')
+    assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='assigned_tasks', db_index=False)
+    reviewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='reviewed_tasks', db_index=False)
     due_date = models.DateField(null=True, blank=True)
     comments_count = models.PositiveSmallIntegerField(default=0)
     createdBy = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_tasks')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'id'], name='tasks_board_id_idx'),
+            models.Index(fields=['assignee', 'id'], name='tasks_assignee_id_idx'),
+            models.Index(fields=['reviewer', 'id'], name='tasks_reviewer_id_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._counter_snapshot = instance.counter_snapshot()
+        return instance
+
+    @classmethod
+    def counter_values(cls, status, priority):
+        return {
+            'ticket_count': 1,
+            'tasks_to_do_count': int(status == cls.STATUS_TO_DO),
+            'tasks_high_prio_count': int(priority == cls.PRIORITY_HIGH),
+        }
+
+    @classmethod
+    def adjust_comments_count(cls, task_id, delta):
+        count = F('comments_count') + delta if delta > 0 else Greatest(F('comments_count') + delta, 0)
+        cls.objects.filter(pk=task_id).update(comments_count=count)
+
+    def counter_snapshot(self):
+        if self.get_deferred_fields() & {'board_id', 'status', 'priority'}:
+            return None
+        return self.board_id, self.status, self.priority
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
     
@@ -78,14 +163,65 @@ Fields:
 - content (TextField): The content/text of the comment.
 - created_at (DateTimeField): Timestamp when the comment was created, automatically set on creation.
 
+Indexes:
+- (task, -created_at, -id) backs the newest-first comment feed of a task.
+
 Methods:
 - __str__(): Returns a string indicating the author and task the comment is related to.
 """
 class Comments(models.Model):
-    task = models.ForeignKey('Tasks', on_delete=models.CASCADE, related_name='comments')
+    task = models.ForeignKey('Tasks', on_delete=models.CASCADE, related_name='comments', db_index=False)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', '-created_at', '-id'], name='comments_task_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Comment by {self.author} on {self.task}"
+"""
+Model recording the latest change of every object shown on a board.
+
+Fields:
+- board (ForeignKey): The board the change belongs to; deleting the board deletes its changes.
+- kind (CharField): What changed: 'board', 'member', 'task' or 'comment'.
+- object_id (BigIntegerField): ID of the changed board, user, task or comment.
+- deleted (BooleanField): True if the object was deleted or removed (tombstone).
+- seq (PositiveIntegerField): Board version at the time of the change.
+
+Notes:
+- There is one row per (board, kind, object_id); a new change overwrites seq and deleted.
+  The table therefore grows with the number of objects, not the number of writes.
+- Rows with seq greater than a client's cursor are exactly what changed since then.
+"""
+class BoardChanges(models.Model):
+    KIND_BOARD = 'board'
+    KIND_MEMBER = 'member'
+    KIND_TASK = 'task'
+    KIND_COMMENT = 'comment'
+    KIND_CHOICES = [
+        (KIND_BOARD, 'Board'),
+        (KIND_MEMBER, 'Member'),
+        (KIND_TASK, 'Task'),
+        (KIND_COMMENT, 'Comment'),
+    ]
+
+    board = models.ForeignKey(Boards, on_delete=models.CASCADE, related_name='changes', db_index=False)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    seq = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'kind', 'object_id'], name='board_changes_object_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['board', 'seq'], name='board_changes_seq_idx'),
+        ]
+
     def __str__(self):
-        return f"Comment by {self.author} on {self.task}"
\ No newline at end of file
+        return f"{self.kind} {self.object_id} on board {self.board_id} at {self.seq}"
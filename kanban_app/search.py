@@ -0,0 +1,152 @@
+import re
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from kanban_app.models import Boards
+
+"""
+Full-text search over task titles, descriptions and comment content.
+
+The index is created by migration 0015_search_index:
+- SQLite: the FTS5 table kanban_search, kept in sync by triggers, ranked with bm25()
+  (title matches weigh ten times more than description or comment matches), with a
+  prefix index for 3 and 4 letters.
+- PostgreSQL: generated search_vector columns with GIN indexes, ranked with ts_rank().
+Both use a language-neutral tokenizer without stemming ('unicode61' with diacritics
+removed, 'simple' on PostgreSQL), so results do not depend on the language of a board.
+
+Queries:
+- The words of q are ANDed. A word ending in '*' matches as a prefix ('rev*'
+  finds 'review'), if it has at least three letters. Everything else but letters
+  and digits is ignored, so user input can never break the match syntax.
+- Only tasks and comments on boards the user owns or is a member of are returned.
+- Only the newest MAX_CANDIDATES matches (by ID) are ranked, so a word that occurs
+  nearly everywhere does not rank hundreds of thousands of rows; results that far
+  down are rarely useful anyway and the user narrows the query.
+
+Hits are ordered by (rank, key): rank is ascending (the best match first on both
+backends) and key, 2 * task ID or 2 * comment ID + 1, breaks ties, which makes
+(rank, key) a keyset position for pagination (see SearchPagination).
+
+Functions:
+- is_supported(): True if the current database backend has a search index.
+- terms(): Splits a query into the words that are searched for.
+- search(): Returns up to limit hits after a (rank, key) position, with snippets unless disabled
+  (candidates overrides MAX_CANDIDATES).
+
+SQLiteIndex and PostgreSQLIndex build the match expression, the hit query and the
+snippets ('[' and ']' around matched words) for their backend.
+
+Note: migrations that rebuild kanban_app_tasks or kanban_app_comments on SQLite
+(e.g. altering a column) drop the triggers; recreate them in the same migration.
+"""
+
+_config = getattr(settings, 'KANBAN_SEARCH', {})
+MAX_CANDIDATES = _config.get('MAX_CANDIDATES', 1000)
+SNIPPET_WORDS = _config.get('SNIPPET_WORDS', 12)
+
+_word = re.compile(r'\w{3,}\*|\w+')
+
+
+def is_supported():
+    return connection.vendor in _indexes
+
+
+def terms(query):
+    return _word.findall(query or '')[:16]
+
+
+def search(user, words, limit, after=None, snippets=True, candidates=None):
+    index = _indexes[connection.vendor]
+    boards = Boards.objects.filter(
+        Q(owner=user) | Q(pk__in=Boards.members.through.objects.filter(user=user).values('boards_id'))
+    ).values('pk')
+    boards_sql, boards_params = boards.query.sql_with_params()
+
+    position_sql, position_params = '', []
+    if after is not None:
+        position_sql = 'WHERE (hits.rank > %s OR (hits.rank = %s AND hits.key > %s))'
+        position_params = [after[0], after[0], after[1]]
+
+    match = index.match(words)
+    with connection.cursor() as cursor:
+        sql, params = index.hits(match, boards_sql, boards_params, candidates or MAX_CANDIDATES)
+        cursor.execute(
+            f"SELECT * FROM ({sql}) hits {position_sql} ORDER BY hits.rank, hits.key LIMIT %s",
+            [*params, *position_params, limit],
+        )
+        columns = [column[0] for column in cursor.description]
+        hits = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        if hits and snippets:
+            texts = index.snippets(cursor, match, hits)
+            for hit in hits:
+                hit['snippet'] = texts.get(hit['key'], '')
+    return hits
+
+
+class SQLiteIndex:
+    def match(self, words):
+        return ' '.join(f'"{word[:-1]}"*' if word.endswith('*') else f'"{word}"' for word in words)
+
+    def hits(self, match, boards_sql, boards_params, candidates):
+        sql = f"""
+            SELECT CASE WHEN s.rowid %% 2 = 1 THEN 'comment' ELSE 'task' END AS type,
+                   s.rowid / 2 AS id, t.id AS task, t.board_id AS board, t.title AS title,
+                   bm25(kanban_search, 0.0, 10.0, 1.0) AS rank, s.rowid AS key
+            FROM kanban_search s JOIN kanban_app_tasks t ON t.id = s.task_id
+            WHERE kanban_search MATCH %s AND t.board_id IN ({boards_sql})
+            ORDER BY s.rowid DESC LIMIT %s
+        """
+        return sql, [match, *boards_params, candidates]
+
+    def snippets(self, cursor, match, hits):
+        keys = [hit['key'] for hit in hits]
+        cursor.execute(
+            f"SELECT rowid, snippet(kanban_search, -1, '[', ']', '…', {SNIPPET_WORDS}) FROM kanban_search "
+            f"WHERE kanban_search MATCH %s AND rowid IN ({', '.join(['%s'] * len(keys))})",
+            [match, *keys],
+        )
+        return dict(cursor.fetchall())
+
+
+class PostgreSQLIndex:
+    headline = f'StartSel=[, StopSel=], MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=1'
+
+    def match(self, words):
+        return ' & '.join(f'{word[:-1]}:*' if word.endswith('*') else word for word in words)
+
+    def hits(self, match, boards_sql, boards_params, candidates):
+        sql = f"""
+            SELECT type, id, task, board, title, -ts_rank(vector, to_tsquery('simple', %s)) AS rank, key FROM (
+                (SELECT 'task' AS type, t.id AS id, t.id AS task, t.board_id AS board, t.title AS title,
+                        t.search_vector AS vector, t.id * 2 AS key
+                 FROM kanban_app_tasks t
+                 WHERE t.search_vector @@ to_tsquery('simple', %s) AND t.board_id IN ({boards_sql})
+                 ORDER BY t.id DESC LIMIT %s)
+                UNION ALL
+                (SELECT 'comment', c.id, t.id, t.board_id, t.title, c.search_vector, c.id * 2 + 1
+                 FROM kanban_app_comments c JOIN kanban_app_tasks t ON t.id = c.task_id
+                 WHERE c.search_vector @@ to_tsquery('simple', %s) AND t.board_id IN ({boards_sql})
+                 ORDER BY c.id DESC LIMIT %s)
+            ) candidates
+        """
+        return sql, [match, match, *boards_params, candidates, match, *boards_params, candidates]
+
+    def snippets(self, cursor, match, hits):
+        cursor.execute(
+            """
+            SELECT id * 2, ts_headline('simple', concat_ws(' ', title, description), to_tsquery('simple', %s), %s)
+            FROM kanban_app_tasks WHERE id = ANY(%s)
+            UNION ALL
+            SELECT id * 2 + 1, ts_headline('simple', content, to_tsquery('simple', %s), %s)
+            FROM kanban_app_comments WHERE id = ANY(%s)
+            """,
+            [
+                match, self.headline, [hit['id'] for hit in hits if hit['type'] == 'task'],
+                match, self.headline, [hit['id'] for hit in hits if hit['type'] == 'comment'],
+            ],
+        )
+        return dict(cursor.fetchall())
+
+
+_indexes = {'sqlite': SQLiteIndex(), 'postgresql': PostgreSQLIndex()}
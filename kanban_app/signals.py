@@ -0,0 +1,177 @@
+from django.contrib.auth.models import User
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from kanban_app import changes, events, membership
+from kanban_app.models import Boards, BoardChanges, Tasks, Comments
+
+"""
+Signal handlers keeping the denormalized board data in sync with writes.
+
+Every task create and update applies the matching delta to the board counters
+(ticket_count, tasks_to_do_count, tasks_high_prio_count) with a single
+F-expression UPDATE, so concurrent writers never overwrite each other. The
+delta of an update is computed from the status and priority the task had when
+it was loaded; views that update a task load it with select_for_update() inside
+the saving transaction, so no concurrent update can change them in between.
+
+Membership changes (including deleting a user) recount member_count and
+invalidate the membership cache.
+
+Any write that changes what the board detail or a comment feed renders (the
+board itself, its members, tasks, comments, or the name of a user shown on the
+board) increments the board version used for ETags and records the changed
+object for delta sync (see kanban_app.changes).
+
+Tasks and comments have no delete receivers: any receiver would turn off
+Django's fast delete and load every task and comment of a deleted board into
+Python. Deleting a single task or comment records its counters and tombstone in
+the view (TaskSingleView, TasksCommentsSingleView); deleting a board needs
+nothing, its change rows go with it; deleting a user records the tasks and
+comments that disappear with the user in the user's pre_delete handler below.
+"""
+
+def _record_task_change(task_id, previous, current):
+    per_board = {}
+    for snapshot, sign in ((previous, -1), (current, 1)):
+        if snapshot is None:
+            continue
+        board_id, status, priority = snapshot
+        deltas = per_board.setdefault(board_id, {})
+        for field, value in Tasks.counter_values(status, priority).items():
+            deltas[field] = deltas.get(field, 0) + sign * value
+
+    current_board_id = current[0] if current is not None else None
+    for board_id, deltas in per_board.items():
+        deleted = board_id != current_board_id
+        changes.record(board_id, [(BoardChanges.KIND_TASK, task_id, deleted)], **deltas)
+
+
+def _record_comment_change(comment, deleted):
+    task = comment._state.fields_cache.get('task')
+    board_id = task.board_id if task is not None else (
+        Tasks.objects.filter(pk=comment.task_id).values_list('board_id', flat=True).first()
+    )
+    if board_id is not None:
+        changes.record(board_id, [
+            (BoardChanges.KIND_COMMENT, comment.pk, deleted),
+            (BoardChanges.KIND_TASK, comment.task_id, False),
+        ])
+
+
+def _record_user_change(user):
+    boards = Q(pk__in=Boards.members.through.objects.filter(user=user).values('boards_id'))
+    boards |= Q(pk__in=Tasks.objects.filter(Q(assignee=user) | Q(reviewer=user)).values('board_id'))
+    board_ids = Boards.objects.filter(boards).values_list('pk', flat=True)
+    changes.record_many(board_ids, [(BoardChanges.KIND_MEMBER, user.pk, False)])
+
+
+@receiver(pre_save, sender=Tasks, dispatch_uid='kanban_tasks_counter_snapshot')
+def snapshot_task_counters(sender, instance, **kwargs):
+    if instance._state.adding or getattr(instance, '_counter_snapshot', None) is not None:
+        return
+    instance._counter_snapshot = (
+        Tasks.objects.filter(pk=instance.pk).values_list('board_id', 'status', 'priority').first()
+    )
+
+
+@receiver(post_save, sender=Tasks, dispatch_uid='kanban_tasks_counter_save')
+def update_board_on_task_save(sender, instance, created, **kwargs):
+    current = instance.counter_snapshot()
+    if current is None:
+        changes.record(instance.board_id, [(BoardChanges.KIND_TASK, instance.pk, False)])
+        return
+    previous = None if created else getattr(instance, '_counter_snapshot', None)
+    _record_task_change(instance.pk, previous, current)
+    instance._counter_snapshot = current
+
+
+@receiver(post_save, sender=Comments, dispatch_uid='kanban_comments_version_save')
+def update_board_on_comment_save(sender, instance, **kwargs):
+    _record_comment_change(instance, deleted=False)
+
+
+@receiver(post_save, sender=Boards, dispatch_uid='kanban_boards_version_save')
+def update_version_on_board_save(sender, instance, created, **kwargs):
+    if not created:
+        changes.record(instance.pk, [(BoardChanges.KIND_BOARD, instance.pk, False)])
+
+
+@receiver(m2m_changed, sender=Boards.members.through, dispatch_uid='kanban_board_members_changed')
+def update_members_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        related = instance.boards if reverse else instance.members
+        instance._cleared_ids = set(related.values_list('pk', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    deleted = action != 'post_add'
+    related_ids = pk_set if pk_set is not None else instance.__dict__.pop('_cleared_ids', set())
+
+    if reverse:
+        membership.invalidate(user_id=instance.pk)
+        member_count = (
+            Boards.members.through.objects.filter(boards_id=OuterRef('pk')).order_by()
+            .values('boards_id').annotate(total=Count('pk')).values('total')
+        )
+        Boards.objects.filter(pk__in=related_ids).update(member_count=Coalesce(Subquery(member_count), 0))
+        changes.record_many(related_ids, [(BoardChanges.KIND_MEMBER, instance.pk, deleted)])
+        return
+
+    membership.invalidate(board_id=instance.pk)
+    instance.member_count = Boards.members.through.objects.filter(boards_id=instance.pk).count()
+    Boards.objects.filter(pk=instance.pk).update(member_count=instance.member_count)
+    changes.record(instance.pk, [(BoardChanges.KIND_MEMBER, user_id, deleted) for user_id in related_ids])
+
+
+@receiver(post_delete, sender=Boards, dispatch_uid='kanban_board_membership_delete')
+def invalidate_membership_on_board_delete(sender, instance, **kwargs):
+    membership.invalidate(board_id=instance.pk)
+    events.publish(instance.pk, None, [(BoardChanges.KIND_BOARD, instance.pk, True)])
+
+
+@receiver(post_save, sender=User, dispatch_uid='kanban_user_version_save')
+def update_boards_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and not set(update_fields) & {'first_name', 'last_name', 'email', 'username'}:
+        return
+    _record_user_change(instance)
+
+
+@receiver(pre_delete, sender=User, dispatch_uid='kanban_user_version_delete')
+def update_boards_on_user_delete(sender, instance, **kwargs):
+    membership.invalidate(user_id=instance.pk)
+    # The boards the user owns are deleted with the user and get no change records.
+    owned = Boards.objects.filter(owner=instance).values('pk')
+    member_board_ids = list(
+        Boards.members.through.objects.filter(user=instance).exclude(boards_id__in=owned).values_list('boards_id', flat=True)
+    )
+    Boards.objects.filter(pk__in=member_board_ids).update(member_count=Greatest(F('member_count') - 1, 0))
+    changes.record_many(member_board_ids, [(BoardChanges.KIND_MEMBER, instance.pk, True)])
+
+    per_board = {}
+    created = Tasks.objects.filter(createdBy=instance).exclude(board__in=owned)
+    for task_id, board_id, status, priority in created.values_list('pk', 'board_id', 'status', 'priority'):
+        task_changes, deltas = per_board.setdefault(board_id, ([], {}))
+        task_changes.append((BoardChanges.KIND_TASK, task_id, True))
+        for field, value in Tasks.counter_values(status, priority).items():
+            deltas[field] = deltas.get(field, 0) - value
+
+    assigned = Tasks.objects.filter(Q(assignee=instance) | Q(reviewer=instance)).exclude(board__in=owned).exclude(createdBy=instance)
+    for task_id, board_id in assigned.values_list('pk', 'board_id'):
+        per_board.setdefault(board_id, ([], {}))[0].append((BoardChanges.KIND_TASK, task_id, False))
+
+    # Comments the user wrote on tasks that outlive the user.
+    comments = Comments.objects.filter(author=instance).exclude(task__board__in=owned).exclude(task__createdBy=instance)
+    removed = {}
+    for comment_id, task_id, board_id in comments.values_list('pk', 'task_id', 'task__board_id'):
+        removed[task_id] = removed.get(task_id, 0) + 1
+        task_changes = per_board.setdefault(board_id, ([], {}))[0]
+        task_changes += [(BoardChanges.KIND_COMMENT, comment_id, True), (BoardChanges.KIND_TASK, task_id, False)]
+    for task_id, count in removed.items():
+        Tasks.adjust_comments_count(task_id, -count)
+
+    for board_id, (task_changes, deltas) in per_board.items():
+        changes.record(board_id, list(dict.fromkeys(task_changes)), **deltas)
@@ -0,0 +1,690 @@
+import datetime
+import json
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Prefetch
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import caches
+from django.test import AsyncClient, AsyncRequestFactory
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from auth_app import email_lookup
+from kanban_app import events, membership
+from kanban_app.api import response_cache
+from kanban_app.api.async_views import AsyncBoardsView, AsyncAssignedToMeView, AsyncReviewingTasksView, AsyncTaskCommentsView
+from kanban_app.api.projections import BoardDetailProjection, TaskProjection
+from kanban_app.api.serializers import BoardSingleSerializer, TaskBulkUpdateSerializer, TaskReviewingAndAssignedToMeSerializer
+from kanban_app.models import Boards, BoardChanges, Tasks, Comments
+
+
+class UserDeleteTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        self.member = User.objects.create_user('member@example.com', 'member@example.com', 'pw')
+        self.board = Boards.objects.create(title='Owned', owner=self.owner)
+        self.board.members.add(self.owner, self.member)
+        self.other_board = Boards.objects.create(title='Other', owner=self.member)
+        self.other_board.members.add(self.owner, self.member)
+        for board in (self.board, self.other_board):
+            task = Tasks.objects.create(board=board, title='Task', createdBy=self.member, assignee=self.owner, reviewer=self.member)
+            Comments.objects.create(task=task, author=self.owner, content='Comment')
+            Tasks.adjust_comments_count(task.pk, 1)
+        self.other_task = task
+        Tasks.objects.create(board=self.board, title='Own task', createdBy=self.owner)
+        self.created_elsewhere = Tasks.objects.create(
+            board=self.other_board, title='Created by the owner', createdBy=self.owner, status='to-do', priority='high',
+        )
+
+    def assert_owner_deleted(self, owner_id):
+        # Foreign keys are checked at commit on SQLite; the test transaction never commits.
+        connection.check_constraints()
+        self.assertFalse(Boards.objects.filter(pk=self.board.pk).exists())
+        self.assertFalse(BoardChanges.objects.filter(board_id=self.board.pk).exists())
+        self.assertTrue(BoardChanges.objects.filter(
+            board=self.other_board, kind=BoardChanges.KIND_MEMBER, object_id=owner_id, deleted=True,
+        ).exists())
+        self.other_board.refresh_from_db()
+        self.assertEqual(self.other_board.member_count, 1)
+        # The owner's task on the other board went with the owner, and so did their comment.
+        self.assertEqual(
+            (self.other_board.ticket_count, self.other_board.tasks_to_do_count, self.other_board.tasks_high_prio_count),
+            (1, 1, 0),
+        )
+        self.assertTrue(BoardChanges.objects.filter(
+            board=self.other_board, kind=BoardChanges.KIND_TASK, object_id=self.created_elsewhere.pk, deleted=True,
+        ).exists())
+        self.assertTrue(BoardChanges.objects.filter(board=self.other_board, kind=BoardChanges.KIND_COMMENT, deleted=True).exists())
+        self.other_task.refresh_from_db()
+        self.assertEqual(self.other_task.comments_count, 0)
+
+    def test_delete_owner_of_board_with_tasks(self):
+        owner_id = self.owner.pk
+        self.owner.delete()
+        self.assert_owner_deleted(owner_id)
+
+    def test_delete_owner_with_queryset(self):
+        User.objects.filter(pk=self.owner.pk).delete()
+        self.assert_owner_deleted(self.owner.pk)
+
+
+class DeleteTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def fill(self, board, tasks):
+        for index in range(tasks):
+            task = Tasks.objects.create(board=board, title=f'Task {index}', createdBy=self.user, status='to-do', priority='high')
+            for _ in range(3):
+                Comments.objects.create(task=task, author=self.user, content='Comment')
+
+    def test_board_delete_never_loads_comments_or_task_rows(self):
+        self.fill(self.board, 20)
+        with CaptureQueriesContext(connection) as queries:
+            self.board.delete()
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        self.assertFalse([sql for sql in selects if 'kanban_app_comments' in sql])
+        self.assertFalse([sql for sql in selects if 'kanban_app_tasks"."title' in sql])
+        self.assertFalse(Comments.objects.exists())
+
+    def test_task_delete_records_counters_and_tombstone(self):
+        self.fill(self.board, 2)
+        task = Tasks.objects.filter(board=self.board).first()
+        self.assertEqual(self.client.delete(f'/api/tasks/{task.pk}/').status_code, 204)
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.ticket_count, self.board.tasks_to_do_count, self.board.tasks_high_prio_count), (1, 1, 1))
+        self.assertTrue(BoardChanges.objects.filter(board=self.board, kind=BoardChanges.KIND_TASK, object_id=task.pk, deleted=True).exists())
+
+    def test_comment_delete_records_tombstone(self):
+        self.fill(self.board, 1)
+        comment = Comments.objects.first()
+        url = f'/api/tasks/{comment.task_id}/comments/{comment.pk}/'
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertTrue(BoardChanges.objects.filter(
+            board=self.board, kind=BoardChanges.KIND_COMMENT, object_id=comment.pk, deleted=True,
+        ).exists())
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        for index in range(5):
+            Boards.objects.create(title=f'Board {index}', owner=self.user)
+        self.ids = list(Boards.objects.order_by('pk').values_list('pk', flat=True))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_next_and_previous_links_round_trip(self):
+        pages, url = [], '/api/boards/?limit=2'
+        while url:
+            page = self.client.get(url).json()
+            pages.append([board['id'] for board in page['results']])
+            url = page['next']
+        self.assertEqual(pages, [self.ids[:2], self.ids[2:4], self.ids[4:]])
+
+        last = self.client.get('/api/boards/?limit=2').json()
+        last = self.client.get(last['next']).json()
+        previous = self.client.get(last['previous']).json()
+        self.assertEqual([board['id'] for board in previous['results']], self.ids[:2])
+        self.assertIsNone(previous['previous'])
+
+    def test_without_parameters_returns_a_plain_list(self):
+        self.assertEqual([board['id'] for board in self.client.get('/api/boards/').json()], self.ids)
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ('not-base64!', 'eyJwIjpbXX0', 'eyJwIjpbImEiXX0'):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/boards/', {'cursor': cursor}).status_code, 404)
+
+
+class MembershipCacheTests(TestCase):
+
+    def setUp(self):
+        membership.cache.clear()
+        self.owner = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        self.member = User.objects.create_user('member@example.com', 'member@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.owner)
+        self.board.members.add(self.owner, self.member)
+
+    def assert_access(self, expected):
+        self.assertIs(membership.has_board_access(self.member, self.board.pk), expected)
+        with self.assertNumQueries(0):
+            self.assertIs(membership.has_board_access(self.member, self.board.pk), expected)
+
+    def test_removing_a_member_drops_the_cached_answer(self):
+        self.assert_access(True)
+        self.board.members.remove(self.member)
+        self.assert_access(False)
+        self.member.boards.add(self.board)
+        self.assert_access(True)
+
+    def test_members_set_through_the_api_drops_the_cached_answer(self):
+        self.assert_access(True)
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        response = client.patch(f'/api/boards/{self.board.pk}/', {'members': [self.owner.pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assert_access(False)
+
+    def test_board_delete_drops_the_cached_answer(self):
+        self.assert_access(True)
+        board_id = self.board.pk
+        self.board.delete()
+        self.assertIsNone(membership.cache.get((board_id, self.member.pk, membership.ACCESS)))
+
+
+class BoardConditionalTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        Tasks.objects.create(board=self.board, title='Task', createdBy=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/boards/{self.board.pk}/'
+
+    def test_field_selection_has_own_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        sparse = self.client.get(self.url, {'fields': 'title,id'})['ETag']
+        self.assertNotEqual(sparse, etag)
+        self.assertEqual(self.client.get(self.url, {'fields': 'id,title'})['ETag'], sparse)
+        self.assertEqual(self.client.get(self.url, {'fields': 'id,title'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get(self.url, {'fields': 'id,title'}, HTTP_IF_NONE_MATCH=sparse).status_code, 304)
+
+    def test_gzip_stream_has_weak_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, {'stream': '1'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], f'W/{etag}')
+        response = self.client.get(self.url, {'stream': '1'}, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, 304)
+
+
+class BoardResponseCacheTests(TestCase):
+
+    def setUp(self):
+        response_cache._cache().clear()
+        self.owner = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw', first_name='Ada')
+        self.member = User.objects.create_user('member@example.com', 'member@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.owner)
+        self.board.members.add(self.owner, self.member)
+        self.task = Tasks.objects.create(board=self.board, title='Task', createdBy=self.owner, assignee=self.owner)
+        self.url = f'/api/boards/{self.board.pk}/'
+
+    def get(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_members_share_the_cached_bytes(self):
+        body = self.get(self.owner)
+        hits = response_cache.stats()['hits']
+        self.assertEqual(self.get(self.member), body)
+        self.assertEqual(response_cache.stats()['hits'], hits + 1)
+
+    def rename_task(self):
+        self.task.title = 'Renamed'
+        self.task.save()
+
+    def rename_owner(self):
+        self.owner.first_name = 'Grace'
+        self.owner.save()
+
+    def test_writes_to_the_board_are_never_served_stale(self):
+        self.get(self.owner)
+        for change, expected in (
+            (self.rename_task, 'Renamed'),
+            (self.rename_owner, 'Grace'),
+            (lambda: Comments.objects.create(task=self.task, author=self.owner, content='Comment'), None),
+            (lambda: self.board.members.remove(self.member), None),
+        ):
+            with self.subTest(change=change):
+                version = Boards.objects.values_list('version', flat=True).get(pk=self.board.pk)
+                change()
+                self.assertGreater(Boards.objects.values_list('version', flat=True).get(pk=self.board.pk), version)
+                body = self.get(self.owner).decode()
+                if expected:
+                    self.assertIn(expected, body)
+        self.assertNotIn('member@example.com', body)
+
+
+class BoardDetailQueryTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        self.member = User.objects.create_user('member@example.com', 'member@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.owner)
+        self.board.members.add(self.owner, self.member)
+        self.add_task(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+        self.url = f'/api/boards/{self.board.pk}/'
+
+    def add_task(self, index):
+        users = (self.owner, self.member)
+        task = Tasks.objects.create(
+            board=self.board, title=f'Task {index}', createdBy=self.owner,
+            assignee=users[index % 2], reviewer=users[(index + 1) % 2],
+        )
+        Comments.objects.create(task=task, author=self.member, content='Comment')
+
+    def get_board(self, params):
+        # Every request starts cold: no cached membership answer and no cached body.
+        membership.cache.clear()
+        response_cache._cache().clear()
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        # Streamed tasks are only queried while the body is consumed.
+        return json.loads(b''.join(response.streaming_content) if response.streaming else response.content)
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        variants = ({}, {'fields[tasks]': 'id,title,assignee'}, {'stream': '1'})
+        single = []
+        for params in variants:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(len(self.get_board(params)['tasks']), 1)
+            single.append(len(queries))
+        for index in range(1, 20):
+            self.add_task(index)
+        for params, expected in zip(variants, single):
+            with self.subTest(params=params), self.assertNumQueries(expected):
+                self.assertEqual(len(self.get_board(params)['tasks']), 20)
+
+
+class ProjectionParityTests(TestCase):
+    """The serializer-free read path must render exactly the bytes of the serializers it replaces."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user('ada@example.com', 'ada@example.com', first_name='Ada', last_name='Lovelace'),
+            User.objects.create_user('zoe@example.com', 'zoe@example.com', first_name='Zoë'),
+            User.objects.create_user('orsted@example.com', 'orsted@example.com', last_name='Ørsted'),
+            User.objects.create_user('anonymous@example.com', 'anonymous@example.com'),
+        ]
+        self.user = self.users[0]
+        self.board = Boards.objects.create(title='Parity board «Ω»', owner=self.user)
+        self.board.members.set(self.users)
+        people = self.users + [None]
+        Tasks.objects.bulk_create([
+            Tasks(
+                board=self.board,
+                title=f'Task {index} ✓ "quoted" \\ backslash',
+                description='' if index % 3 else 'Line one\nLine two with ünïcödé and <html> & "quotes"' * (1 + index % 4),
+                status=('to-do', 'in-progress', 'review', 'done')[index % 4],
+                priority=('low', 'medium', 'high')[index % 3],
+                assignee=self.user if index % 2 else people[index % len(people)],
+                reviewer=self.user if index % 5 == 0 else people[(index // 2) % len(people)],
+                due_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=index % 400) if index % 7 else None,
+                comments_count=index % 11,
+                createdBy=self.user,
+            )
+            for index in range(60)
+        ])
+
+    def assert_same_bytes(self, expected, actual):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(actual).decode(), renderer.render(expected).decode())
+
+    def assert_list_parity(self, role):
+        tasks = Tasks.objects.filter(**{role: self.user}).order_by('id')
+        projection = TaskProjection()
+        self.assertTrue(tasks.exists())
+        self.assert_same_bytes(
+            TaskReviewingAndAssignedToMeSerializer(tasks.select_related('assignee', 'reviewer'), many=True).data,
+            projection.items(projection.values(tasks)),
+        )
+
+    def test_assigned_to_me(self):
+        self.assert_list_parity('assignee')
+
+    def test_reviewing(self):
+        self.assert_list_parity('reviewer')
+
+    def test_board_detail(self):
+        board = Boards.objects.prefetch_related('members', Prefetch(
+            'tasks', queryset=Tasks.objects.select_related('assignee', 'reviewer').order_by('id'),
+        )).get(pk=self.board.pk)
+        expected = BoardSingleSerializer(board).data
+        self.assert_same_bytes(expected, BoardDetailProjection().data(Boards.objects.get(pk=self.board.pk)))
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(f'/api/boards/{self.board.pk}/')
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+
+class TaskPatchCounterTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.task = Tasks.objects.create(board=self.board, title='Task', createdBy=self.user, status='to-do', priority='high')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_patches_keep_board_counters_exact(self):
+        url = f'/api/tasks/{self.task.pk}/'
+        for data, to_do, high in (
+            ({'status': 'done'}, 0, 1),
+            ({'priority': 'low'}, 0, 0),
+            ({'status': 'to-do', 'priority': 'high'}, 1, 1),
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(self.client.patch(url, data, format='json').status_code, 200)
+                self.board.refresh_from_db()
+                self.assertEqual(
+                    (self.board.ticket_count, self.board.tasks_to_do_count, self.board.tasks_high_prio_count), (1, to_do, high),
+                )
+
+
+class CommentFeedTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.task = Tasks.objects.create(board=self.board, title='Task', createdBy=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/tasks/{self.task.pk}/comments/'
+        for index in range(5):
+            self.assertEqual(self.client.post(self.url, {'content': f'Comment {index}'}, format='json').status_code, 201)
+        # Two comments written in the same instant are ordered by ID.
+        first, second = Comments.objects.order_by('pk')[:2]
+        Comments.objects.filter(pk=second.pk).update(created_at=first.created_at)
+
+    def test_post_counts_comments_on_the_task(self):
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 5)
+
+    def test_after_and_limit_page_through_the_feed(self):
+        everything = [comment['id'] for comment in self.client.get(self.url).json()]
+        self.assertEqual(len(everything), 5)
+        pages, params = [], {'limit': 2}
+        while True:
+            page = self.client.get(self.url, params).json()
+            if not page:
+                break
+            pages.extend(comment['id'] for comment in page)
+            params = {'limit': 2, 'after': f"{page[-1]['created_at']},{page[-1]['id']}"}
+        self.assertEqual(pages, everything)
+
+    def test_malformed_after_is_a_bad_request(self):
+        for after in ('yesterday,1', '2025-01-01T00:00:00Z', '2025-01-01T00:00:00Z,x'):
+            with self.subTest(after=after):
+                self.assertEqual(self.client.get(self.url, {'after': after}).status_code, 400)
+
+
+class SearchTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.stranger = User.objects.create_user('stranger@example.com', 'stranger@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.titled = Tasks.objects.create(board=self.board, title='Review the invoice', createdBy=self.user)
+        self.described = Tasks.objects.create(
+            board=self.board, title='Accounting', description='Send the invoice to the client', createdBy=self.user,
+        )
+        self.comment = Comments.objects.create(task=self.described, author=self.user, content='Invoice sent on Monday')
+        other = Boards.objects.create(title='Private', owner=self.stranger)
+        Tasks.objects.create(board=other, title='Invoice of the stranger', createdBy=self.stranger)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        return self.client.get('/api/search/', params)
+
+    def test_title_matches_rank_first_and_other_boards_are_hidden(self):
+        results = self.search(q='invoice').json()['results']
+        self.assertEqual((results[0]['type'], results[0]['id']), ('task', self.titled.pk))
+        self.assertEqual(
+            {(hit['type'], hit['id']) for hit in results},
+            {('task', self.titled.pk), ('task', self.described.pk), ('comment', self.comment.pk)},
+        )
+        self.assertIn('[', results[0]['snippet'])
+
+    def test_prefix_words_and_pagination(self):
+        first = self.search(q='invo*', limit=2).json()
+        self.assertEqual(len(first['results']), 2)
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 1)
+        self.assertIsNone(second['next'])
+
+    def test_missing_query_is_a_bad_request(self):
+        self.assertEqual(self.search(q=' ?! ').status_code, 400)
+
+    def test_unsupported_backend(self):
+        with mock.patch('kanban_app.search.is_supported', return_value=False):
+            self.assertEqual(self.search(q='invoice').status_code, 501)
+
+
+class EmailBatchCheckTests(TestCase):
+
+    def setUp(self):
+        email_lookup.cache.clear()
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.ada = User.objects.create_user('ada@example.com', 'Ada@Example.com', 'pw', first_name='Ada', last_name='Lovelace')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def check(self, emails):
+        return self.client.post('/api/email-check/batch/', {'emails': emails}, format='json')
+
+    def test_entries_keep_the_given_order_with_null_for_unknown_addresses(self):
+        emails = ['nobody@example.com', ' ADA@example.com', 'user@example.com']
+        with self.assertNumQueries(1):
+            response = self.check(emails)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'email': 'nobody@example.com', 'user': None},
+            {'email': 'ADA@example.com', 'user': {'id': self.ada.pk, 'email': self.ada.email, 'fullname': 'Ada Lovelace'}},
+            {'email': 'user@example.com', 'user': {'id': self.user.pk, 'email': 'user@example.com', 'fullname': ''}},
+        ])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.check(emails).json(), response.json())
+
+    def test_changed_address_is_not_served_from_the_cache(self):
+        self.check(['ada@example.com'])
+        self.ada.email = 'lovelace@example.com'
+        self.ada.save()
+        self.assertEqual([entry['user'] for entry in self.check(['ada@example.com']).json()], [None])
+        self.assertEqual(self.check(['lovelace@example.com']).json()[0]['user']['id'], self.ada.pk)
+
+    def test_invalid_lists_are_rejected(self):
+        for emails in ([], [''], ['user@example.com'] * 101):
+            with self.subTest(count=len(emails)):
+                self.assertEqual(self.check(emails).status_code, 400)
+
+
+class TasksBulkTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def item(self, title, status, priority):
+        return {
+            'title': title, 'description': 'Description', 'status': status, 'priority': priority,
+            'assignee_id': self.user.pk, 'reviewer_id': self.user.pk, 'due_date': None,
+        }
+
+    def counters(self):
+        self.board.refresh_from_db()
+        return self.board.ticket_count, self.board.tasks_to_do_count, self.board.tasks_high_prio_count
+
+    def create(self, tasks, **extra):
+        return self.client.post('/api/tasks/bulk/', {'board': self.board.pk, 'tasks': tasks, **extra}, format='json')
+
+    def patch(self, **data):
+        return self.client.patch('/api/tasks/bulk/', {'board': self.board.pk, **data}, format='json')
+
+    def test_create_adjusts_counters_once_for_the_batch(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.create([
+                self.item('A', 'to-do', 'high'),
+                self.item('B', 'done', 'high'),
+                self.item('C', 'to-do', 'low'),
+            ])
+        board_updates = [query for query in queries if query['sql'].startswith('UPDATE "kanban_app_boards"')]
+        self.assertEqual(len(board_updates), 1)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['created']), 3)
+        self.assertEqual(self.counters(), (3, 2, 2))
+
+    def test_invalid_rows_reject_the_batch_unless_partial(self):
+        tasks = [self.item('A', 'to-do', 'low'), {**self.item('B', 'to-do', 'low'), 'title': ''}]
+        response = self.create(tasks)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1])
+        self.assertEqual(self.counters(), (0, 0, 0))
+
+        response = self.create(tasks, partial=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['created']), 1)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1])
+        self.assertEqual(self.counters(), (1, 1, 0))
+
+    def test_patch_applies_the_aggregate_counter_delta(self):
+        self.create([self.item(str(index), 'to-do', 'high') for index in range(4)])
+        ids = list(Tasks.objects.filter(board=self.board).order_by('pk').values_list('pk', flat=True))
+        other = Boards.objects.create(title='Other', owner=self.user)
+        foreign = Tasks.objects.create(board=other, title='Foreign', createdBy=self.user)
+
+        response = self.patch(ids=[ids[0], ids[1], foreign.pk], patch={'status': 'done'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'updated': 2, 'ids': ids[:2], 'not_found': [foreign.pk]})
+        self.assertEqual(self.counters(), (4, 2, 4))
+
+        response = self.patch(filter={'status': 'to-do'}, patch={'priority': 'low'})
+        self.assertEqual(response.json()['ids'], ids[2:])
+        self.assertEqual(self.counters(), (4, 2, 2))
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'to-do')
+
+    def test_patch_rejects_an_empty_filter(self):
+        self.create([self.item('A', 'to-do', 'low')])
+        response = self.patch(filter={}, patch={'status': 'done'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filter', response.json())
+        self.assertFalse(Tasks.objects.filter(status='done').exists())
+
+    def test_patch_rejects_a_filter_matching_too_many_tasks(self):
+        self.create([self.item(str(index), 'to-do', 'low') for index in range(3)])
+        with mock.patch.object(TaskBulkUpdateSerializer, 'max_tasks', 2):
+            response = self.patch(filter={'status': 'to-do'}, patch={'status': 'done'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filter', response.json())
+        self.assertEqual(self.counters(), (3, 3, 0))
+
+
+class AsyncReadViewTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw', first_name='Ada')
+        self.stranger = User.objects.create_user('stranger@example.com', 'stranger@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        Boards.objects.create(title='Second', owner=self.user)
+        self.task = Tasks.objects.create(board=self.board, title='Task', createdBy=self.user, assignee=self.user, reviewer=self.user)
+        Comments.objects.create(task=self.task, author=self.user, content='Comment')
+        self.token = Token.objects.create(user=self.user).key
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+
+    def call(self, view, path, token=None, method='get', **kwargs):
+        extra = {'data': kwargs.pop('data'), 'content_type': 'application/json'} if 'data' in kwargs else {}
+        request = getattr(AsyncRequestFactory(), method)(path, headers={'Authorization': f'Token {token or self.token}'}, **extra)
+        return async_to_sync(view.as_view())(request, **kwargs)
+
+    async def collect(self, response):
+        return [chunk async for chunk in response.streaming_content]
+
+    def test_responses_match_the_sync_views(self):
+        for view, path, kwargs in (
+            (AsyncBoardsView, '/api/boards/', {}),
+            (AsyncBoardsView, '/api/boards/?limit=1', {}),
+            (AsyncAssignedToMeView, '/api/tasks/assigned-to-me/', {}),
+            (AsyncReviewingTasksView, '/api/tasks/reviewing/?stream=1', {}),
+            (AsyncTaskCommentsView, f'/api/tasks/{self.task.pk}/comments/', {'task_id': self.task.pk}),
+        ):
+            with self.subTest(path=path):
+                expected = self.client.get(path)
+                response = self.call(view, path, **kwargs)
+                self.assertEqual(response.status_code, 200)
+                if response.streaming:
+                    body = b''.join(async_to_sync(self.collect)(response))
+                    self.assertEqual(json.loads(body), json.loads(b''.join(expected.streaming_content)))
+                else:
+                    self.assertEqual(response.content, expected.content)
+
+    def test_errors_match_the_sync_views(self):
+        stranger = Token.objects.create(user=self.stranger).key
+        path = f'/api/tasks/{self.task.pk}/comments/'
+        self.assertEqual(self.call(AsyncTaskCommentsView, path, token=stranger, task_id=self.task.pk).status_code, 403)
+        self.assertEqual(self.call(AsyncTaskCommentsView, path, task_id=0).status_code, 404)
+        response = self.call(AsyncBoardsView, '/api/boards/', token='invalid')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+
+    def test_writes_reach_the_sync_view(self):
+        path = f'/api/tasks/{self.task.pk}/comments/'
+        response = self.call(AsyncTaskCommentsView, path, method='post', data={'content': 'Posted'}, task_id=self.task.pk)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(self.task.comments.order_by('pk').values_list('content', flat=True)), ['Comment', 'Posted'])
+
+
+class BoardEventsTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user('user@example.com', 'user@example.com', 'pw')
+        self.board = Boards.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.headers = {'Authorization': f'Token {Token.objects.create(user=self.user).key}'}
+        self.url = f'/api/boards/{self.board.pk}/events/'
+
+    def test_requires_asgi(self):
+        self.assertEqual(self.client.get(self.url, headers=self.headers).status_code, 501)
+
+    async def test_stream_delivers_changes_and_releases_its_subscription(self):
+        before = events.stats()['subscribers']
+        response = await AsyncClient().get(self.url, headers=self.headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(events.stats()['subscribers'], before + 1)
+
+        chunks = aiter(response.streaming_content)
+        self.assertTrue((await anext(chunks)).startswith(b'retry:'))
+        self.assertIn(b'event: ready', await anext(chunks))
+        version = await Boards.objects.filter(pk=self.board.pk).values_list('version', flat=True).aget()
+        message = {'board': self.board.pk, 'version': version + 1, 'kind': 'task', 'id': 7, 'deleted': False}
+        events.backend.publish(self.board.pk, message)
+        self.assertIn(b'event: task', await anext(chunks))
+
+        await chunks.aclose()
+        response.close()
+        self.assertEqual(events.stats()['subscribers'], before)
+
+    async def test_failed_setup_releases_the_subscription(self):
+        before = events.stats()['subscribers']
+        with mock.patch('kanban_app.api.views.EventStream', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                await AsyncClient().get(self.url, headers=self.headers)
+        self.assertEqual(events.stats()['subscribers'], before)